@@ -0,0 +1,6 @@
+"""Shared data layer for the Atix Labs Streamlit pages.
+
+The pages under ``pages/`` only render; loading, indexing and querying live
+here so they can be cached once per process and reused across reruns and
+sessions.
+"""
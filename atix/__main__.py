@@ -0,0 +1,272 @@
+"""Headless entry points: ``python -m atix <command> ...``."""
+import argparse
+import json
+import sys
+import time
+
+
+def _applicability(args):
+    from atix.applicability import write_applicability
+    from atix.classifier import type_indexes
+    from atix.loader import load_derived
+
+    started = time.perf_counter()
+    indexes = load_derived('type_indexes', type_indexes, args.export)
+    rows = write_applicability(args.out, indexes, fmt=args.format)
+    print(f"Wrote {rows:,} registration x ED rows to {args.out} in {time.perf_counter() - started:.2f}s")
+
+
+def _seed_docs(args):
+    from atix.docstore import DocumentStore
+    from atix.seed import seed_store
+
+    store = DocumentStore(args.db)
+    if args.reset:
+        store.clear()
+    seed_store(store, ad_count=args.ad_count, seed=args.seed)
+    print(f"Seeded {len(store.aircraft_ids())} aircraft into {store.path}")
+    store.close()
+
+
+def _export_docs(args):
+    from atix.docstore import DocumentStore
+    from atix.export import write_aircraft, write_fleet_parquet, write_fleet_zip
+
+    store = DocumentStore(args.db)
+    fmt = args.format or args.out.rsplit('.', 1)[-1].lower()
+    with open(args.out, 'wb') as fh:
+        if args.aircraft:
+            rows = write_aircraft(fh, store, args.aircraft, fmt)
+        elif fmt == 'zip':
+            rows = write_fleet_zip(fh, store)
+        elif fmt == 'parquet':
+            rows = write_fleet_parquet(fh, store)
+        else:
+            raise SystemExit("Fleet exports are .zip or .parquet; pass --aircraft for csv/xlsx")
+    print(f"Wrote {rows:,} document rows to {args.out}")
+    store.close()
+
+
+def _ingest_ads(args):
+    from atix.ad_ingest import ingest_directory
+
+    started = time.perf_counter()
+    records = ingest_directory(args.directory, workers=args.workers)
+    failed = [r for r in records if r.get('Error')]
+    print(f"Parsed {len(records) - len(failed)} ADs from {args.directory} in {time.perf_counter() - started:.2f}s")
+    for record in failed:
+        print(f"  failed: {record['Source']}: {record['Error']}", file=sys.stderr)
+
+
+def _bench(args):
+    from atix import bench
+
+    scale = dict(bench.PRESETS[args.preset])
+    scale.update({k: v for k, v in (('eds', args.eds), ('tails', args.tails), ('ads_per_tail', args.ads_per_tail)) if v})
+    results = bench.run(seed=args.seed, **scale)
+    baseline_path = args.baseline or f'benchmarks/{args.preset}.json'
+    for name, info in results['stages'].items():
+        print(f"{name:<22} {info['seconds']:>9.3f}s  {info['rows']:>12,} rows")
+    if args.out:
+        bench.save(results, args.out)
+    if args.save_baseline:
+        bench.save(results, baseline_path)
+        print(f"Saved baseline to {baseline_path}")
+        return
+    try:
+        baseline = bench.load(baseline_path)
+    except FileNotFoundError:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to record one")
+        return
+    try:
+        regressions = bench.compare(results, baseline, args.tolerance, any_machine=args.any_machine)
+    except ValueError as exc:
+        raise SystemExit(f"{baseline_path}: {exc}; record a baseline on this machine or pass --any-machine")
+    for key, (before, after) in bench.machine_differences(results, baseline).items():
+        print(f"  warning: baseline {key} was {before!r}, this machine is {after!r}", file=sys.stderr)
+    for name, before, after in regressions:
+        print(f"  regression: {name} {before:.3f}s -> {after:.3f}s", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+    print(f"No regressions against {baseline_path}")
+
+
+def _memory(args):
+    import pandas as pd
+
+    from atix.docstore import DocumentStore
+    from atix.loader import load_ed_frame
+    from atix.schema import column_report, memory_report
+
+    tables = {}
+    try:
+        eds = load_ed_frame(args.export)
+        tables['EDs (object)'] = eds.astype(object)
+        tables['EDs'] = eds
+    except FileNotFoundError:
+        print(f"No export at {args.export}", file=sys.stderr)
+    store = DocumentStore(args.db)
+    documents = store.document_frame()
+    tables['documents (object)'] = pd.DataFrame(store.query('SELECT * FROM documents ORDER BY id')).astype(object)
+    tables['documents'] = documents
+    store.close()
+    print(memory_report(tables).to_string(index=False))
+    if args.columns:
+        for name in ('EDs', 'documents'):
+            if name in tables:
+                print(f"\n{name}\n{column_report(tables[name]).to_string(index=False)}")
+
+
+def _due(args):
+    from atix.docstore import DocumentStore
+    from atix.scheduler import DueScheduler, due_frame
+
+    store = DocumentStore(args.db)
+    scheduler = DueScheduler.from_store(store)
+    items = scheduler.due_within(args.days) if args.days is not None else scheduler.next_due(args.next)
+    print(due_frame(items).to_string(index=False) if items else "Nothing due")
+    store.close()
+
+
+def _snapshot(args):
+    from atix.snapshots import take_snapshot
+
+    snapshot = take_snapshot(args.export, args.dir)
+    print(f"Snapshot of {args.export}: {snapshot.path}")
+
+
+def _diff(args):
+    from atix.snapshots import diff, find_snapshot, list_snapshots, summary, tail_counts
+
+    snapshots = list_snapshots(args.export, args.dir)
+    if len(snapshots) < 2:
+        raise SystemExit(f"Need two snapshots of {args.export} in {args.dir}; run 'python -m atix snapshot' after each export")
+    try:
+        old = find_snapshot(snapshots, args.old) if args.old else snapshots[-2]
+        new = find_snapshot(snapshots, args.new) if args.new else snapshots[-1]
+    except LookupError as exc:
+        have = ', '.join(f"{s.taken} ({s.sha})" for s in snapshots)
+        raise SystemExit(f"Snapshot {exc.args[0]}; have {have}")
+    started = time.perf_counter()
+    changes = tail_counts(diff(old, new))
+    counts = ', '.join(f"{n:,} {change}" for change, n in summary(changes).items())
+    print(f"{old.taken} -> {new.taken}: {counts} in {time.perf_counter() - started:.2f}s")
+    if args.out:
+        changes.to_csv(args.out, index=False)
+        print(f"Wrote {len(changes):,} changes to {args.out}")
+
+
+def _serve(args):
+    from atix.api import serve
+
+    serve(args.host, args.port)
+
+
+def _loadtest(args):
+    import asyncio
+
+    from atix.loadtest import run
+
+    results = asyncio.run(run(args.url, args.concurrency, args.duration, warmup=args.warmup))
+    latency = results['latency_ms']
+    print(f"{results['requests']:,} requests over {results['paths']} paths in {results['seconds']:.1f}s "
+          f"with {results['concurrency']} connections: {results['requests_per_second']:,.0f} req/s")
+    print(f"latency ms: mean {latency['mean']}  p50 {latency['p50']}  p95 {latency['p95']}  "
+          f"p99 {latency['p99']}  max {latency['max']}")
+    if results['errors']:
+        print(f"  {results['errors']:,} errors: {results['statuses']}", file=sys.stderr)
+    if args.out:
+        with open(args.out, 'w') as fh:
+            json.dump(results, fh, indent=2)
+    if results['errors']:
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m atix', description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser('applicability', help='Write the fleet-wide registration x ED matrix')
+    cmd.add_argument('out', help='Output file (.csv or .parquet)')
+    cmd.add_argument('--export', default='export.XLSX', help='Document-management export (default: %(default)s)')
+    cmd.add_argument('--format', choices=['csv', 'parquet'], help='Output format (default: from extension)')
+    cmd.set_defaults(func=_applicability)
+
+    cmd = commands.add_parser('seed-docs', help='Fill the tracker document store with sample data')
+    cmd.add_argument('--db', default='documents.sqlite3', help='SQLite file (default: %(default)s)')
+    cmd.add_argument('--ad-count', type=int, default=5, help='ADs per aircraft (default: %(default)s)')
+    cmd.add_argument('--seed', type=int, help='Random seed for reproducible data')
+    cmd.add_argument('--reset', action='store_true', help='Delete existing aircraft and documents first')
+    cmd.set_defaults(func=_seed_docs)
+
+    cmd = commands.add_parser('export-docs', help='Export tracker documents for one aircraft or the fleet')
+    cmd.add_argument('out', help='Output file (.csv/.xlsx with --aircraft, otherwise .zip or .parquet)')
+    cmd.add_argument('--db', default='documents.sqlite3', help='SQLite file (default: %(default)s)')
+    cmd.add_argument('--aircraft', help='Export a single registration')
+    cmd.add_argument('--format', choices=['csv', 'xlsx', 'zip', 'parquet'], help='Output format (default: from extension)')
+    cmd.set_defaults(func=_export_docs)
+
+    cmd = commands.add_parser('ingest-ads', help='Parse a directory of AD documents into the AD cache')
+    cmd.add_argument('directory', nargs='?', default='ads', help='Directory of .pdf/.xml/.txt ADs (default: %(default)s)')
+    cmd.add_argument('--workers', type=int, help='Parser processes (default: CPU count)')
+    cmd.set_defaults(func=_ingest_ads)
+
+    cmd = commands.add_parser('bench', help='Time every pipeline stage on synthetic data and compare to a baseline')
+    cmd.add_argument('--preset', choices=['small', 'medium', 'large'], default='small', help='Data scale (default: %(default)s)')
+    cmd.add_argument('--eds', type=int, help='Override the number of EDs')
+    cmd.add_argument('--tails', type=int, help='Override the number of registrations')
+    cmd.add_argument('--ads-per-tail', type=int, help='Override the ADs per registration')
+    cmd.add_argument('--seed', type=int, default=0, help='Generator seed (default: %(default)s)')
+    cmd.add_argument('--out', help='Write results as JSON to this file')
+    cmd.add_argument('--baseline', help='Baseline results (default: benchmarks/<preset>.json)')
+    cmd.add_argument('--save-baseline', action='store_true', help='Record these results as the new baseline')
+    cmd.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown per stage (default: %(default)s)')
+    cmd.add_argument('--any-machine', action='store_true', help='Compare against a baseline recorded on another host')
+    cmd.set_defaults(func=_bench)
+
+    cmd = commands.add_parser('memory', help='Report the in-memory size of the ED and document tables')
+    cmd.add_argument('--export', default='export.XLSX', help='Document-management export (default: %(default)s)')
+    cmd.add_argument('--db', default='documents.sqlite3', help='SQLite file (default: %(default)s)')
+    cmd.add_argument('--columns', action='store_true', help='Also break each compact table down by column')
+    cmd.set_defaults(func=_memory)
+
+    cmd = commands.add_parser('due', help='List the tracker tasks due next across the fleet')
+    cmd.add_argument('--db', default='documents.sqlite3', help='SQLite file (default: %(default)s)')
+    group = cmd.add_mutually_exclusive_group()
+    group.add_argument('--next', type=int, default=20, help='Number of tasks to list (default: %(default)s)')
+    group.add_argument('--days', type=int, help='List everything due within this many days instead')
+    cmd.set_defaults(func=_due)
+
+    cmd = commands.add_parser('snapshot', help='Store the current export revision for later diffs')
+    cmd.add_argument('--export', default='export.XLSX', help='Document-management export (default: %(default)s)')
+    cmd.add_argument('--dir', default='snapshots', help='Snapshot directory (default: %(default)s)')
+    cmd.set_defaults(func=_snapshot)
+
+    cmd = commands.add_parser('diff', help='Report EDs added, revised and withdrawn between two snapshots')
+    cmd.add_argument('--export', default='export.XLSX', help='Document-management export (default: %(default)s)')
+    cmd.add_argument('--dir', default='snapshots', help='Snapshot directory (default: %(default)s)')
+    cmd.add_argument('--old', help='Timestamp, sha prefix or file name of the older snapshot (default: second newest)')
+    cmd.add_argument('--new', help='Timestamp, sha prefix or file name of the newer snapshot (default: newest)')
+    cmd.add_argument('--out', help='Write the changes with affected-tail counts to this CSV')
+    cmd.set_defaults(func=_diff)
+
+    cmd = commands.add_parser('serve', help='Serve the read-only JSON API over the preloaded indexes')
+    cmd.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: %(default)s)')
+    cmd.add_argument('--port', type=int, default=8502, help='Port (default: %(default)s)')
+    cmd.set_defaults(func=_serve)
+
+    cmd = commands.add_parser('loadtest', help='Measure the JSON API\'s sustained requests per second')
+    cmd.add_argument('--url', default='http://127.0.0.1:8502', help='API base URL (default: %(default)s)')
+    cmd.add_argument('--concurrency', type=int, default=32, help='Concurrent connections (default: %(default)s)')
+    cmd.add_argument('--duration', type=float, default=10.0, help='Seconds to measure (default: %(default)s)')
+    cmd.add_argument('--warmup', type=float, default=1.0, help='Unmeasured seconds first (default: %(default)s)')
+    cmd.add_argument('--out', help='Write the results as JSON to this file')
+    cmd.set_defaults(func=_loadtest)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Resolve free-text AD applicability to the registrations it affects.
+
+Applicability strings such as "Model 777-200, -200LR, -300, -300ER, and 777F
+series airplanes" are normalized once per AD into model tokens, expanding the
+dash-suffix shorthand against the last model named ("-300ER" -> "777-300ER").
+The fleet is indexed once by family ("777") and series ("777-300ER"), and all
+ADs are matched in one merge of the exploded (AD, token) table against that
+index instead of a regex per AD and aircraft.
+"""
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from atix.fleet import fleet_frame
+
+# Families a token must belong to; keeps dates, ATA codes and SB numbers out.
+KNOWN_FAMILIES = {
+    'A220', 'A300', 'A310', 'A318', 'A319', 'A320', 'A321', 'A330', 'A340', 'A350', 'A380',
+    '707', '717', '727', '737', '747', '757', '767', '777', '787',
+}
+
+# A full model ("A350-941", "777-300ER", "777F", "B787-8") or a dash suffix ("-200LR")
+_MODEL = re.compile(
+    r'(?<![\w-])(?:B(?=7\d7))?(?P<family>A\d{3}|\d{3})(?P<letters>[A-Z]{1,2})?(?:-(?P<series>[0-9][0-9A-Z]*))?(?![\w])'
+    r'|(?<![\w-])-(?P<suffix>[0-9][0-9A-Z]*)(?![\w])'
+)
+_AIRBUS_DESIGNATION = re.compile(r'^(\d{1,2})(\d{2})$')
+
+AD_TOKEN_COLUMNS = ['AD-id', 'token']
+
+
+def series_token(family, series=None, letters=None):
+    """Canonical token: ``'777'``, ``'777F'``, ``'777-300ER'``, ``'A350-900'``."""
+    if series is None:
+        return family + (letters or '')
+    if family.startswith('A'):
+        # Airbus type designations name the series by their leading digit(s):
+        # A350-941 is an A350-900, A350-1041 an A350-1000, A320-214 an A320-200.
+        match = _AIRBUS_DESIGNATION.match(series)
+        if match and match.group(2) != '00':
+            series = match.group(1) + '00'
+    return f'{family}-{series}'
+
+
+def normalize_applicability(text):
+    """Model tokens named in one applicability string, in order, without duplicates."""
+    tokens = []
+    family = None
+    for match in _MODEL.finditer(text.upper()):
+        if match.group('suffix') is not None:
+            if family is None:
+                continue
+            token = series_token(family, match.group('suffix'))
+        else:
+            if match.group('family') not in KNOWN_FAMILIES:
+                continue
+            family = match.group('family')
+            token = series_token(family, match.group('series'), match.group('letters'))
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def fleet_tokens(aircraft_type):
+    """Family and series tokens for a fleet 'Aircraft Type' ('Boeing 787-8 Dreamliner')."""
+    for match in _MODEL.finditer(aircraft_type.upper()):
+        family = match.group('family')
+        if family in KNOWN_FAMILIES:
+            series = series_token(family, match.group('series'), match.group('letters'))
+            return [family] if series == family else [family, series]
+    return []
+
+
+class FleetModelIndex:
+    """Registrations indexed by family and series token."""
+
+    def __init__(self, fleet=None):
+        fleet = fleet_frame() if fleet is None else fleet
+        rows = [
+            (token, registration, aircraft_type)
+            for registration, aircraft_type in zip(fleet['Registration'], fleet['Aircraft Type'])
+            for token in fleet_tokens(aircraft_type)
+        ]
+        self.frame = pd.DataFrame(rows, columns=['token', 'Registration', 'Aircraft Type'])
+        self._by_token = self.frame.groupby('token')['Registration'].apply(list).to_dict()
+
+    def registrations(self, token):
+        return self._by_token.get(token, [])
+
+
+@lru_cache(maxsize=1)
+def default_index():
+    """Index over ``atix.fleet``, built once per process."""
+    return FleetModelIndex()
+
+
+def ad_tokens(records):
+    """Exploded (AD-id, token) frame for parsed AD records."""
+    rows = [
+        (ad['AD-id'], token)
+        for ad in records
+        if ad.get('AD-id')
+        for text in ad.get('Applicability') or []
+        for token in normalize_applicability(text)
+    ]
+    return pd.DataFrame(rows, columns=AD_TOKEN_COLUMNS).drop_duplicates()
+
+
+def match_ads(records, index=None):
+    """Every (AD, registration) pair the applicability covers, as one frame.
+
+    Columns: AD-id, Registration, Aircraft Type, token (the model that matched).
+    """
+    index = default_index() if index is None else index
+    matched = ad_tokens(records).merge(index.frame, on='token', how='inner')
+    matched = matched.drop_duplicates(subset=['AD-id', 'Registration'])
+    return matched[['AD-id', 'Registration', 'Aircraft Type', 'token']].reset_index(drop=True)
+
+
+def affected_tails(records, index=None):
+    """``{AD-id: [registrations]}`` for every AD in ``records`` (empty list if none)."""
+    matched = match_ads(records, index)
+    tails = matched.groupby('AD-id', sort=False)['Registration'].apply(list).to_dict()
+    return {ad['AD-id']: tails.get(ad['AD-id'], []) for ad in records if ad.get('AD-id')}
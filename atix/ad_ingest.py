@@ -0,0 +1,200 @@
+"""Batch ingestion of Airworthiness Directive documents.
+
+A directory of AD documents (PDF, Federal Register/EASA XML or plain text)
+is parsed in parallel across a process pool into the same record the ADs
+center page shows: AD-id, Agency, Effective date, ATA, Applicability, Service
+Bulletins and superseding information. Each parse is cached under the file's
+content hash, so re-running over the same directory only parses new or
+changed files.
+"""
+import json
+import multiprocessing
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from atix.loader import CACHE_DIR, fingerprint
+from atix.profiling import note_cache
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+AD_DIR = os.environ.get('ATIX_AD_DIR', 'ads')
+CACHE_FILE = os.path.join(CACHE_DIR, 'ads.json')
+AD_SUFFIXES = ('.pdf', '.xml', '.txt')
+# Bump when the parser changes so cached records are re-parsed.
+PARSER_VERSION = 2
+
+FAA = 'Federal Aviation Administration (FAA), DOT'
+EASA = 'European Union Aviation Safety Agency (EASA)'
+
+_MONTH = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+_DATE = rf'(?:{_MONTH}\s+\d{{1,2}},\s+\d{{4}}|\d{{1,2}}\s+{_MONTH}\s+\d{{4}})'
+
+_FAA_ID = re.compile(r'\bAD\s+(\d{4}-\d{2}-\d{2})\b')
+_EASA_ID = re.compile(r'\bAD\s+No\.?:?\s*(\d{4}-\d{4}(?:R\d+)?)\b', re.IGNORECASE)
+_EFFECTIVE = [
+    re.compile(rf'\bAD is effective\s+({_DATE})', re.IGNORECASE),
+    re.compile(rf'\bEffective Date:?\s*({_DATE})', re.IGNORECASE),
+]
+_ATA = [
+    re.compile(r'\(ATA\)\s+of\s+America\s+Code\s+(\d{2})', re.IGNORECASE),
+    re.compile(r'\bATA\s+(?:Chapter\s+)?(\d{2})\b', re.IGNORECASE),
+    re.compile(r'\bJASC\)?\s+Code\s+(\d{2})\d{2}\b', re.IGNORECASE),
+]
+_APPLIES = re.compile(r'This AD applies to\s+(.+?)(?:,\s*certificated\b|\.\s)', re.IGNORECASE | re.DOTALL)
+_EASA_APPLIES = re.compile(r'Type/Model designation\(s\):\s*(.+?)\s*(?:\n|$)', re.IGNORECASE)
+_SUPERSEDES = re.compile(r'\bsupersedes?\s+((?:AD\s+)?\d{4}-\d{2,4}-?\d{0,2}(?:\s*(?:,|and)\s*(?:AD\s+)?\d{4}-\d{2,4}-?\d{0,2})*)', re.IGNORECASE)
+_AD_REF = re.compile(r'\d{4}-\d{2}-\d{2}|\d{4}-\d{4}')
+_BULLETIN = re.compile(
+    r'(?P<maker>Boeing|Airbus|Embraer|Bombardier|ATR|Rolls-Royce|General Electric|Pratt\s*&\s*Whitney)?\s*'
+    r'(?P<type>(?:Alert\s+)?(?:Requirements\s+)?Service\s+Bulletin|Alert\s+Requirements\s+Bulletin|Alert\s+Service\s+Bulletin)\s+'
+    r'(?P<id>[A-Z0-9]+(?:-[A-Z0-9]+)+(?:\s+RB)?)'
+    r'(?:,\s*(?:Revision\s+\w+,\s*)?dated\s+(?P<dated>{date}))?'.format(date=_DATE),
+)
+_WS = re.compile(r'\s+')
+
+
+def _clean(text):
+    return _WS.sub(' ', text).strip()
+
+
+def _first(patterns, text):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return _clean(match.group(1))
+    return None
+
+
+def read_text(path):
+    """Plain text of an AD document (PDF pages, XML text nodes or the file itself)."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == '.pdf':
+        if PdfReader is None:
+            raise RuntimeError('pypdf is required to read PDF ADs')
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(path).pages)
+    if suffix == '.xml':
+        return '\n'.join(t for t in ET.parse(path).getroot().itertext() if t.strip())
+    with open(path, encoding='utf-8', errors='replace') as fh:
+        return fh.read()
+
+
+def parse_ad_text(text):
+    """Extract the ADs center fields from the text of one AD."""
+    easa = _EASA_ID.search(text)
+    faa = _FAA_ID.search(text)
+    if easa and not faa:
+        ad_id, agency = easa.group(1), EASA
+        applicability = _first([_EASA_APPLIES, _APPLIES], text)
+    else:
+        ad_id, agency = (faa.group(1) if faa else None), FAA
+        applicability = _first([_APPLIES], text)
+
+    bulletins = []
+    referenced = []
+    for match in _BULLETIN.finditer(text):
+        sb_id = _clean(match.group('id'))
+        if sb_id in referenced:
+            continue
+        referenced.append(sb_id)
+        maker = match.group('maker')
+        bulletins.append({
+            # Boeing/Airbus numbers omit the maker ('777-57A0125 RB'); the page shows 'B777-57A0125 RB'
+            'SB-id': f"{maker[0]}{sb_id}" if maker in ('Boeing', 'Airbus') and sb_id[0].isdigit() else sb_id,
+            'SB Type': _clean(match.group('type')).title(),
+            'Dated': match.group('dated') and _clean(match.group('dated')),
+            'Description': '',
+        })
+
+    superseded = []
+    for match in _SUPERSEDES.finditer(text):
+        for ref in _AD_REF.findall(match.group(1)):
+            if ref != ad_id and ref not in superseded:
+                superseded.append(ref)
+
+    return {
+        'AD-id': ad_id,
+        'Agency': agency,
+        'Effective date': _first(_EFFECTIVE, text),
+        'Material incorporated by Reference': ', '.join(referenced) or 'None',
+        'Superseding': 'Yes' if superseded else 'No',
+        'Affected ADs': ', '.join(superseded) or 'None',
+        'Applicability': [applicability] if applicability else [],
+        'ATA': _first(_ATA, text),
+        'Service Bulletins': bulletins,
+    }
+
+
+def parse_ad_file(path):
+    """Parse one AD document; errors are returned in the record, not raised."""
+    try:
+        record = parse_ad_text(read_text(path))
+    except Exception as exc:  # one bad file must not sink the batch
+        record = {'AD-id': None, 'Error': f'{type(exc).__name__}: {exc}'}
+    if record['AD-id'] is None and not record.get('Error'):
+        record['Error'] = 'No AD number found'
+    record['Source'] = os.path.basename(path)
+    return record
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            cache = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('parser_version') != PARSER_VERSION:
+        return {}
+    return cache.get('records', {})
+
+
+def _save_cache(path, records):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'parser_version': PARSER_VERSION, 'records': records}, fh)
+    os.replace(tmp, path)
+
+
+_lock = threading.Lock()
+
+
+def ingest_directory(directory=AD_DIR, cache_path=CACHE_FILE, workers=None):
+    """Parse every AD document in ``directory``, reusing cached parses by content hash.
+
+    Returns the records sorted by AD-id (unparseable files last). Records for
+    files that are no longer in the directory are dropped from the cache.
+    """
+    if not os.path.isdir(directory):
+        return []
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(AD_SUFFIXES)
+    )
+    hashes = {path: fingerprint(path).sha256 for path in paths}
+
+    with _lock:
+        cached = _load_cache(cache_path)
+        todo = [path for path in paths if hashes[path] not in cached]
+        note_cache('ads', f'{len(todo)} of {len(paths)} parsed' if todo else 'hit')
+        if todo:
+            if len(todo) == 1 or workers == 1:
+                parsed = map(parse_ad_file, todo)
+            else:
+                # Spawned, not forked: ingestion runs on a thread of the multi-threaded
+                # server, and a forked child could inherit a lock held by another thread.
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    parsed = list(pool.map(parse_ad_file, todo, chunksize=max(1, len(todo) // 32)))
+            for path, record in zip(todo, parsed):
+                cached[hashes[path]] = record
+        live = {hashes[path]: cached[hashes[path]] for path in paths}
+        if todo or len(live) != len(cached):
+            _save_cache(cache_path, live)
+
+    records = [dict(live[hashes[path]], Source=os.path.basename(path)) for path in paths]
+    return sorted(records, key=lambda r: (r.get('AD-id') is None, r.get('AD-id') or '', r['Source']))
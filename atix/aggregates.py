@@ -0,0 +1,37 @@
+"""Fleet-level compliance summaries read from the store's ``doc_counts`` table.
+
+``doc_counts`` holds one row per aircraft, document type and status and is
+kept current by triggers on every insert, delete and status change, so these
+views cost the same however many documents the fleet has.
+"""
+import pandas as pd
+
+from atix.docstore import DOC_TYPES
+
+COMPLIANT = 'Compliant'
+
+
+def count_frame(store):
+    """``doc_counts`` as a frame (aircraft_id, doc_type, status, n)."""
+    return pd.DataFrame(store.count_rows(), columns=['aircraft_id', 'doc_type', 'status', 'n'])
+
+
+def fleet_summary(store):
+    """Applicable and pending counts per aircraft and document type.
+
+    Columns are a (measure, doc_type) MultiIndex with measures ``Applicable``
+    and ``Pending``; aircraft with no documents of a type get 0.
+    """
+    counts = count_frame(store)
+    counts['pending'] = counts['n'].where(counts['status'] != COMPLIANT, 0)
+    summary = counts.pivot_table(
+        index='aircraft_id', columns='doc_type', values=['n', 'pending'], aggfunc='sum', fill_value=0,
+    ).rename(columns={'n': 'Applicable', 'pending': 'Pending'}, level=0)
+    columns = pd.MultiIndex.from_product([['Applicable', 'Pending'], list(DOC_TYPES.values())])
+    return summary.reindex(columns=columns, fill_value=0).astype('int64')
+
+
+def status_breakdown(store):
+    """Fleet-wide document counts per type (rows) and status (columns)."""
+    counts = count_frame(store)
+    return counts.pivot_table(index='doc_type', columns='status', values='n', aggfunc='sum', fill_value=0)
@@ -0,0 +1,377 @@
+"""Read-only JSON API over the shared ED indexes and the tracker store.
+
+Other systems can ask for ED applicability and tracker documents over HTTP
+instead of scraping the Streamlit pages. Requests are answered from the same
+process-wide resources the pages use (``atix.services``), preloaded before
+the server starts listening, so a request costs an index lookup and the
+serialization of one page of rows. Nothing is re-executed per request.
+
+The app is an ASGI (Starlette) app served by uvicorn. Handlers do their work
+on the worker thread pool, never on the event loop: fingerprinting the
+export, index lookups and serialization as well as SQLite reads, which draw
+from the store's pooled read connections. A slow request, or one that has to
+rebuild an index after the export changed, never holds up the others.
+
+Run it with ``python -m atix serve``, alongside ``streamlit run hello.py`` or
+instead of it; setting ``ATIX_API_PORT`` also starts it inside the Streamlit
+process so both share one copy of the data (see :func:`start_in_background`).
+
+Endpoints (all ``GET``; list endpoints take ``offset`` and ``limit``):
+
+* ``/health``
+* ``/eds/types`` — ED and aircraft counts per type
+* ``/eds/before?type=A350&date=2020-06-01`` — EDs issued before a date
+* ``/fleet`` — registrations with their type and in-service date
+* ``/eds/registration/{registration}`` — EDs issued before its in-service date
+* ``/aircraft`` — tracker aircraft
+* ``/aircraft/{id}/counts`` — applicable and pending documents per type
+* ``/aircraft/{id}/documents?type=AD&q=text`` — one aircraft's documents
+* ``/aircraft/{id}/documents/{document_id}/related`` — documents linking to one
+* ``/aircraft/{id}/documents/{document_id}/ancestors`` — documents one links up to
+* ``/aircraft/{id}/tree?ad=AD-id`` — ADs with their transitive children
+* ``/due?next=20`` or ``/due?days=30`` — fleet-wide next-due tasks (paged)
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.routing import Route
+
+from atix import services
+from atix.docstore import DOC_TYPES
+from atix.loader import DEFAULT_EXPORT, fingerprint
+from atix.result_cache import ResultCache
+
+log = logging.getLogger(__name__)
+
+HOST = os.environ.get('ATIX_API_HOST', '127.0.0.1')
+PORT = int(os.environ.get('ATIX_API_PORT') or 8502)
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_DAYS = 36500  # /due?days= horizon; far enough for any interval, short of date overflow
+
+# Serialized ED pages, keyed by query and page bounds; cleared when the export changes
+_ed_pages = ResultCache(sizeof=len)
+_server = None
+_server_lock = threading.Lock()
+
+
+# --- responses ---
+
+def _default(value):
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json(payload, status_code=200):
+    body = json.dumps(payload, default=_default, ensure_ascii=False, separators=(',', ':'))
+    return Response(body.encode(), status_code, media_type='application/json')
+
+
+def _rows_json(df):
+    """``df`` as a JSON array of records, dates as ``YYYY-MM-DD`` like the store's."""
+    if df.empty:
+        return '[]'
+    dates = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    if dates:
+        df = df.assign(**{col: df[col].dt.strftime('%Y-%m-%d') for col in dates})
+    return df.to_json(orient='records', force_ascii=False)
+
+
+def _page_body(meta, rows_json):
+    """``meta`` with a ``rows`` member spliced in, so rows serialized by pandas are not re-parsed."""
+    head = json.dumps(meta, default=_default, ensure_ascii=False, separators=(',', ':'))
+    return f'{head[:-1]},"rows":{rows_json}}}'.encode()
+
+
+def _page_response(body):
+    return Response(body, media_type='application/json')
+
+
+async def _http_error(request, exc):
+    return _json({'error': exc.detail}, exc.status_code)
+
+
+# --- parameters ---
+
+def _int_param(request, name, default, minimum=0, maximum=None):
+    raw = request.query_params.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HTTPException(400, f"'{name}' must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        bound = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise HTTPException(400, f"'{name}' must be {bound}")
+    return value
+
+
+def _paging(request):
+    return _int_param(request, 'offset', 0), _int_param(request, 'limit', DEFAULT_LIMIT, 1, MAX_LIMIT)
+
+
+def _ed_indexes():
+    try:
+        return services.ed_indexes()
+    except FileNotFoundError as exc:
+        raise HTTPException(503, f"No ED export: {exc}")
+
+
+def _ed_page(type_key, cutoff, offset, limit, **meta):
+    """One page of the EDs of ``type_key`` issued before ``cutoff``, serialized once per export revision."""
+    # EDs are dated by day, so every time on one day gives the same answer
+    cutoff = cutoff.normalize()
+    version = fingerprint(DEFAULT_EXPORT).sha256
+    key = (type_key, cutoff, offset, limit, tuple(meta.items()))
+    body = _ed_pages.get(key, version=version)
+    if body is None:
+        eds = services.eds_before(type_key, cutoff)
+        meta.update(type=type_key, before=cutoff.date(), total=len(eds), offset=offset, limit=limit)
+        body = _ed_pages.put(key, _page_body(meta, _rows_json(eds.iloc[offset:offset + limit])), version=version)
+    return body
+
+
+def _doc_type(request):
+    doc_type = request.query_params.get('type')
+    if doc_type is not None and doc_type not in DOC_TYPES.values():
+        raise HTTPException(400, f"'type' must be one of {', '.join(DOC_TYPES.values())}")
+    return doc_type
+
+
+def _aircraft_id(request, store):
+    aircraft_id = request.path_params['aircraft_id']
+    if store.aircraft(aircraft_id) is None:
+        raise HTTPException(404, f"Unknown aircraft {aircraft_id}")
+    return aircraft_id
+
+
+# --- EDs ---
+
+async def health(request):
+    return _json({'status': 'ok', 'export': os.path.exists(DEFAULT_EXPORT)})
+
+
+def _ed_types():
+    indexes = _ed_indexes()
+    aircraft = services.fleet()['Type'].value_counts()
+    return {key: {'eds': len(index), 'aircraft': int(aircraft.get(key, 0))} for key, index in indexes.items()}
+
+
+async def ed_types(request):
+    return _json(await run_in_threadpool(_ed_types))
+
+
+def _eds_before(request):
+    indexes = _ed_indexes()
+    type_key = request.query_params.get('type')
+    if type_key not in indexes:
+        raise HTTPException(400, f"'type' must be one of {', '.join(indexes)}")
+    try:
+        cutoff = pd.Timestamp(request.query_params['date'])
+    except KeyError:
+        raise HTTPException(400, "'date' is required (YYYY-MM-DD)")
+    except ValueError:
+        raise HTTPException(400, "'date' must be a date (YYYY-MM-DD)")
+    if pd.isna(cutoff):
+        raise HTTPException(400, "'date' must be a date (YYYY-MM-DD)")
+    offset, limit = _paging(request)
+    return _ed_page(type_key, cutoff, offset, limit)
+
+
+async def eds_before(request):
+    return _page_response(await run_in_threadpool(_eds_before, request))
+
+
+def _fleet(request):
+    offset, limit = _paging(request)
+    df = services.fleet()
+    meta = {'total': len(df), 'offset': offset, 'limit': limit}
+    return _page_body(meta, _rows_json(df.iloc[offset:offset + limit]))
+
+
+async def fleet(request):
+    return _page_response(await run_in_threadpool(_fleet, request))
+
+
+def _eds_for_registration(request):
+    registration = request.path_params['registration']
+    row = services.registrations().get(registration)
+    if row is None:
+        raise HTTPException(404, f"Unknown registration {registration}")
+    if pd.isna(row['Type']) or pd.isna(row['In Service Date']):
+        raise HTTPException(404, f"{registration} has no ED type or in-service date")
+    indexes = _ed_indexes()
+    if row['Type'] not in indexes:
+        raise HTTPException(404, f"No ED index for type {row['Type']}")
+    offset, limit = _paging(request)
+    return _ed_page(
+        row['Type'], row['In Service Date'], offset, limit,
+        registration=registration, aircraft_type=row['Aircraft Type'],
+    )
+
+
+async def eds_for_registration(request):
+    return _page_response(await run_in_threadpool(_eds_for_registration, request))
+
+
+# --- tracker ---
+
+def _aircraft(store, request):
+    offset, limit = _paging(request)
+    total = store.query('SELECT COUNT(*) AS n FROM aircraft')[0]['n']
+    rows = store.query('SELECT * FROM aircraft ORDER BY aircraft_id LIMIT ? OFFSET ?', (limit, offset))
+    return {'total': total, 'offset': offset, 'limit': limit, 'rows': rows}
+
+
+async def aircraft(request):
+    return _json(await run_in_threadpool(_aircraft, services.store(), request))
+
+
+def _counts(store, request):
+    aircraft_id = _aircraft_id(request, store)
+    counts = store.counts(aircraft_id)
+    return {
+        'aircraft_id': aircraft_id,
+        'counts': {doc_type: {'applicable': total, 'pending': pending} for doc_type, (total, pending) in counts.items()},
+    }
+
+
+async def counts(request):
+    return _json(await run_in_threadpool(_counts, services.store(), request))
+
+
+def _documents(store, request):
+    from atix.pagination import StoreSource
+
+    aircraft_id = _aircraft_id(request, store)
+    doc_type = _doc_type(request) or 'AD'
+    offset, limit = _paging(request)
+    text = request.query_params.get('q') or None
+    source = StoreSource(store, aircraft_id, doc_type)
+    return {
+        'aircraft_id': aircraft_id, 'type': doc_type,
+        'total': source.count(text), 'offset': offset, 'limit': limit,
+        'rows': source.fetch_rows(offset, limit, text=text),
+    }
+
+
+async def documents(request):
+    return _json(await run_in_threadpool(_documents, services.store(), request))
+
+
+def _related(store, request):
+    aircraft_id = _aircraft_id(request, store)
+    document_id = request.path_params['document_id']
+    rows = store.related(aircraft_id, document_id, _doc_type(request))
+    return {'aircraft_id': aircraft_id, 'document_id': document_id, 'total': len(rows), 'rows': rows}
+
+
+async def related(request):
+    return _json(await run_in_threadpool(_related, services.store(), request))
+
+
+def _ancestors(store, request):
+    aircraft_id = _aircraft_id(request, store)
+    document_id = request.path_params['document_id']
+    rows = store.ancestors(aircraft_id, document_id, _doc_type(request))
+    return {'aircraft_id': aircraft_id, 'document_id': document_id, 'total': len(rows), 'rows': rows}
+
+
+async def ancestors(request):
+    return _json(await run_in_threadpool(_ancestors, services.store(), request))
+
+
+def _tree(store, request):
+    aircraft_id = _aircraft_id(request, store)
+    offset, limit = _paging(request)
+    rows = store.document_tree(aircraft_id, request.query_params.get('ad'))
+    return {'aircraft_id': aircraft_id, 'total': len(rows), 'offset': offset, 'limit': limit, 'rows': rows[offset:offset + limit]}
+
+
+async def tree(request):
+    return _json(await run_in_threadpool(_tree, services.store(), request))
+
+
+def _due(request):
+    offset, limit = _paging(request)
+    days = _int_param(request, 'days', None, 0, MAX_DAYS)
+    n = _int_param(request, 'next', 20, 1, MAX_LIMIT)
+    scheduler = services.scheduler()
+    items = scheduler.next_due(n) if days is None else scheduler.due_within(days)
+    return {
+        'as_of': scheduler.as_of, 'total': len(items), 'offset': offset, 'limit': limit,
+        'rows': [item._asdict() for item in items[offset:offset + limit]],
+    }
+
+
+async def due(request):
+    return _json(await run_in_threadpool(_due, request))
+
+
+# --- app ---
+
+ROUTES = [
+    Route('/health', health),
+    Route('/eds/types', ed_types),
+    Route('/eds/before', eds_before),
+    Route('/eds/registration/{registration}', eds_for_registration),
+    Route('/fleet', fleet),
+    Route('/aircraft', aircraft),
+    Route('/aircraft/{aircraft_id}/counts', counts),
+    Route('/aircraft/{aircraft_id}/documents', documents),
+    Route('/aircraft/{aircraft_id}/documents/{document_id}/related', related),
+    Route('/aircraft/{aircraft_id}/documents/{document_id}/ancestors', ancestors),
+    Route('/aircraft/{aircraft_id}/tree', tree),
+    Route('/due', due),
+]
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    # Preload everything before the first request (a no-op if already warm)
+    await run_in_threadpool(services.warm_up)
+    yield
+
+
+def create_app():
+    return Starlette(routes=ROUTES, exception_handlers={HTTPException: _http_error}, lifespan=_lifespan)
+
+
+app = create_app()
+
+
+def serve(host=HOST, port=PORT, log_level='info'):
+    """Serve :data:`app` until interrupted."""
+    import uvicorn
+
+    uvicorn.run(app, host=host, port=port, log_level=log_level, access_log=False)
+
+
+def start_in_background(host=HOST, port=PORT):
+    """Serve :data:`app` from a daemon thread of this process, once; returns the thread.
+
+    Called by ``atix.services`` when Streamlit imports it, so the API answers
+    from the Streamlit process's already-loaded data.
+    """
+    import uvicorn
+
+    global _server
+    with _server_lock:
+        if _server is None:
+            server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level='warning', access_log=False))
+            thread = threading.Thread(target=server.run, name='atix-api', daemon=True)
+            thread.start()
+            _server = (server, thread)
+            log.info("JSON API listening on http://%s:%s", host, port)
+        return _server[1]
@@ -0,0 +1,130 @@
+"""Fleet-wide ED applicability: every registration against every ED of its type.
+
+The per-type :class:`~atix.ed_index.EDIndex` is already sorted by issue date,
+so one vectorized ``searchsorted`` gives the number of applicable EDs for
+every aircraft of a type. The long registration x ED frame is then built with
+``np.repeat``/``arange`` arithmetic and written chunk by chunk, so the whole
+matrix never has to sit in memory.
+"""
+import numpy as np
+import pandas as pd
+
+from atix.fleet import fleet_frame
+from atix.loader import ED_COLUMNS
+
+AIRCRAFT_COLUMNS = ['Registration', 'Aircraft Type', 'In Service Date']
+MATRIX_COLUMNS = AIRCRAFT_COLUMNS + ED_COLUMNS
+CHUNK_ROWS = 250_000
+
+
+def applicability_counts(indexes, fleet=None):
+    """Per-registration number of EDs issued before its in-service date."""
+    fleet = fleet_frame() if fleet is None else fleet
+    counts = pd.Series(0, index=fleet.index, dtype='int64')
+    for key, index in indexes.items():
+        mask = (fleet['Type'] == key).to_numpy()
+        if mask.any():
+            counts[mask] = index.counts_before(fleet.loc[mask, 'In Service Date'])
+    result = fleet[AIRCRAFT_COLUMNS].copy()
+    result['Applicable EDs'] = counts
+    return result
+
+
+def _segments(counts, chunk_rows):
+    """Split aircraft positions into runs whose ED counts sum to ~chunk_rows."""
+    lo, total = 0, 0
+    for i, count in enumerate(counts):
+        if total and total + count > chunk_rows:
+            yield lo, i
+            lo, total = i, 0
+        total += count
+    if lo < len(counts):
+        yield lo, len(counts)
+
+
+def iter_applicability(indexes, fleet=None, chunk_rows=CHUNK_ROWS):
+    """Yield the long-format registration x ED matrix in frames of about ``chunk_rows``."""
+    fleet = fleet_frame() if fleet is None else fleet
+    for key, index in indexes.items():
+        aircraft = fleet.loc[fleet['Type'] == key, AIRCRAFT_COLUMNS].reset_index(drop=True)
+        if aircraft.empty or not len(index):
+            continue
+        counts = index.counts_before(aircraft['In Service Date'])
+        for lo, hi in _segments(counts, chunk_rows):
+            run = counts[lo:hi]
+            total = int(run.sum())
+            if not total:
+                continue
+            # Aircraft i owns run[i] rows, which are ED positions 0..run[i]-1.
+            owner = np.repeat(np.arange(lo, hi), run)
+            ed_pos = np.arange(total) - np.repeat(np.cumsum(run) - run, run)
+            left = aircraft.iloc[owner].reset_index(drop=True)
+            right = index.frame.iloc[ed_pos].reset_index(drop=True)
+            yield pd.concat([left, right], axis=1)
+
+
+def applicability_matrix(indexes, fleet=None):
+    """The whole long-format matrix as one frame (small fleets / tests)."""
+    chunks = list(iter_applicability(indexes, fleet))
+    if not chunks:
+        return pd.DataFrame(columns=MATRIX_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _format_for(out, fmt):
+    if fmt:
+        return fmt
+    name = out if isinstance(out, str) else getattr(out, 'name', '')
+    return 'parquet' if str(name).endswith('.parquet') else 'csv'
+
+
+def write_applicability(out, indexes, fleet=None, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Write the matrix to ``out`` (a path or binary file) in a single pass.
+
+    ``fmt`` is ``'csv'`` or ``'parquet'``; by default it follows the file
+    extension. Returns the number of rows written.
+    """
+    fmt = _format_for(out, fmt)
+    chunks = iter_applicability(indexes, fleet, chunk_rows)
+    if fmt == 'parquet':
+        return _write_parquet(out, chunks)
+    if fmt == 'csv':
+        return _write_csv(out, chunks)
+    raise ValueError(f"Unsupported format: {fmt!r}")
+
+
+def _write_csv(out, chunks):
+    fh = open(out, 'wb') if isinstance(out, str) else out
+    rows = 0
+    try:
+        for chunk in chunks:
+            fh.write(chunk.to_csv(index=False, header=not rows).encode('utf-8'))
+            rows += len(chunk)
+        if not rows:
+            fh.write(pd.DataFrame(columns=MATRIX_COLUMNS).to_csv(index=False).encode('utf-8'))
+    finally:
+        if fh is not out:
+            fh.close()
+    return rows
+
+
+def _write_parquet(out, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+        if writer is None:
+            empty = pa.Table.from_pandas(pd.DataFrame(columns=MATRIX_COLUMNS), preserve_index=False)
+            pq.write_table(empty, out)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
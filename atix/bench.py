@@ -0,0 +1,267 @@
+"""Synthetic-scale benchmarks for the ED and tracker pipelines.
+
+A seeded generator builds an ED export, a fleet and deep AD -> SB -> TO/ED
+trees at any scale. Each pipeline stage is timed on that data, and results
+are written as JSON and compared against a stored baseline, so slowdowns
+show up before deploy::
+
+    python -m atix bench --preset medium --out bench.json --baseline benchmarks/medium.json
+"""
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+PRESETS = {
+    'small': {'eds': 10_000, 'tails': 10, 'ads_per_tail': 50},
+    'medium': {'eds': 100_000, 'tails': 100, 'ads_per_tail': 200},
+    'large': {'eds': 1_000_000, 'tails': 1_000, 'ads_per_tail': 500},
+}
+# Writing the synthetic workbook dominates above this size, so larger runs skip the load stage.
+MAX_WORKBOOK_ROWS = 200_000
+DEFAULT_TOLERANCE = 0.25
+# Differences below this many seconds are noise, whatever the ratio.
+MIN_REGRESSION_SECONDS = 0.05
+# Meta fields describing the host; timings from different hosts are not comparable.
+MACHINE_KEYS = ('machine', 'cpu', 'cpus')
+
+_TYPES = [
+    ('A350', 'Airbus A350-900'), ('A330', 'Airbus A330-300'), ('A320', 'Airbus A320-200'),
+    ('B777', 'Boeing 777-300ER'), ('B787', 'Boeing 787-9 Dreamliner'),
+]
+_DESCRIPTIONS = [
+    'A350 Inspection of Main Landing Gear', 'B777 cabin lights upgrade', 'A320 wing flap inspection',
+    'A330 fuselage repair', 'B787 nav system check', 'VISUAL INSP TIE BOLTS OF MLG WHEEL',
+    'ENGINE POS.2 - INLET COWL INSPECTION', '777-300ER seating modification', 'HS-THY landing gear',
+    'A320 P320 ITO update', 'Conditional Inspection - Aircraft High G', 'Repair Damage GFRP on Elevator',
+]
+_NAMES = ['SUCHAI SRIKWAMCHAROEN', 'RODNAPAN NUTSATHIT', 'ANAN PRASERT', 'KANYA WONG']
+_STATUSES = ['Compliant', 'Not Compliant', 'N/A', 'Pending Review']
+
+
+# --- data generation ---
+
+def synthetic_eds(n, seed=0, revisions=0.1):
+    """Raw export rows: ``n`` documents plus about ``revisions * n`` older versions."""
+    rng = np.random.default_rng(seed)
+    extra = int(n * revisions)
+    docs = np.concatenate([np.arange(n), rng.integers(0, n, extra)])
+    rng.shuffle(docs)
+    return pd.DataFrame({
+        'Document': [f'BKKTE-F/{d // 1000:02d}-{d % 1000:03d}-{d}' for d in docs],
+        'Document version': rng.integers(0, 5, len(docs)),
+        'Description': np.array(_DESCRIPTIONS, dtype=object)[rng.integers(0, len(_DESCRIPTIONS), len(docs))],
+        'From date': pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 9500, len(docs)), unit='D'),
+        'Full Name': np.array(_NAMES, dtype=object)[rng.integers(0, len(_NAMES), len(docs))],
+    })
+
+
+def synthetic_fleet(tails, seed=0):
+    """Fleet frame shaped like ``atix.fleet.fleet_frame()``."""
+    rng = np.random.default_rng(seed + 1)
+    kinds = rng.integers(0, len(_TYPES), tails)
+    return pd.DataFrame({
+        'Registration': [f'HS-{i:04d}' for i in range(tails)],
+        'Aircraft Type': [_TYPES[k][1] for k in kinds],
+        'In Service Date': pd.Timestamp('2005-01-01') + pd.to_timedelta(rng.integers(0, 7000, tails), unit='D'),
+        'Type': [_TYPES[k][0] for k in kinds],
+    })
+
+
+def synthetic_documents(ad_count, seed=0, prefix='', sbs_per_ad=(1, 4), children_per_sb=(1, 3)):
+    """Deep AD -> SB -> TO/ED trees with unique ids, in the tracker's documents dict shape."""
+    rng = np.random.default_rng(seed)
+    today = date.today()
+    docs = {'ADs': [], 'SBs': [], 'TOs': [], 'EDs': []}
+    for a in range(ad_count):
+        ad_id = f'AD-{prefix}{a}'
+        docs['ADs'].append({
+            'document_id': ad_id,
+            'title': f'Airworthiness Directive for Component {a + 1}',
+            'status': _STATUSES[rng.integers(0, 4)],
+            'date_due': today + timedelta(days=int(rng.integers(10, 365))),
+            'last_completed': today - timedelta(days=int(rng.integers(10, 365))),
+        })
+        for s in range(rng.integers(*sbs_per_ad)):
+            sb_id = f'SB-{prefix}{a}-{s}'
+            docs['SBs'].append({'document_id': sb_id, 'title': f'Service Bulletin related to {ad_id}',
+                                'status': _STATUSES[rng.integers(0, 4)], 'related_document_id': ad_id})
+            for kind, key in (('TO', 'TOs'), ('ED', 'EDs')):
+                for c in range(rng.integers(*children_per_sb)):
+                    docs[key].append({'document_id': f'{kind}-{prefix}{a}-{s}-{c}', 'title': f'{kind} for {sb_id}',
+                                      'status': _STATUSES[rng.integers(0, 2)], 'related_document_id': sb_id})
+    return docs
+
+
+def write_workbook(df, path):
+    """Write ``df`` as an .xlsx export using openpyxl's streaming writer."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        ws.append([v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in row])
+    wb.save(path)
+
+
+# --- timing ---
+
+class Recorder:
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        info = {}
+        started = time.perf_counter()
+        yield info
+        info['seconds'] = round(time.perf_counter() - started, 4)
+        self.stages[name] = info
+
+
+def run(eds=10_000, tails=10, ads_per_tail=50, seed=0, workdir=None, max_workbook_rows=MAX_WORKBOOK_ROWS):
+    """Generate data at the given scale, time every stage and return the results dict."""
+    from atix import loader
+    from atix.aggregates import fleet_summary
+    from atix.applicability import applicability_counts, write_applicability
+    from atix.classifier import classify_frame, type_indexes
+    from atix.docstore import DocumentStore
+    from atix.export import write_fleet_zip
+
+    rec = Recorder()
+    raw = synthetic_eds(eds, seed)
+    fleet = synthetic_fleet(tails, seed)
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        if eds <= max_workbook_rows:
+            path = os.path.join(tmp, 'export.xlsx')
+            write_workbook(raw, path)
+            with rec.stage('workbook_load') as info:
+                info['rows'] = len(loader.read_ed_export(path))
+            cache_dir = os.path.join(tmp, 'cache')
+            loader.load_ed_frame(path, cache_dir)
+            loader.clear_cache(path)
+            with rec.stage('sidecar_load') as info:
+                info['rows'] = len(loader.load_ed_frame(path, cache_dir))
+            loader.clear_cache(path)
+
+        with rec.stage('deduplicate') as info:
+            df = loader.prepare_ed_frame(raw)
+            info['rows'] = len(df)
+
+        with rec.stage('classify') as info:
+            classified = classify_frame(df)
+            info['rows'] = int(classified['aircraft_type'].notna().sum())
+
+        with rec.stage('index_build') as info:
+            indexes = type_indexes(classified)
+            info['rows'] = sum(len(index) for index in indexes.values())
+
+        with rec.stage('in_service_filter') as info:
+            counts = applicability_counts(indexes, fleet)
+            for key, registration_date in zip(fleet['Type'], fleet['In Service Date']):
+                indexes[key].before(registration_date)
+            info['rows'] = int(counts['Applicable EDs'].sum())
+
+        with rec.stage('applicability_export') as info:
+            with open(os.devnull, 'wb') as sink:
+                info['rows'] = write_applicability(sink, indexes, fleet, fmt='csv')
+
+        store = DocumentStore(os.path.join(tmp, 'documents.sqlite3'))
+        with rec.stage('store_seed') as info:
+            for t, registration in enumerate(fleet['Registration']):
+                store.add_aircraft(registration, model=fleet['Aircraft Type'][t], flight_hours=0, flight_cycles=0)
+                store.add_documents(registration, synthetic_documents(ads_per_tail, seed + t, prefix=f'{t}-'))
+            info['rows'] = store.query('SELECT COUNT(*) AS n FROM documents')[0]['n']
+
+        with rec.stage('related_lookup') as info:
+            registration = fleet['Registration'][0]
+            found = 0
+            for ad_id in store.document_ids(registration, 'AD'):
+                found += len(store.document_tree(registration, ad_id))
+            info['rows'] = found
+
+        with rec.stage('aggregates') as info:
+            for registration in fleet['Registration']:
+                store.counts(registration)
+            info['rows'] = len(fleet_summary(store))
+
+        with rec.stage('documents_csv_export') as info:
+            info['rows'] = write_fleet_zip(io.BytesIO(), store)
+        store.close()
+
+    return {
+        'meta': {
+            'eds': eds, 'tails': tails, 'ads_per_tail': ads_per_tail, 'seed': seed,
+            'python': platform.python_version(), 'pandas': pd.__version__,
+            'machine': platform.machine(), 'cpu': _cpu_model(), 'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'stages': rec.stages,
+    }
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as fh:
+            for line in fh:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or None
+
+
+def machine_differences(results, baseline):
+    """``{meta key: (baseline value, value)}`` for the host fields that differ."""
+    return {
+        key: (baseline['meta'].get(key), results['meta'].get(key))
+        for key in MACHINE_KEYS
+        if baseline['meta'].get(key) != results['meta'].get(key)
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, any_machine=False):
+    """Regressions as ``[(stage, baseline_seconds, seconds)]``.
+
+    A stage regresses when it is more than ``tolerance`` slower than the
+    baseline and by more than ``MIN_REGRESSION_SECONDS``. Baselines recorded
+    at a different scale, or on a different host unless ``any_machine``, are
+    not comparable and raise ``ValueError``.
+    """
+    scale = ('eds', 'tails', 'ads_per_tail', 'seed')
+    if any(results['meta'].get(k) != baseline['meta'].get(k) for k in scale):
+        raise ValueError('Baseline was recorded at a different scale')
+    differences = machine_differences(results, baseline)
+    if differences and not any_machine:
+        detail = ', '.join(f"{key} {before!r} != {after!r}" for key, (before, after) in differences.items())
+        raise ValueError(f'Baseline was recorded on a different machine ({detail})')
+    regressions = []
+    for name, info in results['stages'].items():
+        before = baseline['stages'].get(name)
+        if before is None:
+            continue
+        limit = before['seconds'] * (1 + tolerance)
+        if info['seconds'] > limit and info['seconds'] - before['seconds'] > MIN_REGRESSION_SECONDS:
+            regressions.append((name, before['seconds'], info['seconds']))
+    return regressions
+
+
+def save(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(results, fh, indent=2)
+        fh.write('\n')
+
+
+def load(path):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
@@ -0,0 +1,102 @@
+"""Single-pass aircraft-type classification of ED descriptions.
+
+Types are driven by ``TYPE_RULES``: an ED belongs to a type when its
+description contains any of the type's include tokens and none of its
+exclude tokens (case-insensitive substring match, as the ED Checker always
+did). All tokens of all rules are compiled into one pattern, so each distinct
+description is scanned once no matter how many types are configured.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from atix.ed_index import EDIndex
+from atix.loader import ED_COLUMNS
+
+# (type key, include tokens, exclude tokens)
+TYPE_RULES = [
+    ('A350', ('A350', '350'), ('HS',)),
+    ('A330', ('A330', '330'), ('HS',)),
+    ('A320', ('A320', '320'), ('HS', 'ITO', 'P320 ')),
+    ('B777', ('B777', '777'), ('HS',)),
+    ('B787', ('B787', '787'), ('HS',)),
+]
+
+TYPE_COLUMN = 'aircraft_type'
+LABEL_SEP = ','
+
+
+class TypeClassifier:
+    """Compiled form of a rules table."""
+
+    def __init__(self, rules=TYPE_RULES):
+        self.rules = list(rules)
+        self.keys = [key for key, _, _ in self.rules]
+        tokens = sorted({t.upper() for _, inc, exc in self.rules for t in inc + exc}, key=len, reverse=True)
+        # A zero-width lookahead reports a match at every position, so
+        # overlapping tokens are all seen. Longest-first alternation picks the
+        # longest token at a position; shorter tokens matching there are its
+        # prefixes and are recovered through ``_implied``.
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, tokens)) + '))', re.IGNORECASE)
+        self._implied = {t: frozenset(s for s in tokens if t.startswith(s)) for t in tokens}
+        self._includes = [frozenset(t.upper() for t in inc) for _, inc, _ in self.rules]
+        self._excludes = [frozenset(t.upper() for t in exc) for _, _, exc in self.rules]
+
+    def tokens_in(self, text):
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._implied[match.group(1).upper()]
+        return found
+
+    def labels_for(self, text):
+        """Type keys matching ``text``, in rules-table order."""
+        if not isinstance(text, str):
+            return ()
+        found = self.tokens_in(text)
+        if not found:
+            return ()
+        return tuple(
+            key for key, inc, exc in zip(self.keys, self._includes, self._excludes)
+            if found & inc and not found & exc
+        )
+
+    def classify(self, descriptions):
+        """Categorical of comma-joined type keys (NaN when no type matches)."""
+        codes, uniques = pd.factorize(pd.Series(descriptions), use_na_sentinel=True)
+        # Exports repeat descriptions heavily, so only distinct strings are scanned.
+        unique_labels = [LABEL_SEP.join(self.labels_for(text)) or None for text in uniques]
+        categories = sorted({label for label in unique_labels if label})
+        lookup = pd.Categorical(unique_labels, categories=categories).codes
+        # Missing descriptions (code -1) stay unlabelled; there may be no others at all
+        label_codes = np.full(len(codes), -1, dtype=lookup.dtype)
+        present = codes != -1
+        label_codes[present] = lookup[codes[present]]
+        return pd.Categorical.from_codes(label_codes, categories=categories)
+
+    def masks(self, labels):
+        """Boolean membership array per type key for a classified column."""
+        labels = pd.Categorical(labels)
+        result = {}
+        for key in self.keys:
+            hits = [i for i, cat in enumerate(labels.categories) if key in cat.split(LABEL_SEP)]
+            result[key] = pd.Series(labels.codes).isin(hits).to_numpy()
+        return result
+
+
+DEFAULT_CLASSIFIER = TypeClassifier()
+
+
+def classify_frame(df, classifier=DEFAULT_CLASSIFIER):
+    """Copy of ``df`` with a categorical ``aircraft_type`` column."""
+    df = df.copy()
+    df[TYPE_COLUMN] = classifier.classify(df['Description'])
+    return df
+
+
+def type_indexes(df, classifier=DEFAULT_CLASSIFIER):
+    """Classify ``df`` and build one date-sorted :class:`EDIndex` per type key."""
+    if TYPE_COLUMN not in df:
+        df = classify_frame(df, classifier)
+    masks = classifier.masks(df[TYPE_COLUMN])
+    return {key: EDIndex(df.loc[masks[key], ED_COLUMNS]) for key in classifier.keys}
@@ -0,0 +1,464 @@
+"""Persistent SQLite store for tracker aircraft and documents.
+
+ADs, SBs, TOs and EDs live in one ``documents`` table keyed by aircraft and
+document type, with indexes for the tracker's queries (counts by status,
+related documents). Reads go through a small pool of read-only connections
+shared by every Streamlit session; writes go through a single locked writer.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+import pandas as pd
+
+from atix.schema import compact_document_frame
+
+DEFAULT_DB = os.environ.get('ATIX_DOCSTORE', 'documents.sqlite3')
+POOL_SIZE = 4
+# Seconds a query waits for a free pooled read connection before giving up
+POOL_TIMEOUT = float(os.environ.get('ATIX_DOCSTORE_TIMEOUT', 30))
+
+# Key in the per-aircraft documents dict -> document type label
+DOC_TYPES = {'ADs': 'AD', 'SBs': 'SB', 'TOs': 'TO', 'EDs': 'ED'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aircraft (
+    aircraft_id TEXT PRIMARY KEY,
+    model TEXT,
+    airworthiness_certificate_date TEXT,
+    flight_hours INTEGER,
+    flight_cycles INTEGER
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    aircraft_id TEXT NOT NULL REFERENCES aircraft(aircraft_id),
+    doc_type TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    title TEXT,
+    status TEXT,
+    related_document_id TEXT,
+    date_due TEXT,
+    last_completed TEXT,
+    due_hours REAL,
+    due_cycles INTEGER,
+    interval_days INTEGER,
+    interval_hours REAL,
+    interval_cycles INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_documents_type_status ON documents(aircraft_id, doc_type, status);
+CREATE INDEX IF NOT EXISTS ix_documents_related ON documents(aircraft_id, related_document_id);
+CREATE INDEX IF NOT EXISTS ix_documents_document ON documents(aircraft_id, document_id);
+
+-- Document counts per aircraft, type and status, kept current by triggers so
+-- summaries never scan the documents table. A NULL status is stored as ''.
+CREATE TABLE IF NOT EXISTS doc_counts (
+    aircraft_id TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (aircraft_id, doc_type, status)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS tr_documents_insert AFTER INSERT ON documents BEGIN
+    INSERT INTO doc_counts VALUES (NEW.aircraft_id, NEW.doc_type, IFNULL(NEW.status, ''), 1)
+        ON CONFLICT (aircraft_id, doc_type, status) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_documents_delete AFTER DELETE ON documents BEGIN
+    UPDATE doc_counts SET n = n - 1
+     WHERE aircraft_id = OLD.aircraft_id AND doc_type = OLD.doc_type AND status = IFNULL(OLD.status, '');
+    DELETE FROM doc_counts
+     WHERE aircraft_id = OLD.aircraft_id AND doc_type = OLD.doc_type AND status = IFNULL(OLD.status, '') AND n <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_documents_update AFTER UPDATE OF aircraft_id, doc_type, status ON documents BEGIN
+    UPDATE doc_counts SET n = n - 1
+     WHERE aircraft_id = OLD.aircraft_id AND doc_type = OLD.doc_type AND status = IFNULL(OLD.status, '');
+    DELETE FROM doc_counts
+     WHERE aircraft_id = OLD.aircraft_id AND doc_type = OLD.doc_type AND status = IFNULL(OLD.status, '') AND n <= 0;
+    INSERT INTO doc_counts VALUES (NEW.aircraft_id, NEW.doc_type, IFNULL(NEW.status, ''), 1)
+        ON CONFLICT (aircraft_id, doc_type, status) DO UPDATE SET n = n + 1;
+END;
+
+-- Change marker for caches built from the store (see DocumentStore.version):
+-- a random id fixed when the file is created plus a generation bumped by
+-- every write to aircraft or documents. Unlike row counts or rowids it never
+-- repeats after deletes, a reset and reseed, or a recreated file.
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID;
+INSERT OR IGNORE INTO store_meta VALUES ('store_id', lower(hex(randomblob(16))));
+INSERT OR IGNORE INTO store_meta VALUES ('generation', 0);
+CREATE TRIGGER IF NOT EXISTS tr_aircraft_insert_generation AFTER INSERT ON aircraft
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+CREATE TRIGGER IF NOT EXISTS tr_aircraft_update_generation AFTER UPDATE ON aircraft
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+CREATE TRIGGER IF NOT EXISTS tr_aircraft_delete_generation AFTER DELETE ON aircraft
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+CREATE TRIGGER IF NOT EXISTS tr_documents_insert_generation AFTER INSERT ON documents
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+CREATE TRIGGER IF NOT EXISTS tr_documents_update_generation AFTER UPDATE ON documents
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+CREATE TRIGGER IF NOT EXISTS tr_documents_delete_generation AFTER DELETE ON documents
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'generation'; END;
+"""
+
+DOCUMENT_FIELDS = [
+    'document_id', 'title', 'status', 'related_document_id', 'date_due', 'last_completed',
+    'due_hours', 'due_cycles', 'interval_days', 'interval_hours', 'interval_cycles',
+]
+# Columns added after the first release, added in place to older databases.
+_ADDED_COLUMNS = [
+    ('due_hours', 'REAL'), ('due_cycles', 'INTEGER'),
+    ('interval_days', 'INTEGER'), ('interval_hours', 'REAL'), ('interval_cycles', 'INTEGER'),
+]
+DATE_FIELDS = ('airworthiness_certificate_date', 'date_due', 'last_completed')
+
+# Every document below an AD (SBs, then the TOs/EDs issued against them), with
+# the AD it hangs off so one query returns the whole fleet-export tree. ``path``
+# holds the row ids already on the way down, so a relation cycle (A -> B -> A,
+# or a document related to itself) stops instead of recursing forever; each
+# document is then reported once per AD, at the depth it was first reached.
+_TREE_SQL = """
+WITH RECURSIVE tree(root_row, root_id, id, depth, path) AS (
+    SELECT d.id, d.document_id, d.id, 0, ',' || d.id || ',' FROM documents d
+     WHERE d.aircraft_id = :aircraft_id AND d.doc_type = 'AD' {root_filter}
+    UNION ALL
+    SELECT tree.root_row, tree.root_id, c.id, tree.depth + 1, tree.path || c.id || ','
+      FROM tree
+      JOIN documents p ON p.id = tree.id
+      JOIN documents c ON c.aircraft_id = p.aircraft_id AND c.related_document_id = p.document_id
+     WHERE instr(tree.path, ',' || c.id || ',') = 0
+),
+reached(root_row, root_id, id, depth) AS (
+    SELECT root_row, root_id, id, MIN(depth) FROM tree GROUP BY root_row, id
+)
+SELECT reached.root_id, reached.depth, d.*
+  FROM reached JOIN documents d ON d.id = reached.id
+ ORDER BY reached.root_row, reached.depth, d.id
+"""
+
+# The reverse walk: from a document up through the documents it links to
+# (TO/ED -> SB -> AD), with the same cycle guard.
+_ANCESTORS_SQL = """
+WITH RECURSIVE up(id, depth, path) AS (
+    SELECT d.id, 0, ',' || d.id || ',' FROM documents d
+     WHERE d.aircraft_id = :aircraft_id AND d.document_id = :document_id
+    UNION ALL
+    SELECT p.id, up.depth + 1, up.path || p.id || ','
+      FROM up
+      JOIN documents c ON c.id = up.id
+      JOIN documents p ON p.aircraft_id = c.aircraft_id AND p.document_id = c.related_document_id
+     WHERE instr(up.path, ',' || p.id || ',') = 0
+),
+reached(id, depth) AS (
+    SELECT id, MIN(depth) FROM up WHERE depth > 0 GROUP BY id
+)
+SELECT reached.depth, d.*
+  FROM reached JOIN documents d ON d.id = reached.id
+ {type_filter}
+ ORDER BY reached.depth, d.id
+"""
+
+
+def _to_sql(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _version(conn):
+    cursor = conn.execute("SELECT key, value FROM store_meta WHERE key IN ('store_id', 'generation')")
+    cursor.row_factory = None
+    values = dict(cursor.fetchall())
+    return values['store_id'], values['generation']
+
+
+def _row_dict(cursor, row):
+    result = {}
+    for (name, *_), value in zip(cursor.description, row):
+        if name in DATE_FIELDS and value is not None:
+            value = date.fromisoformat(value)
+        result[name] = value
+    return result
+
+
+class DocumentStore:
+    """Tracker documents in SQLite with pooled read connections."""
+
+    def __init__(self, path=DEFAULT_DB, pool_size=POOL_SIZE):
+        self.path = os.path.abspath(path)
+        self._write_lock = threading.Lock()
+        self._writer = sqlite3.connect(self.path, check_same_thread=False)
+        self._writer.execute('PRAGMA journal_mode=WAL')
+        self._writer.executescript(SCHEMA)
+        self._migrate()
+        self._writer.commit()
+        self._backfill_counts()
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect_reader())
+
+    def _connect_reader(self):
+        conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+        conn.row_factory = _row_dict
+        return conn
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        self._writer.close()
+
+    @contextmanager
+    def _read(self, timeout=POOL_TIMEOUT):
+        try:
+            conn = self._pool.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free read connection to {self.path} after {timeout:g}s") from None
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _write(self):
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def query(self, sql, params=()):
+        """Run a read-only query and return rows as dicts."""
+        with self._read() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def iter_query(self, sql, params=(), batch_rows=1000):
+        """Like :meth:`query` but yields rows in batches.
+
+        The cursor stays open for as long as the caller iterates (a download
+        may stall or be abandoned), so it runs on a connection of its own,
+        closed when the generator finishes or is discarded, never on one from
+        the shared pool.
+        """
+        conn = self._connect_reader()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_rows)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    # --- writes ---
+
+    def add_aircraft(self, aircraft_id, model=None, airworthiness_certificate_date=None, flight_hours=None, flight_cycles=None):
+        with self._write() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO aircraft VALUES (?, ?, ?, ?, ?)',
+                (aircraft_id, model, _to_sql(airworthiness_certificate_date), flight_hours, flight_cycles),
+            )
+
+    def add_documents(self, aircraft_id, docs):
+        """Insert a ``{'ADs': [...], 'SBs': [...], ...}`` dict of documents."""
+        rows = [
+            (aircraft_id, doc_type, *(_to_sql(doc.get(f)) for f in DOCUMENT_FIELDS))
+            for key, doc_type in DOC_TYPES.items()
+            for doc in docs.get(key, [])
+        ]
+        with self._write() as conn:
+            conn.executemany(
+                f'INSERT INTO documents (aircraft_id, doc_type, {", ".join(DOCUMENT_FIELDS)}) '
+                f'VALUES (?, ?, {", ".join("?" * len(DOCUMENT_FIELDS))})',
+                rows,
+            )
+
+    def set_status(self, aircraft_id, document_id, status):
+        with self._write() as conn:
+            conn.execute(
+                'UPDATE documents SET status = ? WHERE aircraft_id = ? AND document_id = ?',
+                (status, aircraft_id, document_id),
+            )
+
+    def _migrate(self):
+        columns = {row[1] for row in self._writer.execute('PRAGMA table_info(documents)')}
+        for name, kind in _ADDED_COLUMNS:
+            if name not in columns:
+                self._writer.execute(f'ALTER TABLE documents ADD COLUMN {name} {kind}')
+
+    def complete_task(self, aircraft_id, document_id, completed_on, flight_hours=None, flight_cycles=None):
+        """Record compliance on ``completed_on`` and set the next due limits from the intervals.
+
+        ``flight_hours``/``flight_cycles`` are the aircraft's totals at completion
+        (default: the aircraft's current totals). Limits without an interval are
+        cleared, so one-off tasks drop out of the schedule.
+
+        Returns the store :meth:`version` just before and just after this
+        write, so a cache that was current can follow it without a rebuild.
+        """
+        with self._write() as conn:
+            before = _version(conn)
+            if flight_hours is None or flight_cycles is None:
+                hours, cycles = conn.execute(
+                    'SELECT flight_hours, flight_cycles FROM aircraft WHERE aircraft_id = ?', (aircraft_id,),
+                ).fetchone() or (None, None)
+                flight_hours = hours if flight_hours is None else flight_hours
+                flight_cycles = cycles if flight_cycles is None else flight_cycles
+            conn.execute(
+                "UPDATE documents SET status = 'Compliant', last_completed = :on, "
+                "date_due = CASE WHEN interval_days IS NULL THEN NULL ELSE date(:on, '+' || interval_days || ' days') END, "
+                "due_hours = :hours + interval_hours, due_cycles = :cycles + interval_cycles "
+                "WHERE aircraft_id = :aircraft_id AND document_id = :document_id",
+                {'on': _to_sql(completed_on), 'hours': flight_hours, 'cycles': flight_cycles,
+                 'aircraft_id': aircraft_id, 'document_id': document_id},
+            )
+            return before, _version(conn)
+
+    def set_utilisation(self, aircraft_id, flight_hours, flight_cycles):
+        with self._write() as conn:
+            conn.execute(
+                'UPDATE aircraft SET flight_hours = ?, flight_cycles = ? WHERE aircraft_id = ?',
+                (flight_hours, flight_cycles, aircraft_id),
+            )
+
+    def _backfill_counts(self):
+        # Stores created before doc_counts existed have documents but no counts.
+        with self._write() as conn:
+            missing = conn.execute(
+                'SELECT EXISTS (SELECT 1 FROM documents) AND NOT EXISTS (SELECT 1 FROM doc_counts)'
+            ).fetchone()[0]
+            if missing:
+                conn.execute(
+                    "INSERT INTO doc_counts SELECT aircraft_id, doc_type, IFNULL(status, ''), COUNT(*) "
+                    "FROM documents GROUP BY 1, 2, 3"
+                )
+
+    def clear(self):
+        with self._write() as conn:
+            conn.execute('DELETE FROM documents')
+            conn.execute('DELETE FROM aircraft')
+
+    # --- reads ---
+
+    def frame(self, sql, params=()):
+        """Run a read-only query into a frame with the compact ``DOCUMENT_SCHEMA`` types.
+
+        Rows are read as plain tuples, never as per-row dicts.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            columns = [name for name, *_ in cursor.description]
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        return compact_document_frame(df)
+
+    def version(self):
+        """``(store id, generation)``; changes with every write and never repeats for a different state."""
+        with self._read() as conn:
+            return _version(conn)
+
+    def is_empty(self):
+        return not self.query('SELECT 1 AS present FROM aircraft LIMIT 1')
+
+    def aircraft_ids(self):
+        return [row['aircraft_id'] for row in self.query('SELECT aircraft_id FROM aircraft ORDER BY aircraft_id')]
+
+    def aircraft(self, aircraft_id):
+        rows = self.query('SELECT * FROM aircraft WHERE aircraft_id = ?', (aircraft_id,))
+        return rows[0] if rows else None
+
+    def counts(self, aircraft_id):
+        """``{doc_type: (applicable, pending)}``; anything not Compliant is pending."""
+        rows = self.query(
+            "SELECT doc_type, SUM(n) AS total, SUM(CASE WHEN status != 'Compliant' THEN n ELSE 0 END) AS pending "
+            "FROM doc_counts WHERE aircraft_id = ? GROUP BY doc_type",
+            (aircraft_id,),
+        )
+        counts = {doc_type: (0, 0) for doc_type in DOC_TYPES.values()}
+        counts.update({row['doc_type']: (row['total'], row['pending']) for row in rows})
+        return counts
+
+    def count_rows(self):
+        """The whole ``doc_counts`` table: one row per aircraft, type and status."""
+        return self.query('SELECT aircraft_id, doc_type, status, n FROM doc_counts')
+
+    def documents(self, aircraft_id, doc_type):
+        return self.query(
+            'SELECT * FROM documents WHERE aircraft_id = ? AND doc_type = ? ORDER BY id',
+            (aircraft_id, doc_type),
+        )
+
+    def document_frame(self, aircraft_id=None, doc_type=None):
+        """Documents of one aircraft (or the fleet), optionally of one type, as a compact frame."""
+        clauses, params = [], []
+        if aircraft_id is not None:
+            clauses.append('aircraft_id = ?')
+            params.append(aircraft_id)
+        if doc_type is not None:
+            clauses.append('doc_type = ?')
+            params.append(doc_type)
+        where = f'WHERE {" AND ".join(clauses)} ' if clauses else ''
+        return self.frame(f'SELECT * FROM documents {where}ORDER BY id', params)
+
+    def document_ids(self, aircraft_id, doc_type):
+        rows = self.query(
+            'SELECT document_id FROM documents WHERE aircraft_id = ? AND doc_type = ? ORDER BY id',
+            (aircraft_id, doc_type),
+        )
+        return [row['document_id'] for row in rows]
+
+    def related(self, aircraft_id, document_id, doc_type=None):
+        """Documents linking directly to ``document_id``."""
+        sql = 'SELECT * FROM documents WHERE aircraft_id = ? AND related_document_id = ?'
+        params = [aircraft_id, document_id]
+        if doc_type:
+            sql += ' AND doc_type = ?'
+            params.append(doc_type)
+        return self.query(sql + ' ORDER BY id', params)
+
+    def ancestors(self, aircraft_id, document_id, doc_type=None):
+        """Documents ``document_id`` links to, directly or transitively, nearest first.
+
+        Rows carry ``depth`` (1 for the document it links to directly).
+        """
+        type_filter = 'WHERE d.doc_type = :doc_type' if doc_type else ''
+        return self.query(
+            _ANCESTORS_SQL.format(type_filter=type_filter),
+            {'aircraft_id': aircraft_id, 'document_id': document_id, 'doc_type': doc_type},
+        )
+
+    def document_tree(self, aircraft_id, ad_id=None):
+        """Every AD of the aircraft (or just ``ad_id``) followed by its transitive children.
+
+        Rows carry ``root_id`` (the AD) and ``depth`` (0 for the AD itself).
+        """
+        return list(self.iter_document_tree(aircraft_id, ad_id))
+
+    def document_tree_frame(self, aircraft_id, ad_id=None):
+        """:meth:`document_tree` as a compact frame."""
+        root_filter = 'AND d.document_id = :ad_id' if ad_id is not None else ''
+        return self.frame(_TREE_SQL.format(root_filter=root_filter), {'aircraft_id': aircraft_id, 'ad_id': ad_id})
+
+    def iter_document_tree(self, aircraft_id, ad_id=None):
+        """Streaming form of :meth:`document_tree`."""
+        root_filter = 'AND d.document_id = :ad_id' if ad_id is not None else ''
+        return self.iter_query(_TREE_SQL.format(root_filter=root_filter), {'aircraft_id': aircraft_id, 'ad_id': ad_id})
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path=DEFAULT_DB, seed_if_empty=True):
+    """Process-wide :class:`DocumentStore` for ``path``, seeded with sample data if empty."""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = DocumentStore(path)
+            if seed_if_empty and store.is_empty():
+                from atix.seed import seed_store
+                seed_store(store)
+            _stores[path] = store
+        return store
@@ -0,0 +1,42 @@
+"""Date-sorted ED indexes for "EDs issued before in-service date" queries.
+
+Each aircraft type keeps its EDs sorted by ``From date`` once, so a cutoff
+query is a binary search returning a positional slice of the sorted frame
+instead of a boolean mask and a filtered copy per registration.
+"""
+import numpy as np
+import pandas as pd
+
+
+class EDIndex:
+    """EDs for one aircraft type, sorted by issue date."""
+
+    def __init__(self, frame, date_col='From date'):
+        # Undated EDs can never be "before" a cutoff, so they are left out.
+        frame = frame[frame[date_col].notna()]
+        # Stable sort keeps export order among EDs issued on the same day.
+        self.frame = frame.sort_values(date_col, kind='stable').reset_index(drop=True)
+        self.date_col = date_col
+        self._dates = self.frame[date_col].to_numpy()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def count_before(self, cutoff):
+        """Number of EDs issued strictly before ``cutoff``."""
+        if cutoff is None or pd.isna(cutoff):
+            return 0
+        cutoff = pd.Timestamp(cutoff).to_datetime64()
+        return int(np.searchsorted(self._dates, cutoff, side='left'))
+
+    def counts_before(self, cutoffs):
+        """Vectorized :meth:`count_before` for an array of cutoffs (NaT -> 0)."""
+        cutoffs = pd.to_datetime(pd.Series(cutoffs)).to_numpy()
+        counts = np.searchsorted(self._dates, cutoffs, side='left')
+        counts[np.isnat(cutoffs)] = 0
+        return counts
+
+    def before(self, cutoff):
+        """EDs issued strictly before ``cutoff``, as a slice of the sorted frame."""
+        return self.frame.iloc[:self.count_before(cutoff)]
+
@@ -0,0 +1,143 @@
+"""Streaming document-list exports for one aircraft or the whole fleet.
+
+Rows come straight from the document store's cursor and are written to the
+output as they arrive, so nothing is built until a download is requested and
+no export holds a DataFrame plus an encoded copy of it. Fleet exports go one
+tail at a time into a zip of CSVs or a single combined Parquet file.
+"""
+import csv
+import io
+import tempfile
+import zipfile
+
+EXPORT_COLUMNS = ['Document_Type', 'Document_ID', 'Title', 'Status', 'Date_Due', 'Last_Completed', 'Related_To']
+FLEET_COLUMNS = ['Aircraft'] + EXPORT_COLUMNS
+CHUNK_ROWS = 10_000
+NOT_APPLICABLE = 'N/A'
+
+
+def iter_document_rows(store, aircraft_id):
+    """Each AD of ``aircraft_id`` followed by its full tree, as ``EXPORT_COLUMNS`` tuples."""
+    for doc in store.iter_document_tree(aircraft_id):
+        is_ad = doc['depth'] == 0
+        yield (
+            doc['doc_type'],
+            doc['document_id'],
+            doc['title'],
+            doc['status'],
+            doc['date_due'] if is_ad else NOT_APPLICABLE,
+            doc['last_completed'] if is_ad else NOT_APPLICABLE,
+            NOT_APPLICABLE if is_ad else doc['related_document_id'],
+        )
+
+
+def _chunks(rows, chunk_rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(fh, rows, columns=EXPORT_COLUMNS, chunk_rows=CHUNK_ROWS):
+    """Write ``rows`` as UTF-8 CSV to the binary file ``fh``; returns the row count."""
+    text = io.TextIOWrapper(fh, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    count = 0
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        count += len(chunk)
+    text.flush()
+    text.detach()
+    return count
+
+
+def write_xlsx(fh, rows, columns=EXPORT_COLUMNS, sheet_title='Documents'):
+    """Write ``rows`` to a write-only (streaming) openpyxl workbook; returns the row count."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append(columns)
+    count = 0
+    for row in rows:
+        ws.append(row)
+        count += 1
+    wb.save(fh)
+    return count
+
+
+def write_aircraft(fh, store, aircraft_id, fmt='csv'):
+    """Write one aircraft's document list as ``'csv'`` or ``'xlsx'``; returns the row count."""
+    rows = iter_document_rows(store, aircraft_id)
+    if fmt == 'csv':
+        return write_csv(fh, rows)
+    if fmt == 'xlsx':
+        return write_xlsx(fh, rows, sheet_title=aircraft_id)
+    raise ValueError(f"Unsupported format: {fmt!r}")
+
+
+def write_fleet_zip(fh, store, aircraft_ids=None):
+    """One ``<tail>_documents_list.csv`` per aircraft in a zip; returns the total row count."""
+    aircraft_ids = store.aircraft_ids() if aircraft_ids is None else aircraft_ids
+    count = 0
+    with zipfile.ZipFile(fh, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for aircraft_id in aircraft_ids:
+            with zf.open(f'{aircraft_id}_documents_list.csv', 'w') as member:
+                count += write_csv(member, iter_document_rows(store, aircraft_id))
+    return count
+
+
+# Typed Parquet columns use nulls rather than the CSV's 'N/A' placeholder
+_NULLABLE = ('Date_Due', 'Last_Completed', 'Related_To')
+
+
+def _fleet_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [(name, pa.string()) for name in FLEET_COLUMNS[:5]]
+        + [('Date_Due', pa.date32()), ('Last_Completed', pa.date32()), ('Related_To', pa.string())]
+    )
+
+
+def _fleet_table(aircraft_id, chunk, schema):
+    import pyarrow as pa
+
+    columns = {'Aircraft': [aircraft_id] * len(chunk)}
+    for name, values in zip(EXPORT_COLUMNS, zip(*chunk)):
+        columns[name] = [None if v == NOT_APPLICABLE else v for v in values] if name in _NULLABLE else list(values)
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_fleet_parquet(fh, store, aircraft_ids=None, chunk_rows=CHUNK_ROWS):
+    """Every aircraft's documents in one Parquet file with an ``Aircraft`` column."""
+    import pyarrow.parquet as pq
+
+    schema = _fleet_schema()
+    aircraft_ids = store.aircraft_ids() if aircraft_ids is None else aircraft_ids
+    count = 0
+    with pq.ParquetWriter(fh, schema) as writer:
+        for aircraft_id in aircraft_ids:
+            for chunk in _chunks(iter_document_rows(store, aircraft_id), chunk_rows):
+                writer.write_table(_fleet_table(aircraft_id, chunk, schema))
+                count += len(chunk)
+    return count
+
+
+def lazy(write, *args, **kwargs):
+    """Callable for ``st.download_button(data=...)`` that runs ``write(fh, *args)`` on click.
+
+    The file is written to a temporary file on disk and read back once, so
+    the bytes Streamlit serves are the only in-memory copy.
+    """
+    def build():
+        with tempfile.TemporaryFile() as fh:
+            write(fh, *args, **kwargs)
+            fh.seek(0)
+            return fh.read()
+    return build
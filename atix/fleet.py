@@ -0,0 +1,84 @@
+"""Fleet registry used by the ED Checker and the batch applicability engine."""
+import pandas as pd
+
+# Fleet data: (registration, aircraft type, in-service month)
+fleet_data = [
+    ("HS-THY", "Airbus A350-900", "Mar 2024"), ("HS-THZ", "Airbus A350-900", "May 2024"),
+    ("HS-TJR", "Boeing 777-200", "Nov 2006"), ("HS-TJV", "Boeing 777-200", "Sep 2007"),
+    ("HS-TJW", "Boeing 777-200", "Oct 2007"), ("HS-TKK", "Boeing 777-300ER", "Aug 2012"),
+    ("HS-TKL", "Boeing 777-300ER", "Oct 2012"), ("HS-TKM", "Boeing 777-300ER", "Mar 2013"),
+    ("HS-TKN", "Boeing 777-300ER", "Apr 2013"), ("HS-TKO", "Boeing 777-300ER", "Jun 2013"),
+    ("HS-TKP", "Boeing 777-300ER", "Jul 2013"), ("HS-TKQ", "Boeing 777-300ER", "Aug 2013"),
+    ("HS-TKR", "Boeing 777-300ER", "Oct 2013"), ("HS-TKU", "Boeing 777-300ER", "Jan 2014"),
+    ("HS-TKV", "Boeing 777-300ER", "Jul 2014"), ("HS-TKW", "Boeing 777-300ER", "Aug 2014"),
+    ("HS-TKX", "Boeing 777-300ER", "Jan 2015"), ("HS-TKY", "Boeing 777-300ER", "Jun 2015"),
+    ("HS-TKZ", "Boeing 777-300ER", "Sep 2015"), ("HS-TTA", "Boeing 777-300ER", "Apr 2022"),
+    ("HS-TTB", "Boeing 777-300ER", "Apr 2022"), ("HS-TTC", "Boeing 777-300ER", "Apr 2022"),
+    ("HS-TQA", "Boeing 787-8 Dreamliner", "Jul 2014"), ("HS-TQB", "Boeing 787-8 Dreamliner", "Sep 2014"),
+    ("HS-TQC", "Boeing 787-8 Dreamliner", "Oct 2014"), ("HS-TQD", "Boeing 787-8 Dreamliner", "Dec 2014"),
+    ("HS-TQE", "Boeing 787-8 Dreamliner", "Apr 2015"), ("HS-TQF", "Boeing 787-8 Dreamliner", "Aug 2015"),
+    ("HS-TWA", "Boeing 787-9 Dreamliner", "Sep 2017"), ("HS-TWB", "Boeing 787-9 Dreamliner", "Oct 2017"),
+    ("HS-TWC", "Boeing 787-9 Dreamliner", "May 2024"),
+    ("HS-TXA", "Airbus A320-200", "Oct 2023"), ("HS-TXB", "Airbus A320-200", "Dec 2023"),
+    ("HS-TXC", "Airbus A320-200", "Nov 2023"), ("HS-TXD", "Airbus A320-200", "Dec 2023"),
+    ("HS-TXE", "Airbus A320-200", "Jul 2023"), ("HS-TXF", "Airbus A320-200", "Sep 2023"),
+    ("HS-TXG", "Airbus A320-200", "Oct 2023"), ("HS-TXH", "Airbus A320-200", "Dec 2023"),
+    ("HS-TXJ", "Airbus A320-200", "Jan 2024"), ("HS-TXK", "Airbus A320-200", "Sep 2023"),
+    ("HS-TXL", "Airbus A320-200", "Nov 2023"), ("HS-TXM", "Airbus A320-200", "Jan 2024"),
+    ("HS-TXN", "Airbus A320-200", "Dec 2023"), ("HS-TXO", "Airbus A320-200", "Jan 2024"),
+    ("HS-TXP", "Airbus A320-200", "Jan 2024"), ("HS-TXQ", "Airbus A320-200", "May 2023"),
+    ("HS-TXR", "Airbus A320-200", "May 2023"), ("HS-TXS", "Airbus A320-200", "Jul 2023"),
+    ("HS-TXT", "Airbus A320-200", "Nov 2023"), ("HS-TXU", "Airbus A320-200", "Dec 2023"),
+    ("HS-TEN", "Airbus A330-300", "Apr 2009"), ("HS-TEO", "Airbus A330-300", "May 2009"),
+    ("HS-TEP", "Airbus A330-300", "Jul 2009"), ("HS-TEV", "Airbus A330-300", "Oct 2024"),
+    ("HS-TEW", "Airbus A330-300", "Oct 2024"), ("HS-TEX", "Airbus A330-300", "Aug 2025"),
+    ("HS-THB", "Airbus A350-900", "Aug 2016"), ("HS-THC", "Airbus A350-900", "Oct 2016"),
+    ("HS-THD", "Airbus A350-900", "Apr 2017"), ("HS-THE", "Airbus A350-900", "Jun 2017"),
+    ("HS-THF", "Airbus A350-900", "Jul 2017"), ("HS-THG", "Airbus A350-900", "Aug 2017"),
+    ("HS-THH", "Airbus A350-900", "Sep 2017"), ("HS-THJ", "Airbus A350-900", "Jan 2018"),
+    ("HS-THK", "Airbus A350-900", "Jan 2018"), ("HS-THL", "Airbus A350-900", "Feb 2018"),
+    ("HS-THM", "Airbus A350-900", "Mar 2018"), ("HS-THN", "Airbus A350-900", "May 2018"),
+    ("HS-THO", "Airbus A350-900", "May 2023"), ("HS-THP", "Airbus A350-900", "Jun 2023"),
+    ("HS-THQ", "Airbus A350-900", "Sep 2023"), ("HS-THR", "Airbus A350-900", "Oct 2023"),
+    ("HS-THS", "Airbus A350-900", "Feb 2024"), ("HS-THT", "Airbus A350-900", "Apr 2024"),
+    ("HS-THU", "Airbus A350-900", "Apr 2024"), ("HS-THV", "Airbus A350-900", "Nov 2023"),
+    ("HS-THX", "Airbus A350-900", "Mar 2024"),
+]
+
+# ED Checker type key -> substring that identifies the type in 'Aircraft Type'
+FLEET_TYPES = {
+    'A350': 'A350',
+    'A330': 'A330',
+    'A320': 'A320',
+    'B777': '777',
+    'B787': '787',
+}
+
+FLEET_COLUMNS = ['Registration', 'Aircraft Type', 'In Service Date']
+
+
+def type_key_for(aircraft_type):
+    """Return the ED Checker type key for a fleet 'Aircraft Type' string, or None."""
+    for key, needle in FLEET_TYPES.items():
+        if needle in aircraft_type:
+            return key
+    return None
+
+
+def fleet_frame(data=None):
+    """Whole fleet as a frame with parsed in-service dates and a 'Type' key column."""
+    df = pd.DataFrame(fleet_data if data is None else data, columns=FLEET_COLUMNS)
+    df['In Service Date'] = pd.to_datetime(df['In Service Date'], format='%b %Y', errors='coerce')
+    df['Type'] = df['Aircraft Type'].map(type_key_for)
+    return df
+
+
+def fleet_by_type(df=None, keys=None):
+    """Split the fleet frame into one frame per ED Checker type key.
+
+    Keys without aircraft in the fleet get an empty frame.
+    """
+    if df is None:
+        df = fleet_frame()
+    keys = FLEET_TYPES if keys is None else keys
+    return {key: df[df['Type'] == key][FLEET_COLUMNS].reset_index(drop=True) for key in keys}
@@ -0,0 +1,241 @@
+"""Cached, fingerprinted loading of the document-management export.
+
+Streamlit re-executes a page on every widget change, so parsing
+``export.XLSX`` through openpyxl on each rerun is far too slow for real
+exports. The workbook is parsed once, written to a columnar sidecar next to a
+fingerprint of the source, and every later rerun or session reuses the parsed
+frame. Touching or replacing the workbook changes the fingerprint and forces a
+fresh parse.
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import namedtuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from atix.profiling import note_cache
+from atix.schema import compact_ed_frame
+
+# Columns the ED pages actually use, in display order.
+ED_COLUMNS = ['Document', 'Document version', 'Description', 'From date', 'Full Name']
+
+DEFAULT_EXPORT = 'export.XLSX'
+CACHE_DIR = '.atix-cache'
+# Bump when prepare_ed_frame's output changes, so old sidecars are not reused.
+SIDECAR_VERSION = 2
+
+Fingerprint = namedtuple('Fingerprint', ['path', 'size', 'mtime_ns', 'sha256'])
+
+_lock = threading.Lock()
+_hashes = {}   # path -> (size, mtime_ns, sha256), so reruns don't re-hash an unchanged file
+_frames = {}   # path -> (Fingerprint, DataFrame)
+_derived = {}  # (path, name) -> (Fingerprint, value)
+
+try:
+    import pyarrow  # noqa: F401
+    SIDECAR_EXT = '.parquet'
+except ImportError:  # pragma: no cover - depends on the environment
+    SIDECAR_EXT = '.pkl'
+
+
+def _hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path=DEFAULT_EXPORT):
+    """Identify the current contents of ``path`` by size, mtime and content hash."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cached = _hashes.get(path)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        sha = cached[2]
+    else:
+        sha = _hash_file(path)
+        # Only the current revision of each file is kept
+        _hashes[path] = (st.st_size, st.st_mtime_ns, sha)
+    return Fingerprint(path, st.st_size, st.st_mtime_ns, sha)
+
+
+def prepare_ed_frame(df):
+    """Project, deduplicate and type an ED frame the way the ED Checker expects it.
+
+    Columns get the compact types of ``atix.schema.ED_SCHEMA``.
+    """
+    df = df.reindex(columns=ED_COLUMNS)
+    df = df.drop_duplicates(subset=['Document'], keep='last')
+    return compact_ed_frame(df).reset_index(drop=True)
+
+
+def latest_versions(path, columns=ED_COLUMNS, key='Document'):
+    """Stream ``path`` and return ``{key value: projected row tuple}``.
+
+    The workbook is read in openpyxl's read-only mode one row at a time and
+    only ``columns`` are kept, so peak memory is bounded by the number of
+    distinct documents rather than the size of the export. A later row for
+    the same document replaces the earlier one and moves to the end, which is
+    the ordering ``drop_duplicates(keep='last')`` produces.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions = {name: i for i, name in enumerate(header) if name is not None}
+        picks = [positions.get(col) for col in columns]
+        key_pos = positions.get(key)
+        latest = {}
+        for row in rows:
+            if not any(v is not None for v in row):
+                continue
+            values = tuple(row[i] if i is not None and i < len(row) else None for i in picks)
+            doc = row[key_pos] if key_pos is not None and key_pos < len(row) else None
+            latest.pop(doc, None)
+            latest[doc] = values
+        return latest
+    finally:
+        wb.close()
+
+
+def read_ed_export(path):
+    """Parse an export into the prepared ED frame.
+
+    ``.xlsx``/``.xlsm`` exports are streamed through :func:`latest_versions`
+    and the frame is built straight from its map, which is then dropped. Peak
+    memory is that map plus the frame, both proportional to the number of
+    distinct documents; duplicate versions and unused columns are never held.
+    Anything else falls back to ``pd.read_excel``, which holds the whole sheet.
+    """
+    if os.path.splitext(path)[1].lower() not in ('.xlsx', '.xlsm'):
+        return prepare_ed_frame(pd.read_excel(path))
+    latest = latest_versions(path)
+    df = pd.DataFrame.from_records(iter(latest.values()), columns=ED_COLUMNS, nrows=len(latest))
+    del latest
+    # read_excel infers numbers from text cells ('00' -> 0); keep versions comparable.
+    try:
+        df['Document version'] = pd.to_numeric(df['Document version'])
+    except (TypeError, ValueError):
+        pass
+    return prepare_ed_frame(df)
+
+
+def sidecar_path(fp, cache_dir=CACHE_DIR):
+    base = os.path.splitext(os.path.basename(fp.path))[0]
+    return os.path.join(cache_dir, f'{base}.{fp.sha256[:16]}.v{SIDECAR_VERSION}{SIDECAR_EXT}')
+
+
+def read_sidecar(path):
+    """Read a frame written by :func:`write_sidecar`."""
+    if SIDECAR_EXT == '.parquet':
+        return pd.read_parquet(path)
+    with open(path, 'rb') as fh:
+        return pickle.load(fh)
+
+
+def write_sidecar(df, path):
+    """Write ``df`` to ``path`` in the :data:`SIDECAR_EXT` format, atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    if SIDECAR_EXT == '.parquet':
+        df.to_parquet(tmp, index=False)
+    else:
+        with open(tmp, 'wb') as fh:
+            pickle.dump(df, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    # Atomic so a concurrent session never reads a half-written sidecar.
+    os.replace(tmp, path)
+
+
+def _prune_sidecars(fp, keep, cache_dir=CACHE_DIR):
+    base = os.path.splitext(os.path.basename(fp.path))[0] + '.'
+    for name in os.listdir(cache_dir):
+        full = os.path.join(cache_dir, name)
+        if name.startswith(base) and full != keep and not name.endswith('.tmp'):
+            try:
+                os.remove(full)
+            except OSError:
+                pass
+
+
+def load_ed_frame(path=DEFAULT_EXPORT, cache_dir=CACHE_DIR):
+    """Return the prepared ED frame for ``path``.
+
+    Lookup order: in-process frame for the same fingerprint, then the columnar
+    sidecar, then a full workbook parse (which writes the sidecar). Raises
+    ``FileNotFoundError`` if the export does not exist.
+    """
+    return _load_ed_frame(path, cache_dir)[1]
+
+
+def _load_ed_frame(path, cache_dir):
+    """``(Fingerprint, frame)``; the fingerprint is the revision the frame was read from."""
+    fp = fingerprint(path)
+    cached = _frames.get(fp.path)
+    if cached is not None and cached[0] == fp:
+        note_cache('ed_frame', 'memory')
+        return cached
+
+    with _lock:
+        cached = _frames.get(fp.path)
+        if cached is not None and cached[0] == fp:
+            note_cache('ed_frame', 'memory')
+            return cached
+
+        sidecar = sidecar_path(fp, cache_dir)
+        if os.path.exists(sidecar):
+            note_cache('ed_frame', 'sidecar')
+            df = read_sidecar(sidecar)
+        else:
+            note_cache('ed_frame', 'miss')
+            df = read_ed_export(fp.path)
+            write_sidecar(df, sidecar)
+            _prune_sidecars(fp, sidecar, cache_dir)
+
+        _frames[fp.path] = (fp, df)
+        return fp, df
+
+
+def clear_cache(path=None):
+    """Forget in-process frames, derived values and file hashes for ``path`` (default: every export).
+
+    The next load re-hashes the file and reads the sidecar again; sidecars on
+    disk are kept.
+    """
+    with _lock:
+        if path is None:
+            _frames.clear()
+            _derived.clear()
+            _hashes.clear()
+            return
+        path = os.path.abspath(path)
+        _frames.pop(path, None)
+        _hashes.pop(path, None)
+        for key in [key for key in _derived if key[0] == path]:
+            del _derived[key]
+
+
+def load_derived(name, build, path=DEFAULT_EXPORT, cache_dir=CACHE_DIR):
+    """Return ``build(frame)`` for the prepared ED frame, cached per fingerprint.
+
+    Use this for anything computed from the export (classifications, indexes)
+    so it is built once per export revision and dropped when the export changes.
+    """
+    fp, df = _load_ed_frame(path, cache_dir)
+    key = (fp.path, name)
+    cached = _derived.get(key)
+    if cached is not None and cached[0] == fp:
+        note_cache(name, 'hit')
+        return cached[1]
+    with _lock:
+        cached = _derived.get(key)
+        if cached is not None and cached[0] == fp:
+            note_cache(name, 'hit')
+            return cached[1]
+        note_cache(name, 'miss')
+        value = build(df)
+        _derived[key] = (fp, value)
+        return value
@@ -0,0 +1,149 @@
+"""Sustained-throughput load test for the JSON API (``atix.api``).
+
+``concurrency`` clients each hold one keep-alive HTTP/1.1 connection and
+send requests back to back for ``duration`` seconds, cycling through a mix
+of paths. The default mix is built from the server's own ``/eds/types``,
+``/fleet`` and ``/aircraft`` answers, so it exercises every kind of query
+with real keys. Only the standard library is used, so the client does not
+compete with the server for anything but CPU.
+"""
+import asyncio
+import json
+import random
+import time
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+DEFAULT_URL = 'http://127.0.0.1:8502'
+
+
+class _Connection:
+    """One keep-alive connection that sends ``GET`` requests and reads whole responses."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n'.encode())
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                close = True
+        body = await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return int(status_line.split()[1]), body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _get_json(url, path):
+    parts = urlsplit(url)
+    connection = _Connection(parts.hostname, parts.port or 80)
+    try:
+        status, body = await connection.get(path)
+    finally:
+        connection.close()
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}: {body[:200]!r}")
+    return json.loads(body)
+
+
+async def default_paths(url=DEFAULT_URL, seed=0):
+    """A mix of ED and tracker queries built from the keys the server knows."""
+    rng = random.Random(seed)
+    types = await _get_json(url, '/eds/types')
+    fleet = (await _get_json(url, '/fleet?limit=1000'))['rows']
+    aircraft = [row['aircraft_id'] for row in (await _get_json(url, '/aircraft?limit=1000'))['rows']]
+
+    paths = ['/health', '/eds/types', '/due?next=20']
+    for key in types:
+        for year in rng.sample(range(2005, 2025), 5):
+            paths.append(f'/eds/before?type={key}&date={year}-{rng.randint(1, 12):02d}-01&limit=50')
+    for row in rng.sample(fleet, min(len(fleet), 20)):
+        if row['Type']:
+            paths.append(f"/eds/registration/{quote(row['Registration'])}?limit=50")
+    for aircraft_id in rng.sample(aircraft, min(len(aircraft), 10)):
+        ident = quote(aircraft_id)
+        paths += [f'/aircraft/{ident}/counts', f'/aircraft/{ident}/documents?type=AD&limit=50']
+        documents = (await _get_json(url, f'/aircraft/{ident}/documents?type=AD&limit=5'))['rows']
+        paths += [f"/aircraft/{ident}/documents/{quote(doc['document_id'])}/related" for doc in documents[:2]]
+    rng.shuffle(paths)
+    return paths
+
+
+async def _client(host, port, paths, start, deadline, latencies, statuses):
+    connection = _Connection(host, port)
+    i = start
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                status, _ = await connection.get(path)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                connection.close()
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        connection.close()
+
+
+async def run(url=DEFAULT_URL, concurrency=32, duration=10.0, paths=None, warmup=1.0):
+    """Load ``url`` for ``duration`` seconds; returns throughput and latency figures.
+
+    Requests in the first ``warmup`` seconds are sent but not counted.
+    """
+    parts = urlsplit(url)
+    paths = paths or await default_paths(url)
+    if warmup:
+        await asyncio.gather(*(
+            _client(parts.hostname, parts.port or 80, paths, i, time.perf_counter() + warmup, [], {})
+            for i in range(concurrency)
+        ))
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(parts.hostname, parts.port or 80, paths, i * 7, started + duration, latencies, statuses)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests': len(latencies),
+        'errors': sum(n for status, n in statuses.items() if status != 200),
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(float(ms.mean()), 2),
+            'p50': round(float(np.percentile(ms, 50)), 2),
+            'p95': round(float(np.percentile(ms, 95)), 2),
+            'p99': round(float(np.percentile(ms, 99)), 2),
+            'max': round(float(ms.max()), 2),
+        },
+        'paths': len(paths),
+    }
@@ -0,0 +1,121 @@
+"""Server-side paging for result tables.
+
+A table source answers two questions: how many rows match a filter, and
+which rows fall on one page for a given sort and set of visible columns.
+Pages only ever send that slice to the browser, so the payload stays the same
+size however large the result set is.
+"""
+import numpy as np
+import pandas as pd
+
+from atix.docstore import DOCUMENT_FIELDS
+from atix.profiling import note_cache
+
+
+class FrameSource:
+    """Pages over an in-memory frame, e.g. an :class:`~atix.ed_index.EDIndex` slice.
+
+    ``presorted`` names a column the frame is already sorted by ascending, so
+    sorting on it is free (descending just reads the positions backwards).
+
+    With a ``cache`` (a :class:`~atix.result_cache.ResultCache`), the row order
+    for each filter text and sort column is computed once and stored under
+    ``(cache_key, text, sort column)`` for data ``version``, so every session
+    paging the same result reuses it.
+    """
+
+    def __init__(self, frame, presorted=None, cache=None, cache_key=None, version=None):
+        self.frame = frame
+        self.columns = list(frame.columns)
+        self.presorted = presorted
+        self.cache = cache
+        self.cache_key = cache_key
+        self.version = version
+
+    def _matching(self, text):
+        """Positions of rows with ``text`` in any string column (all rows if no text)."""
+        if not text:
+            return np.arange(len(self.frame))
+        mask = np.zeros(len(self.frame), dtype=bool)
+        for col in self.columns:
+            values = self.frame[col]
+            if pd.api.types.is_string_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+                mask |= values.astype('string').str.contains(text, case=False, regex=False, na=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def _order(self, text, sort_by):
+        positions = self._matching(text)
+        if sort_by is not None:
+            keys = self.frame[sort_by].to_numpy()[positions]
+            positions = positions[pd.Series(keys).argsort(kind='stable').to_numpy()]
+        positions.flags.writeable = False
+        return positions
+
+    def _positions(self, text=None, sort_by=None):
+        """Matching row positions in ascending ``sort_by`` order."""
+        if sort_by == self.presorted:
+            sort_by = None
+        if self.cache is None or (not text and sort_by is None):
+            return self._order(text, sort_by)
+        key = (self.cache_key, text, sort_by)
+        positions = self.cache.get(key, version=self.version)
+        if positions is None:
+            note_cache('row order', 'miss')
+            positions = self.cache.put(key, self._order(text, sort_by), version=self.version)
+        else:
+            note_cache('row order', 'hit')
+        return positions
+
+    def count(self, text=None):
+        return len(self.frame) if not text else len(self._positions(text))
+
+    def fetch(self, offset, limit, columns=None, sort_by=None, descending=False, text=None):
+        positions = self._positions(text, sort_by)
+        if descending:
+            positions = positions[::-1]
+        page = positions[offset:offset + limit]
+        return self.frame.iloc[page][columns or self.columns].reset_index(drop=True)
+
+
+class StoreSource:
+    """Pages over one aircraft's documents of one type with ``LIMIT``/``OFFSET`` queries."""
+
+    SEARCHABLE = ('document_id', 'title', 'status', 'related_document_id')
+
+    def __init__(self, store, aircraft_id, doc_type, columns=None):
+        self.store = store
+        self.aircraft_id = aircraft_id
+        self.doc_type = doc_type
+        self.columns = list(columns or DOCUMENT_FIELDS)
+        unknown = set(self.columns) - set(DOCUMENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown document columns: {sorted(unknown)}")
+
+    def _where(self, text):
+        sql = 'aircraft_id = ? AND doc_type = ?'
+        params = [self.aircraft_id, self.doc_type]
+        if text:
+            # Filter text is literal, as in FrameSource: LIKE wildcards in it are escaped
+            pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            sql += ' AND (' + ' OR '.join(f"{col} LIKE ? ESCAPE '\\'" for col in self.SEARCHABLE) + ')'
+            params += [pattern] * len(self.SEARCHABLE)
+        return sql, params
+
+    def count(self, text=None):
+        where, params = self._where(text)
+        return self.store.query(f'SELECT COUNT(*) AS n FROM documents WHERE {where}', params)[0]['n']
+
+    def fetch_rows(self, offset, limit, columns=None, sort_by=None, descending=False, text=None):
+        """:meth:`fetch` as a list of row dicts, for callers that never need a frame."""
+        columns = [col for col in (columns or self.columns) if col in self.columns]
+        order = sort_by if sort_by in self.columns else 'id'
+        where, params = self._where(text)
+        return self.store.query(
+            f'SELECT {", ".join(columns)} FROM documents WHERE {where} '
+            f'ORDER BY {order} {"DESC" if descending else "ASC"}, id LIMIT ? OFFSET ?',
+            params + [limit, offset],
+        )
+
+    def fetch(self, offset, limit, columns=None, sort_by=None, descending=False, text=None):
+        columns = [col for col in (columns or self.columns) if col in self.columns]
+        return pd.DataFrame(self.fetch_rows(offset, limit, columns, sort_by, descending, text), columns=columns)
@@ -0,0 +1,173 @@
+"""Per-rerun stage timing for the pages.
+
+A page starts a run at the top of the script, wraps each stage in
+``span('name')`` (or decorates a function with ``@timed()``), and finishes the
+run at the bottom. Every span records wall time, the row count it was given,
+the change in process memory, and the cache outcomes reported inside it
+through ``note_cache``. Finished runs are appended to a JSON-lines log and can
+be shown in the sidebar (see ``atix.widgets.diagnostics_panel``).
+
+Runs are per thread, which is per session in Streamlit. When no run is active,
+``span`` yields a shared placeholder and records nothing, so instrumented code
+costs a function call and an attribute lookup.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+ENABLED = os.environ.get('ATIX_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+LOG_FILE = os.environ.get('ATIX_PROFILE_LOG', os.path.join('.atix-cache', 'profile.jsonl'))
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX
+    _PAGE_SIZE = None
+
+
+def _rss():
+    """Resident memory of the process in bytes, or None where /proc is unavailable."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class Span:
+    __slots__ = ('name', 'depth', 'seconds', 'rows', 'memory_delta', 'cache')
+
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.seconds = None
+        self.rows = rows
+        self.memory_delta = None
+        self.cache = {}
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class _NullSpan:
+    """What ``span`` yields when profiling is off; writes to it are dropped."""
+    __slots__ = ()
+    rows = None
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Run:
+    """The spans recorded during one execution of a page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.seconds = None
+        self.spans = []
+        self._stack = []
+        self._clock = time.perf_counter()
+
+    def frame(self):
+        """Spans as a table, stage names indented by nesting depth."""
+        return pd.DataFrame({
+            'Stage': [' ' * s.depth + s.name for s in self.spans],
+            'Seconds': [s.seconds for s in self.spans],
+            'Rows': pd.array([s.rows for s in self.spans], dtype='Int64'),
+            'Memory (MB)': [None if s.memory_delta is None else round(s.memory_delta / 2**20, 2) for s in self.spans],
+            'Cache': [', '.join(f'{k}: {v}' for k, v in s.cache.items()) for s in self.spans],
+        })
+
+    def as_dict(self):
+        return {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'page': self.page,
+            'seconds': self.seconds,
+            'spans': [s.as_dict() for s in self.spans],
+        }
+
+
+def start_run(page, enabled=None):
+    """Begin recording for this thread; returns the :class:`Run`, or None when disabled."""
+    if enabled is None:
+        enabled = ENABLED
+    _local.run = Run(page) if enabled else None
+    return _local.run
+
+
+def current_run():
+    return getattr(_local, 'run', None)
+
+
+def finish_run(run=None, log_file=LOG_FILE):
+    """Stop recording and append the run to ``log_file`` (skipped when it is None)."""
+    run = run or current_run()
+    if run is None:
+        return None
+    run.seconds = round(time.perf_counter() - run._clock, 6)
+    _local.run = None
+    if log_file:
+        line = json.dumps(run.as_dict(), default=str)
+        with _log_lock:
+            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+            with open(log_file, 'a', encoding='utf-8') as fh:
+                fh.write(line + '\n')
+    return run
+
+
+@contextmanager
+def span(name, rows=None):
+    """Time the enclosed block as stage ``name``; set ``.rows`` on the yielded span to count rows."""
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield _NULL
+        return
+    record = Span(name, len(run._stack), rows)
+    run.spans.append(record)
+    run._stack.append(record)
+    memory = _rss()
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = round(time.perf_counter() - started, 6)
+        # /proc can become unreadable between the two reads; leave the delta unknown
+        finished = _rss() if memory is not None else None
+        if finished is not None:
+            record.memory_delta = finished - memory
+        run._stack.pop()
+
+
+def timed(name=None):
+    """Decorator form of :func:`span`, named after the function by default."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'run', None) is None:
+                return fn(*args, **kwargs)
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def note_cache(name, outcome):
+    """Record a cache outcome (``'hit'``, ``'miss'``, ...) on the innermost open span."""
+    run = getattr(_local, 'run', None)
+    if run is not None and run._stack:
+        run._stack[-1].cache[name] = outcome
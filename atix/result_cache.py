@@ -0,0 +1,137 @@
+"""Bounded LRU cache for query results shared across sessions.
+
+Entries are bounded by count and by total size, expire after a TTL, and
+are all dropped when the data version they were computed from (e.g. the
+export fingerprint) changes. Hit, miss and eviction counters make the cache
+visible in diagnostics.
+
+Sizes are measured from the buffers a value holds, so cache values that own
+their data (computed arrays, serialized bytes), not views into a shared frame,
+which would be charged for the whole frame they point into.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+MAX_ENTRIES = int(os.environ.get('ATIX_RESULT_CACHE_ENTRIES', 512))
+MAX_BYTES = int(os.environ.get('ATIX_RESULT_CACHE_MB', 256)) * 2**20
+TTL = float(os.environ.get('ATIX_RESULT_CACHE_TTL', 3600))
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'expirations', 'entries', 'bytes'])
+
+
+def sizeof(value):
+    """Approximate size of a cached value in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Thread-safe LRU mapping of ``key -> value`` with size limits and a TTL.
+
+    ``version`` identifies the data results were computed from; passing a new
+    version to :meth:`get_or_compute` clears every entry from the old one.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl=TTL, sizeof=sizeof, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()  # key -> (value, size, expires)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _purge_expired(self):
+        now = self.clock()
+        for key in [key for key, (_, _, expires) in self._entries.items() if expires <= now]:
+            self._drop(key)
+            self.expirations += 1
+
+    def _set_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self._bytes = 0
+            self.version = version
+
+    def get(self, key, default=None, version=None):
+        with self._lock:
+            if version is not None:
+                self._set_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self.clock():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, version=None):
+        size = self.sizeof(value)
+        with self._lock:
+            if version is not None:
+                self._set_version(version)
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size, self.clock() + self.ttl)
+            self._bytes += size
+            if len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                # Expired entries go first, so they never push out live ones
+                self._purge_expired()
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute, version=None):
+        """Cached value for ``key``, or ``compute()`` stored under it.
+
+        Two sessions missing the same key at once may both compute it; the
+        lock is not held while computing so a slow query never blocks hits.
+        """
+        missing = object()
+        value = self.get(key, missing, version)
+        if value is missing:
+            value = self.put(key, compute(), version)
+        return value
+
+    def invalidate(self, predicate=None):
+        """Drop every entry, or those whose key matches ``predicate``; returns how many."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            self._purge_expired()
+            return CacheStats(self.hits, self.misses, self.evictions, self.expirations, len(self._entries), self._bytes)
@@ -0,0 +1,221 @@
+"""Fleet-wide next-due scheduling for AD tasks.
+
+A task can be limited by a calendar date (``date_due``), by flight hours
+(``due_hours``) or by flight cycles (``due_cycles``). Hour and cycle limits
+are turned into dates by projecting each aircraft's average daily
+utilisation forward, all in one vectorized pass; the earliest of the three
+is the task's due date.
+
+Due dates go into a binary heap. "Next N due" and "due within D days" walk
+the heap best-first with a small frontier heap, so they cost O(k log n) for k
+results instead of a sort of every task. Completing a task or changing an
+aircraft's totals pushes fresh entries, and superseded ones are skipped
+lazily and compacted away once they outnumber live ones.
+"""
+import heapq
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+from itertools import count
+
+import numpy as np
+import pandas as pd
+
+LIMITS = ('calendar', 'hours', 'cycles')
+TASK_COLUMNS = ['aircraft_id', 'document_id', 'title', 'status', 'date_due', 'due_hours', 'due_cycles']
+
+DueItem = namedtuple('DueItem', ['due', 'aircraft_id', 'document_id', 'title', 'status', 'limit'])
+
+
+def utilisation(aircraft, as_of):
+    """Average flight hours and cycles per day since each aircraft entered service.
+
+    ``aircraft`` has aircraft_id, airworthiness_certificate_date, flight_hours
+    and flight_cycles columns; returns a frame indexed by aircraft_id.
+    """
+    start = pd.to_datetime(aircraft['airworthiness_certificate_date'])
+    days = (pd.Timestamp(as_of) - start).dt.days.clip(lower=1).to_numpy(dtype='float64')
+    return pd.DataFrame({
+        'flight_hours': aircraft['flight_hours'].to_numpy(dtype='float64'),
+        'flight_cycles': aircraft['flight_cycles'].to_numpy(dtype='float64'),
+        'hours_per_day': aircraft['flight_hours'].to_numpy(dtype='float64') / days,
+        'cycles_per_day': aircraft['flight_cycles'].to_numpy(dtype='float64') / days,
+    }, index=pd.Index(aircraft['aircraft_id'].astype(str), name='aircraft_id'))
+
+
+def project_due(tasks, rates, as_of):
+    """Add ``due`` (date) and ``limit`` (which limit governs) columns to ``tasks``.
+
+    Hour and cycle limits are converted to days at each aircraft's average
+    rate; overdue limits give dates before ``as_of``. Tasks with no usable
+    limit get NaT and limit ``None``.
+    """
+    as_of = pd.Timestamp(as_of).normalize()
+    rates = rates.reindex(tasks['aircraft_id'].astype(str))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days = np.column_stack([
+            ((pd.to_datetime(tasks['date_due']) - as_of).dt.days).to_numpy(dtype='float64', na_value=np.nan),
+            (tasks['due_hours'].to_numpy(dtype='float64', na_value=np.nan) - rates['flight_hours'].to_numpy())
+            / rates['hours_per_day'].to_numpy(),
+            (tasks['due_cycles'].to_numpy(dtype='float64', na_value=np.nan) - rates['flight_cycles'].to_numpy())
+            / rates['cycles_per_day'].to_numpy(),
+        ])
+    days[~np.isfinite(days)] = np.nan
+    has_limit = ~np.isnan(days).all(axis=1)
+    earliest = np.full(len(days), np.nan)
+    which = np.full(len(days), -1)
+    earliest[has_limit] = np.floor(np.nanmin(days[has_limit], axis=1))
+    which[has_limit] = np.nanargmin(days[has_limit], axis=1)
+    result = tasks.copy()
+    result['due'] = as_of + pd.to_timedelta(earliest, unit='D')
+    result['limit'] = np.array([None, *LIMITS], dtype=object)[which + 1]
+    return result
+
+
+class DueScheduler:
+    """Priority queue of every scheduled task in the fleet, keyed by (aircraft_id, document_id)."""
+
+    def __init__(self, as_of=None):
+        self.as_of = as_of or date.today()
+        self._heap = []   # (due ordinal, seq, key)
+        self._live = {}   # key -> (seq, DueItem)
+        self._seq = count()
+        self._lock = threading.Lock()
+        # Store version the schedule reflects (DocumentStore.version), None if unknown
+        self.store_version = None
+
+    def __len__(self):
+        return len(self._live)
+
+    @classmethod
+    def from_store(cls, store, as_of=None):
+        """Schedule every AD in ``store`` that has a limit and is not N/A."""
+        scheduler = cls(as_of)
+        # Read first: a write landing during the load leaves the schedule marked stale
+        version = store.version()
+        scheduler.load(_tasks(store), _aircraft(store))
+        scheduler.store_version = version
+        return scheduler
+
+    def load(self, tasks, aircraft):
+        """Project and (re)schedule ``tasks``; replaces existing entries with the same keys."""
+        projected = project_due(tasks, utilisation(aircraft, self.as_of), self.as_of)
+        projected = projected[projected['due'].notna()]
+        items = [
+            DueItem(due.date(), aircraft_id, document_id, title, status, limit)
+            for due, aircraft_id, document_id, title, status, limit in zip(
+                projected['due'], projected['aircraft_id'].astype(str), projected['document_id'].astype(str),
+                projected['title'], projected['status'], projected['limit'],
+            )
+        ]
+        with self._lock:
+            fresh = not self._live
+            for item in items:
+                self._set(item, push=not fresh)
+            if fresh:
+                heapq.heapify(self._heap)
+            self._maybe_compact()
+        return len(items)
+
+    # --- updates ---
+
+    def _set(self, item, push=True):
+        key = (item.aircraft_id, item.document_id)
+        seq = next(self._seq)
+        self._live[key] = (seq, item)
+        entry = (item.due.toordinal(), seq, key)
+        if push:
+            heapq.heappush(self._heap, entry)
+        else:
+            self._heap.append(entry)
+
+    def remove(self, aircraft_id, document_id):
+        with self._lock:
+            removed = self._live.pop((aircraft_id, document_id), None) is not None
+            self._maybe_compact()
+            return removed
+
+    def _maybe_compact(self):
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [entry for entry in self._heap if self._live.get(entry[2], (None,))[0] == entry[1]]
+            heapq.heapify(self._heap)
+
+    def complete(self, store, aircraft_id, document_id, completed_on=None):
+        """Record compliance in ``store`` and reschedule just that task.
+
+        If the schedule was current, :attr:`store_version` moves past this
+        write, so shared copies keyed on the store version stay valid.
+        """
+        before, after = store.complete_task(aircraft_id, document_id, completed_on or self.as_of)
+        self.remove(aircraft_id, document_id)
+        tasks = _tasks(store, 'AND aircraft_id = ? AND document_id = ?', (aircraft_id, document_id))
+        loaded = self.load(tasks, _aircraft(store, aircraft_id))
+        with self._lock:
+            if self.store_version == before:
+                self.store_version = after
+        return loaded
+
+    def refresh_aircraft(self, store, aircraft_id):
+        """Re-project one aircraft's tasks after its hours or cycles changed."""
+        with self._lock:
+            for key in [key for key in self._live if key[0] == aircraft_id]:
+                del self._live[key]
+        return self.load(_tasks(store, 'AND aircraft_id = ?', (aircraft_id,)), _aircraft(store, aircraft_id))
+
+    # --- queries ---
+
+    def _iter_due(self):
+        """Live items in due order, walking the heap best-first without modifying it."""
+        heap, live = self._heap, self._live
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            current = live.get(entry[2])
+            if current is not None and current[0] == entry[1]:
+                yield current[1]
+
+    def next_due(self, n=10):
+        """The ``n`` tasks due soonest fleet-wide (overdue first)."""
+        with self._lock:
+            result = []
+            for item in self._iter_due():
+                if len(result) >= n:
+                    break
+                result.append(item)
+            return result
+
+    def due_within(self, days=30, as_of=None):
+        """Every task due on or before ``as_of + days`` (overdue included), soonest first."""
+        horizon = (as_of or self.as_of) + timedelta(days=days)
+        with self._lock:
+            result = []
+            for item in self._iter_due():
+                if item.due > horizon:
+                    break
+                result.append(item)
+            return result
+
+
+def _tasks(store, where='', params=()):
+    rows = store.query(
+        f"SELECT {', '.join(TASK_COLUMNS)} FROM documents "
+        f"WHERE doc_type = 'AD' AND IFNULL(status, '') != 'N/A' {where}",
+        params,
+    )
+    return pd.DataFrame(rows, columns=TASK_COLUMNS)
+
+
+def _aircraft(store, aircraft_id=None):
+    sql = 'SELECT aircraft_id, airworthiness_certificate_date, flight_hours, flight_cycles FROM aircraft'
+    rows = store.query(sql + ' WHERE aircraft_id = ?', (aircraft_id,)) if aircraft_id else store.query(sql)
+    return pd.DataFrame(rows, columns=['aircraft_id', 'airworthiness_certificate_date', 'flight_hours', 'flight_cycles'])
+
+
+def due_frame(items):
+    """Scheduler results as a display frame."""
+    return pd.DataFrame(items, columns=DueItem._fields)
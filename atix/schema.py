@@ -0,0 +1,119 @@
+"""Compact in-memory schema for the ED and tracker document tables.
+
+Column types are chosen per column rather than left to inference:
+
+* low-cardinality text (status, document type, signatory, registration) is
+  ``category``, so each row holds a small integer code;
+* free text (descriptions, titles, ED numbers) is an Arrow-backed string,
+  one contiguous buffer instead of a Python object per cell;
+* tracker document ids are integer codes into one shared categorical, so
+  ``related_document_id`` is an ``int32`` that joins directly to
+  ``document_id``;
+* dates are ``datetime64`` and version numbers the smallest integer type
+  that holds them.
+
+``memory_report`` shows what each table costs, with or without the schema.
+"""
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING = pd.StringDtype('pyarrow')
+except ImportError:  # pragma: no cover - depends on the environment
+    STRING = pd.StringDtype()
+
+ED_SCHEMA = {
+    'Document': STRING,
+    'Document version': 'version',
+    'Description': STRING,
+    'From date': 'datetime64[ns]',
+    'Full Name': 'category',
+}
+
+DOCUMENT_SCHEMA = {
+    'aircraft_id': 'category',
+    'doc_type': 'category',
+    'root_id': 'code',
+    'depth': 'int16',
+    'document_id': 'code',
+    'title': STRING,
+    'status': 'category',
+    'related_document_id': 'code',
+    'date_due': 'datetime64[ns]',
+    'last_completed': 'datetime64[ns]',
+    'due_hours': 'float64',
+    'due_cycles': 'float64',
+    'interval_days': 'float64',
+    'interval_hours': 'float64',
+    'interval_cycles': 'float64',
+}
+
+
+def _version(values):
+    """Smallest integer type for numeric versions; ``category`` for labels like 'Rev 3'."""
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.notna().sum() == values.notna().sum() and (numeric.dropna() % 1 == 0).all():
+        if numeric.isna().any():
+            return numeric.astype('Int32')
+        return pd.to_numeric(numeric, downcast='integer')
+    return values.astype('category')
+
+
+def apply_schema(df, schema):
+    """Return ``df`` with every column named in ``schema`` converted to its compact type.
+
+    ``'code'`` columns share one set of categories, so equal ids get equal
+    codes across columns (``.cat.codes`` gives the integers, -1 for missing).
+    """
+    df = df.copy()
+    coded = [col for col, kind in schema.items() if kind == 'code' and col in df]
+    if coded:
+        ids = pd.concat([df[col] for col in coded], ignore_index=True).dropna().astype(str).unique()
+        categories = pd.Index(sorted(ids), dtype=STRING)
+    for col, kind in schema.items():
+        if col not in df:
+            continue
+        if kind == 'code':
+            df[col] = pd.Categorical(df[col].astype(STRING), categories=categories)
+        elif kind == 'version':
+            df[col] = _version(df[col])
+        elif kind == 'category':
+            df[col] = df[col].astype(STRING).astype('category')
+        elif str(kind).startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col], errors='coerce').astype(kind)
+        else:
+            df[col] = df[col].astype(kind)
+    return df
+
+
+def compact_ed_frame(df):
+    return apply_schema(df, ED_SCHEMA)
+
+
+def compact_document_frame(df):
+    return apply_schema(df, DOCUMENT_SCHEMA)
+
+
+def memory_report(tables):
+    """Deep memory use of each frame in ``{name: frame}``, one row per table."""
+    rows = []
+    for name, df in tables.items():
+        total = int(df.memory_usage(deep=True, index=True).sum())
+        rows.append({
+            'Table': name,
+            'Rows': len(df),
+            'Columns': df.shape[1],
+            'MB': round(total / 2**20, 2),
+            'Bytes/row': round(total / len(df), 1) if len(df) else 0.0,
+        })
+    return pd.DataFrame(rows, columns=['Table', 'Rows', 'Columns', 'MB', 'Bytes/row'])
+
+
+def column_report(df):
+    """Deep memory use and dtype of each column of ``df``."""
+    usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        'Column': usage.index,
+        'Dtype': [str(df[col].dtype) for col in usage.index],
+        'MB': (usage / 2**20).round(3).to_numpy(),
+    })
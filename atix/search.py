@@ -0,0 +1,296 @@
+"""Full-text search over ED descriptions, ADs, SBs and tracker document titles.
+
+An in-memory inverted index (term -> {doc: positions}) supports plain,
+prefix (``wing*``) and quoted phrase (``"upper wing skin"``) queries, all
+terms ANDed and ranked with BM25. The index is pickled to the cache
+directory and kept in step with its sources incrementally: each source
+carries a version token, and when it changes only documents whose text
+changed are removed and re-added. Searches and updates hold the index's
+lock, so a search never sees an update half applied.
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+import pickle
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from atix.loader import CACHE_DIR
+from atix.profiling import note_cache
+
+INDEX_FILE = os.path.join(CACHE_DIR, 'search.pkl')
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+Hit = namedtuple('Hit', ['score', 'kind', 'key', 'title', 'text'])
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _digest(title, text):
+    return hashlib.blake2b(f'{title}\0{text}'.encode('utf-8'), digest_size=8).digest()
+
+
+class SearchIndex:
+    """Positional inverted index with per-source incremental updates."""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term -> {doc: [positions]}
+        self.docs = {}                     # doc -> (kind, key, title, text, digest, length)
+        self.sources = {}                  # source -> (version, {key: doc})
+        self._next_doc = 0
+        self._total_length = 0
+        self._terms = None                 # sorted term list for prefix queries, built lazily
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- maintenance ---
+
+    def _add(self, kind, key, title, text, digest):
+        doc = self._next_doc
+        self._next_doc += 1
+        tokens = tokenize(title) + tokenize(text)
+        positions = defaultdict(list)
+        for pos, term in enumerate(tokens):
+            positions[term].append(pos)
+        for term, where in positions.items():
+            self.postings[term][doc] = where
+        self.docs[doc] = (kind, key, title, text, digest, len(tokens))
+        self._total_length += len(tokens)
+        self._terms = None
+        return doc
+
+    def _remove(self, doc):
+        kind, key, title, text, _, length = self.docs.pop(doc)
+        for term in set(tokenize(title) + tokenize(text)):
+            entries = self.postings.get(term)
+            if entries is not None:
+                entries.pop(doc, None)
+                if not entries:
+                    del self.postings[term]
+        self._total_length -= length
+        self._terms = None
+
+    def sync_source(self, source, version, documents):
+        """Make ``source`` match ``documents`` (``{key: (kind, title, text)}``).
+
+        Unchanged documents are left alone; returns the number added or removed.
+        """
+        with self._lock:
+            return self._sync_source(source, version, documents)
+
+    def _sync_source(self, source, version, documents):
+        _, current = self.sources.get(source, (None, {}))
+        updated = {}
+        changes = 0
+        for key, (kind, title, text) in documents.items():
+            digest = _digest(title, text)
+            doc = current.pop(key, None)
+            if doc is not None and self.docs[doc][4] == digest:
+                updated[key] = doc
+                continue
+            if doc is not None:
+                self._remove(doc)
+                changes += 1
+            updated[key] = self._add(kind, key, title, text, digest)
+            changes += 1
+        for doc in current.values():
+            self._remove(doc)
+            changes += 1
+        self.sources[source] = (version, updated)
+        return changes
+
+    def source_version(self, source):
+        return self.sources.get(source, (None, {}))[0]
+
+    # --- queries ---
+
+    def _prefix_docs(self, prefix):
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        matched = defaultdict(list)
+        i = bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            for doc, where in self.postings[self._terms[i]].items():
+                matched[doc].extend(where)
+            i += 1
+        return matched
+
+    def _phrase_docs(self, terms):
+        lists = [self.postings.get(term) for term in terms]
+        if not all(lists):
+            return {}
+        first, rest = lists[0], lists[1:]
+        matched = {}
+        for doc in min(lists, key=len):
+            if not all(doc in entries for entries in lists):
+                continue
+            following = [set(entries[doc]) for entries in rest]
+            starts = [p for p in first[doc] if all(p + i + 1 in where for i, where in enumerate(following))]
+            if starts:
+                matched[doc] = starts
+        return matched
+
+    def _clauses(self, query):
+        """Each clause is ``{doc: positions}`` for one term, prefix or phrase."""
+        clauses = []
+        for phrase, word in _QUERY.findall(query):
+            if phrase:
+                terms = tokenize(phrase)
+                if len(terms) == 1:
+                    clauses.append(self.postings.get(terms[0], {}))
+                elif terms:
+                    clauses.append(self._phrase_docs(terms))
+            elif word.endswith('*') and tokenize(word):
+                clauses.append(self._prefix_docs(tokenize(word)[0]))
+            else:
+                clauses.extend(self.postings.get(term, {}) for term in tokenize(word))
+        return clauses
+
+    def search(self, query, limit=20, kinds=None):
+        """Top ``limit`` :class:`Hit`s for ``query``, best first."""
+        with self._lock:
+            return self._search(query, limit, kinds)
+
+    def _search(self, query, limit, kinds):
+        clauses = self._clauses(query)
+        if not clauses or not self.docs:
+            return []
+        clauses.sort(key=len)
+        candidates = set(clauses[0])
+        for clause in clauses[1:]:
+            candidates &= clause.keys()
+            if not candidates:
+                return []
+        if kinds is not None:
+            candidates = {doc for doc in candidates if self.docs[doc][0] in kinds}
+
+        n = len(self.docs)
+        avg_length = self._total_length / n or 1
+        idf = [math.log(1 + (n - len(c) + 0.5) / (len(c) + 0.5)) for c in clauses]
+
+        def score(doc):
+            length = self.docs[doc][5]
+            total = 0.0
+            for weight, clause in zip(idf, clauses):
+                tf = len(clause[doc])
+                total += weight * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+            return total
+
+        best = heapq.nlargest(limit, candidates, key=score)
+        return [Hit(round(score(doc), 4), *self.docs[doc][:4]) for doc in best]
+
+    # --- persistence ---
+
+    def save(self, path=INDEX_FILE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with self._lock:
+            state = {name: value for name, value in self.__dict__.items() if name != '_lock'}
+            state.update(postings=dict(self.postings), _terms=None)
+            with open(tmp, 'wb') as fh:
+                pickle.dump((INDEX_VERSION, state), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        """Index saved at ``path``, or an empty one if missing or from another version."""
+        index = cls()
+        try:
+            with open(path, 'rb') as fh:
+                version, state = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return index
+        if version == INDEX_VERSION:
+            index.__dict__.update(state)
+            index.postings = defaultdict(dict, state['postings'])
+        return index
+
+
+# --- sources ---
+
+def ed_documents(df):
+    """ED export rows: searchable by document number and description."""
+    return {
+        doc: ('ED', doc, description or '')
+        for doc, description in zip(df['Document'].astype(str), df['Description'].fillna('').astype(str))
+    }
+
+
+def ad_documents(records):
+    """Parsed ADs (title = AD-id, text = applicability) and the SBs they reference."""
+    documents = {}
+    for ad in records:
+        if ad.get('Error') or not ad.get('AD-id'):
+            continue
+        documents[f"AD:{ad['AD-id']}"] = ('AD', f"AD {ad['AD-id']}", ' '.join(ad.get('Applicability') or []))
+        for sb in ad.get('Service Bulletins') or []:
+            text = ' '.join(filter(None, [sb.get('SB Type'), sb.get('Description'), f"AD {ad['AD-id']}"]))
+            documents[f"SB:{sb['SB-id']}"] = ('SB', sb['SB-id'], text)
+    return documents
+
+
+def tracker_documents(store):
+    """Tracker documents: searchable by document id and title."""
+    return {
+        f"{row['aircraft_id']}:{row['id']}": (row['doc_type'], row['document_id'], f"{row['title']} {row['aircraft_id']}")
+        for row in store.iter_query('SELECT id, aircraft_id, doc_type, document_id, title FROM documents')
+    }
+
+
+def refresh(index, ed_path=None, ad_records=None, store=None, ad_version=None):
+    """Sync every given source whose version changed; returns the number of changes.
+
+    ``ad_version`` identifies ``ad_records`` (``atix.services`` passes the AD
+    directory listing it caches the corpus under); without it the records
+    themselves are hashed, which costs a pass over the whole corpus.
+    """
+    from atix.loader import fingerprint, load_ed_frame
+
+    changes = 0
+    if ed_path is not None and os.path.exists(ed_path):
+        version = fingerprint(ed_path).sha256
+        if index.source_version('ed') != version:
+            changes += index.sync_source('ed', version, ed_documents(load_ed_frame(ed_path)))
+    if ad_records is not None:
+        version = ad_version
+        if version is None:
+            version = hashlib.sha256(json.dumps(ad_records, sort_keys=True, default=str).encode()).hexdigest()
+        if index.source_version('ad') != version:
+            changes += index.sync_source('ad', version, ad_documents(ad_records))
+    if store is not None:
+        version = store.version()
+        if index.source_version('tracker') != version:
+            changes += index.sync_source('tracker', version, tracker_documents(store))
+    return changes
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index(ed_path='export.XLSX', ad_records=None, store=None, path=INDEX_FILE, ad_version=None):
+    """Process-wide index, loaded from disk once and refreshed from the given sources (see :func:`refresh`)."""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = SearchIndex.load(path)
+        changes = refresh(_index, ed_path, ad_records, store, ad_version)
+        note_cache('search', f'{changes} updated' if changes else 'hit')
+        if changes:
+            _index.save(path)
+        return _index
@@ -0,0 +1,100 @@
+"""Synthetic tracker data used to seed the document store.
+
+This is the sample generator the Aircraft Document Tracker used to run on
+every rerun; it now only fills an empty store (see ``atix.docstore``).
+"""
+import random
+from datetime import date, timedelta
+
+# Sample data for aircraft. This would typically come from a database.
+aircraft_data = {
+    'HS-TWA': {
+        'model': 'Airbus A320',
+        'airworthiness_certificate_date': date(2015, 3, 10),
+        'flight_hours': 12500,
+        'flight_cycles': 8900
+    },
+    'HS-TWB': {
+        'model': 'Boeing 737',
+        'airworthiness_certificate_date': date(2018, 7, 25),
+        'flight_hours': 8700,
+        'flight_cycles': 6300
+    },
+    'HS-TWC': {
+        'model': 'Cessna 172',
+        'airworthiness_certificate_date': date(2005, 1, 15),
+        'flight_hours': 2500,
+        'flight_cycles': 20000
+    }
+}
+
+
+# Generate more realistic-looking sample data for documents with a hierarchical structure
+def generate_documents_with_relations(ad_count, sb_count, to_count, ed_count, rng=random):
+    # Create ADs first, as they are the top level
+    ads = [{
+        'document_id': f'AD-{rng.randint(100, 999)}-{rng.randint(10, 99)}',
+        'title': f'Airworthiness Directive for Component {i+1}',
+        'status': rng.choice(['Compliant', 'Not Compliant', 'N/A', 'Pending Review']),
+        'date_due': date.today() + timedelta(days=rng.randint(10, 365)),
+        'last_completed': date.today() - timedelta(days=rng.randint(10, 365))
+    } for i in range(ad_count)]
+
+    sbs = []
+    tos = []
+    eds = []
+
+    for ad in ads:
+        # Each AD can have 1-2 related SBs
+        num_sbs = rng.randint(1, 2)
+        for i in range(num_sbs):
+            sb_id = f'SB-{rng.randint(1000, 9999)}'
+            sbs.append({
+                'document_id': sb_id,
+                'title': f'Service Bulletin related to {ad["document_id"]}',
+                'status': rng.choice(['Compliant', 'Not Compliant', 'N/A', 'Pending Review']),
+                'related_document_id': ad['document_id']
+            })
+
+            # Guarantee at least one TO and one ED for each SB
+            tos.append({
+                'document_id': f'TO-{rng.randint(1000, 9999)}',
+                'title': f'Technical Order for {sb_id}',
+                'status': rng.choice(['Compliant', 'Not Compliant']),
+                'related_document_id': sb_id
+            })
+
+            eds.append({
+                'document_id': f'ED-{rng.randint(1000, 9999)}',
+                'title': f'Engineering Document for {sb_id}',
+                'status': rng.choice(['Compliant', 'Not Compliant']),
+                'related_document_id': sb_id
+            })
+
+    return ads, sbs, tos, eds
+
+
+def add_limits(ads, info, rng=random):
+    """Give some ADs repeat intervals and hour/cycle limits relative to the aircraft's totals."""
+    for ad in ads:
+        kind = rng.choice(['calendar', 'calendar', 'hours', 'cycles'])
+        if kind == 'calendar':
+            ad['interval_days'] = rng.choice([None, 180, 365, 730])
+        elif kind == 'hours':
+            ad['interval_hours'] = rng.choice([600, 1200, 3000])
+            ad['due_hours'] = info['flight_hours'] + rng.randint(20, ad['interval_hours'])
+        else:
+            ad['interval_cycles'] = rng.choice([500, 1000, 2500])
+            ad['due_cycles'] = info['flight_cycles'] + rng.randint(10, ad['interval_cycles'])
+    return ads
+
+
+def seed_store(store, aircraft=None, ad_count=5, seed=None):
+    """Fill ``store`` with ``aircraft`` and generated documents for each of them."""
+    rng = random.Random(seed)
+    aircraft = aircraft_data if aircraft is None else aircraft
+    for ac_id, info in aircraft.items():
+        store.add_aircraft(ac_id, **info)
+        ads, sbs, tos, eds = generate_documents_with_relations(ad_count=ad_count, sb_count=7, to_count=4, ed_count=6, rng=rng)
+        add_limits(ads, info, rng)
+        store.add_documents(ac_id, {'ADs': ads, 'SBs': sbs, 'TOs': tos, 'EDs': eds})
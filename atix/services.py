@@ -0,0 +1,256 @@
+"""Process-wide data services shared by every page and session.
+
+Pages ask this module for the ED frame and indexes, the fleet, the document
+store, the parsed AD corpus and the search index, and only render what they
+get back. Each resource is built once per process and rebuilt only when its
+source changes (the export's fingerprint, the AD directory's listing), so
+switching pages or opening a new session never pays a cold start.
+
+``start_warm_up()`` builds everything on a background thread. Under a
+Streamlit server it starts as soon as this module is first imported, by
+``hello.py`` or by whichever tool page a session opens first, so a deep link
+gets the same head start as the root page. ``ATIX_API_PORT`` also starts the
+JSON API (``atix.api``) at that point.
+"""
+import logging
+import os
+import threading
+
+import pandas as pd
+
+from atix.ad_ingest import AD_DIR, AD_SUFFIXES, ingest_directory
+from atix.loader import DEFAULT_EXPORT, fingerprint, load_derived, load_ed_frame
+from atix.result_cache import ResultCache
+
+log = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_cache = {}  # name -> (version, value)
+_build_locks = {}  # name -> lock held while that resource is built
+_warm_up = None
+
+# Filtered and sorted row orders of ED results, shared by every session (see ed_source)
+ed_results = ResultCache()
+# Diffs between pairs of export snapshots (see export_changes); a few pairs are ever viewed
+change_results = ResultCache(max_entries=8)
+
+
+def _build_lock(name):
+    with _lock:
+        return _build_locks.setdefault(name, threading.RLock())
+
+
+def _cached(name, version, build):
+    cached = _cache.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    # One lock per resource: a slow build never holds up requests for the others
+    with _build_lock(name):
+        cached = _cache.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = build()
+        _cache[name] = (version, value)
+        return value
+
+
+# --- EDs and fleet ---
+
+def ed_frame(path=DEFAULT_EXPORT):
+    """Prepared ED frame; raises ``FileNotFoundError`` if the export is missing."""
+    return load_ed_frame(path)
+
+
+def ed_indexes(path=DEFAULT_EXPORT):
+    """``{type key: EDIndex}`` for the export (see ``atix.classifier.type_indexes``)."""
+    from atix.classifier import type_indexes
+
+    return load_derived('type_indexes', type_indexes, path)
+
+
+def eds_before(type_key, cutoff, path=DEFAULT_EXPORT):
+    """EDs of ``type_key`` issued before ``cutoff``.
+
+    This is a binary search and a zero-copy slice of the type's index, so it
+    is not worth caching; :func:`ed_source` caches the work done on it.
+    """
+    return ed_indexes(path)[type_key].before(cutoff)
+
+
+def ed_source(type_key, cutoff, path=DEFAULT_EXPORT):
+    """Table source over :func:`eds_before` for ``paginated_table``.
+
+    Row orders for each filter and sort are kept in :data:`ed_results` under
+    (export, type, cutoff day, filter, sort column) and cleared when the
+    export's fingerprint changes.
+    """
+    from atix.pagination import FrameSource
+
+    cutoff = pd.Timestamp(cutoff).normalize()
+    return FrameSource(
+        eds_before(type_key, cutoff, path), presorted='From date',
+        cache=ed_results, cache_key=(os.path.abspath(path), type_key, cutoff), version=fingerprint(path).sha256,
+    )
+
+
+def snapshot(path=DEFAULT_EXPORT):
+    """Record the export's current revision as a snapshot (once per revision); returns it."""
+    from atix.snapshots import take_snapshot
+
+    return _cached(('snapshot', path), fingerprint(path).sha256, lambda: take_snapshot(path))
+
+
+def export_changes(old, new):
+    """Changes between two snapshots with an ``Affected Tails`` count per ED.
+
+    Cached per pair of snapshot revisions in the bounded :data:`change_results`.
+    """
+    from atix.snapshots import diff, tail_counts
+
+    return change_results.get_or_compute((old.sha, new.sha), lambda: tail_counts(diff(old, new), fleet()))
+
+
+def fleet():
+    from atix.fleet import fleet_frame
+
+    return _cached('fleet', None, fleet_frame)
+
+
+def registrations():
+    """``{registration: fleet row as a dict}`` for direct lookups."""
+    return _cached('registrations', None, lambda: {row['Registration']: row for row in fleet().to_dict('records')})
+
+
+def fleet_frames(keys=None):
+    """Fleet split per type key (see ``atix.fleet.fleet_by_type``)."""
+    from atix.fleet import fleet_by_type
+
+    keys = None if keys is None else tuple(keys)
+    return _cached(('fleet_frames', keys), None, lambda: fleet_by_type(fleet(), keys))
+
+
+# --- tracker documents ---
+
+def store():
+    from atix.docstore import open_store
+
+    return open_store()
+
+
+def scheduler():
+    """Fleet-wide :class:`~atix.scheduler.DueScheduler` over :func:`store`.
+
+    Rebuilt when the day changes or another writer changes the store (see
+    ``DocumentStore.version``); completions made through it update it in
+    place and keep it.
+    """
+    from datetime import date
+
+    from atix.scheduler import DueScheduler
+
+    documents = store()
+    version = (date.today(), documents.version())
+    cached = _cache.get('scheduler')
+    if cached is not None and (cached[1].as_of, cached[1].store_version) == version:
+        # Caught up with its own completions: re-register it under the new version
+        _cache['scheduler'] = (version, cached[1])
+    return _cached('scheduler', version, lambda: DueScheduler.from_store(documents))
+
+
+# --- ADs ---
+
+def _ad_version(directory):
+    """Names, sizes and mtimes of the AD files; changes whenever one is added, edited or removed."""
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return ()
+    with entries:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.name.lower().endswith(AD_SUFFIXES)
+        ))
+
+
+def _versioned_ad_corpus(directory):
+    version = _ad_version(directory)
+    return version, _cached(('ad_corpus', directory), version, lambda: ingest_directory(directory))
+
+
+def ad_corpus(directory=AD_DIR):
+    """Every parsed AD record in ``directory``, failed parses included (see ``ingest_directory``)."""
+    return _versioned_ad_corpus(directory)[1]
+
+
+def ad_tails(directory=AD_DIR):
+    """``{AD-id: [registrations]}`` for the successfully parsed ADs in ``directory``."""
+    from atix.ad_applicability import affected_tails
+
+    version, records = _versioned_ad_corpus(directory)
+    good = [record for record in records if not record.get('Error')]
+    return _cached(('ad_tails', directory), version, lambda: affected_tails(good))
+
+
+# --- search ---
+
+def search_index():
+    from atix.search import get_index
+
+    # The directory listing versions the AD source, so an unchanged corpus is never re-hashed
+    ad_version, ad_records = _versioned_ad_corpus(AD_DIR)
+    return get_index(DEFAULT_EXPORT, ad_records=ad_records, store=store(), ad_version=ad_version)
+
+
+# --- warm-up ---
+
+def _fleet_frames_by_ed_type():
+    # The same key the ED Checker asks for
+    return fleet_frames(ed_indexes().keys())
+
+
+WARM_UP_STEPS = [
+    ('ED indexes', ed_indexes),
+    ('ED snapshot', snapshot),
+    ('fleet', _fleet_frames_by_ed_type),
+    ('document store', store),
+    ('due scheduler', scheduler),
+    ('AD corpus', ad_tails),
+    ('search index', search_index),
+]
+
+
+def warm_up():
+    """Build every resource now; failures are logged and left for the page to report."""
+    for name, step in WARM_UP_STEPS:
+        try:
+            step()
+        except FileNotFoundError as exc:
+            log.info("Warm-up skipped %s: %s", name, exc)
+        except Exception:
+            log.exception("Warm-up failed for %s", name)
+
+
+def start_warm_up():
+    """Run :func:`warm_up` on a daemon thread, once per process; returns the thread."""
+    global _warm_up
+    with _lock:
+        if _warm_up is None:
+            _warm_up = threading.Thread(target=warm_up, name='atix-warm-up', daemon=True)
+            _warm_up.start()
+        return _warm_up
+
+
+def _in_streamlit():
+    try:
+        from streamlit import runtime
+    except ImportError:  # pragma: no cover - streamlit is a hard dependency of the pages
+        return False
+    return runtime.exists()
+
+
+if _in_streamlit():
+    start_warm_up()
+    if os.environ.get('ATIX_API_PORT'):
+        from atix.api import start_in_background
+        start_in_background()
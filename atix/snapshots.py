@@ -0,0 +1,200 @@
+"""Snapshots of successive ED exports and the differences between them.
+
+Each export revision is stored once as a compact columnar snapshot: the
+prepared ED frame (latest version per document) plus a 64-bit digest of
+every row. Two snapshots are compared with a hash join on the document
+number: documents only in the new one were added, documents only in the old
+one were withdrawn, and documents in both whose version or row digest differs
+were revised. Snapshots are written from the cached frame, so diffing never
+re-reads a workbook, and the join only touches integer keys until the
+changed rows are known.
+"""
+import os
+import re
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from atix.loader import DEFAULT_EXPORT, ED_COLUMNS, SIDECAR_EXT, fingerprint, load_ed_frame, read_sidecar, write_sidecar
+
+SNAPSHOT_DIR = os.environ.get('ATIX_SNAPSHOT_DIR', 'snapshots')
+
+ADDED, REVISED, WITHDRAWN = 'added', 'revised', 'withdrawn'
+CHANGE_COLUMNS = ['Change', 'Document', 'Old version', 'New version', 'Description', 'From date', 'Full Name', 'aircraft_type']
+
+Snapshot = namedtuple('Snapshot', ['path', 'export', 'taken', 'sha'])
+
+_NAME = re.compile(r'^(?P<export>.+)\.(?P<taken>\d{8}T\d{6})\.(?P<sha>[0-9a-f]{16})' + re.escape(SIDECAR_EXT) + '$')
+
+
+def row_digests(df, columns=ED_COLUMNS):
+    """One uint64 per row over ``columns``; equal rows give equal digests."""
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def _key(documents):
+    return pd.util.hash_pandas_object(documents.astype(str), index=False).to_numpy()
+
+
+def list_snapshots(export=DEFAULT_EXPORT, directory=SNAPSHOT_DIR):
+    """Snapshots of ``export`` in ``directory``, oldest first."""
+    base = os.path.splitext(os.path.basename(export))[0]
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        match = _NAME.match(name)
+        if match and match.group('export') == base:
+            found.append(Snapshot(os.path.join(directory, name), base, match.group('taken'), match.group('sha')))
+    # Several revisions can be stored in the same second; file times order those
+    return sorted(found, key=lambda s: (s.taken, os.stat(s.path).st_mtime_ns, s.path))
+
+
+def find_snapshot(snapshots, ref):
+    """The one snapshot in ``snapshots`` named by ``ref``: a file name, a sha prefix or a ``taken`` timestamp.
+
+    Raises ``LookupError`` if none or more than one match; timestamps are only
+    to the second, so two snapshots can share one.
+    """
+    matches = [s for s in snapshots if ref in (s.taken, os.path.basename(s.path)) or s.sha.startswith(ref)]
+    if len(matches) != 1:
+        problem = 'matches no snapshot' if not matches else f"is ambiguous ({', '.join(s.sha for s in matches)})"
+        raise LookupError(f"'{ref}' {problem}")
+    return matches[0]
+
+
+def take_snapshot(export=DEFAULT_EXPORT, directory=SNAPSHOT_DIR):
+    """Store the current revision of ``export`` unless it is already stored; returns its :class:`Snapshot`."""
+    fp = fingerprint(export)
+    sha = fp.sha256[:16]
+    for snapshot in list_snapshots(export, directory):
+        if snapshot.sha == sha:
+            return snapshot
+    df = load_ed_frame(export).copy()
+    df['digest'] = row_digests(df)
+    base = os.path.splitext(os.path.basename(export))[0]
+    taken = time.strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(directory, f'{base}.{taken}.{sha}{SIDECAR_EXT}')
+    write_sidecar(df, path)
+    return Snapshot(path, base, taken, sha)
+
+
+def read_snapshot(snapshot):
+    return read_sidecar(snapshot.path if isinstance(snapshot, Snapshot) else snapshot)
+
+
+def diff_frames(old, new):
+    """Added, revised and withdrawn EDs between two snapshot frames, as ``CHANGE_COLUMNS``.
+
+    Frames need the ED columns; a ``digest`` column is computed if missing.
+    """
+    old_digest = old['digest'].to_numpy() if 'digest' in old else row_digests(old)
+    new_digest = new['digest'].to_numpy() if 'digest' in new else row_digests(new)
+    joined = pd.merge(
+        pd.DataFrame({'key': _key(old['Document']), 'old_row': np.arange(len(old)), 'old_digest': old_digest}),
+        pd.DataFrame({'key': _key(new['Document']), 'new_row': np.arange(len(new)), 'new_digest': new_digest}),
+        on='key', how='outer',
+    )
+    in_old = joined['old_row'].notna().to_numpy()
+    in_new = joined['new_row'].notna().to_numpy()
+    revised = in_old & in_new & (joined['old_digest'].to_numpy() != joined['new_digest'].to_numpy())
+
+    parts = []
+    for change, mask, side in ((ADDED, in_new & ~in_old, 'new'), (REVISED, revised, 'new'), (WITHDRAWN, in_old & ~in_new, 'old')):
+        if not mask.any():
+            continue
+        source = new if side == 'new' else old
+        rows = source.iloc[joined.loc[mask, f'{side}_row'].astype('int64').to_numpy()].reset_index(drop=True)
+        part = rows[['Document', 'Description', 'From date', 'Full Name']].copy()
+        part.insert(0, 'Change', change)
+        old_rows = joined.loc[mask, 'old_row']
+        new_rows = joined.loc[mask, 'new_row']
+        part['Old version'] = _versions(old, old_rows)
+        part['New version'] = _versions(new, new_rows)
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+
+    from atix.classifier import DEFAULT_CLASSIFIER
+
+    changes = pd.concat(parts, ignore_index=True)
+    changes['Change'] = pd.Categorical(changes['Change'], categories=[ADDED, REVISED, WITHDRAWN])
+    changes['aircraft_type'] = DEFAULT_CLASSIFIER.classify(changes['Description'])
+    return changes[CHANGE_COLUMNS]
+
+
+def _versions(frame, rows):
+    """``Document version`` at ``rows`` (NaN positions give missing values) as display strings."""
+    values = pd.Series(pd.NA, index=range(len(rows)), dtype='string')
+    present = rows.notna().to_numpy()
+    if present.any():
+        picked = frame['Document version'].iloc[rows[present].astype('int64').to_numpy()]
+        values[present] = picked.astype('string').to_numpy()
+    return values.to_numpy()
+
+
+def diff(old, new):
+    """Diff two :class:`Snapshot` objects (or snapshot paths)."""
+    return diff_frames(read_snapshot(old), read_snapshot(new))
+
+
+def summary(changes):
+    """Number of changes of each kind."""
+    return changes['Change'].value_counts().reindex([ADDED, REVISED, WITHDRAWN], fill_value=0).to_dict()
+
+
+def _tail_pairs(changes, fleet):
+    """Yield (change row positions, fleet row positions) per type, one pair per affected tail.
+
+    An ED applies to a registration of its type that entered service after
+    the ED was issued, the ED Checker's own rule, so each change owns a
+    suffix of that type's aircraft sorted by in-service date.
+    """
+    from atix.classifier import DEFAULT_CLASSIFIER
+
+    dates = pd.to_datetime(changes['From date']).to_numpy()  # an empty diff's column is untyped
+    for key, mask in DEFAULT_CLASSIFIER.masks(changes['aircraft_type']).items():
+        aircraft = np.flatnonzero((fleet['Type'] == key).to_numpy() & fleet['In Service Date'].notna().to_numpy())
+        rows = np.flatnonzero(mask & ~np.isnat(dates))
+        if not len(aircraft) or not len(rows):
+            continue
+        aircraft = aircraft[np.argsort(fleet['In Service Date'].to_numpy()[aircraft], kind='stable')]
+        in_service = fleet['In Service Date'].to_numpy()[aircraft]
+        start = np.searchsorted(in_service, dates[rows], side='right')
+        counts = len(aircraft) - start
+        owner = np.repeat(rows, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        yield owner, aircraft[np.repeat(start, counts) + offset]
+
+
+def affected_tails(changes, fleet=None):
+    """Registrations each change applies to, as a long (Change, Document, Registration) frame."""
+    from atix.fleet import fleet_frame
+
+    fleet = fleet_frame() if fleet is None else fleet
+    parts = [
+        pd.DataFrame({
+            'Change': changes['Change'].to_numpy()[owner],
+            'Document': changes['Document'].to_numpy()[owner],
+            'Registration': fleet['Registration'].to_numpy()[aircraft],
+        })
+        for owner, aircraft in _tail_pairs(changes, fleet)
+    ]
+    if not parts:
+        return pd.DataFrame(columns=['Change', 'Document', 'Registration'])
+    return pd.concat(parts, ignore_index=True)
+
+
+def tail_counts(changes, fleet=None):
+    """``changes`` with an ``Affected Tails`` count per row."""
+    from atix.fleet import fleet_frame
+
+    fleet = fleet_frame() if fleet is None else fleet
+    counts = np.zeros(len(changes), dtype='int64')
+    for owner, _ in _tail_pairs(changes, fleet):
+        counts += np.bincount(owner, minlength=len(changes))
+    result = changes.copy()
+    result['Affected Tails'] = counts
+    return result
@@ -0,0 +1,82 @@
+"""Streamlit components shared by the pages."""
+import pandas as pd
+import streamlit as st
+
+from atix import profiling
+from atix.profiling import span
+
+
+def search_box(limit=20):
+    """Sidebar search over EDs, ADs, SBs and tracker documents (see ``atix.search``)."""
+    query = st.sidebar.text_input("Search documents", placeholder='e.g. wing*, "landing gear"')
+    if not query:
+        return
+
+    from atix.services import search_index
+
+    with span('search') as stage:
+        index = search_index()
+        hits = index.search(query, limit=limit)
+        stage.rows = len(hits)
+    if not hits:
+        st.sidebar.info("No matching documents.")
+        return
+    st.sidebar.dataframe(
+        pd.DataFrame(hits)[['kind', 'title', 'text']].rename(columns={'kind': 'Type', 'title': 'Document', 'text': 'Text'}),
+        hide_index=True,
+    )
+
+
+def paginated_table(source, key, page_size=50, sort_by=None, controls=True):
+    """Render one page of ``source`` (see ``atix.pagination``) with paging controls.
+
+    Only the rows of the current page and the columns the user keeps visible
+    are fetched and sent to the browser. With ``controls=False`` only the page
+    selector is shown, and only when there is more than one page.
+    """
+    columns = source.columns
+    text, descending, visible = None, False, columns
+    if controls:
+        col_filter, col_sort, col_order = st.columns([3, 2, 1])
+        text = col_filter.text_input("Filter", key=f"{key}_filter")
+        sort_index = columns.index(sort_by) if sort_by in columns else 0
+        sort_by = col_sort.selectbox("Sort by", columns, index=sort_index, key=f"{key}_sort")
+        descending = col_order.toggle("Descending", key=f"{key}_desc")
+        visible = st.multiselect("Columns", columns, default=columns, key=f"{key}_columns") or columns
+
+    with span(f'{key}: count') as stage:
+        total = stage.rows = source.count(text)
+    pages = max(1, -(-total // page_size))
+    page = 1
+    if controls or pages > 1:
+        page = int(st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_page"))
+    offset = (page - 1) * page_size
+
+    with span(f'{key}: fetch') as stage:
+        page_df = source.fetch(offset, page_size, visible, sort_by, descending, text)
+        stage.rows = len(page_df)
+    with span(f'{key}: render', rows=len(page_df)):
+        st.dataframe(page_df, width='stretch', hide_index=True)
+    if total:
+        st.caption(f"Rows {offset + 1:,}-{min(offset + page_size, total):,} of {total:,}")
+    return total
+
+
+def diagnostics_toggle(page):
+    """Sidebar switch for stage timing; starts a :mod:`atix.profiling` run when on.
+
+    The switch defaults to on when ``ATIX_PROFILE`` is set. Call it near the top
+    of a page and pass the result to :func:`diagnostics_panel` at the bottom.
+    """
+    enabled = st.sidebar.toggle("Diagnostics", value=profiling.ENABLED, key="atix_diagnostics")
+    return profiling.start_run(page, enabled)
+
+
+def diagnostics_panel(run):
+    """Finish ``run`` (logging it) and show its stages in the sidebar."""
+    if run is None:
+        return
+    profiling.finish_run(run)
+    with st.sidebar.expander(f"Diagnostics: {run.seconds:.3f}s", expanded=True):
+        st.dataframe(run.frame(), hide_index=True, width='stretch')
+        st.caption(f"Logged to `{profiling.LOG_FILE}`. Memory is the whole process and includes other sessions.")
@@ -1,5 +1,9 @@
 import streamlit as st
 
+# Importing the services starts the background warm-up (once per process) and,
+# with ATIX_API_PORT set, the JSON API; every tool page does the same.
+from atix import services  # noqa: F401
+
 st.set_page_config(
     page_title="ATIX Labs",
     page_icon="👋",
@@ -1,10 +1,20 @@
 import streamlit as st
 import pandas as pd
 
+from atix import services
+from atix.ad_applicability import affected_tails
+from atix.ad_ingest import AD_DIR, EASA
+from atix.profiling import span
+from atix.widgets import diagnostics_panel, diagnostics_toggle, search_box
+
+# Optional per-stage timings in the sidebar (see atix.profiling)
+profile_run = diagnostics_toggle("ADs center")
+
 st.title("Airworthiness Directive (AD) Data")
+search_box()
 
-# Structured AD data (extracted from PDF)
-ad_data = {
+# Structured AD data (extracted from PDF), shown when no AD documents have been ingested yet
+sample_ad_data = {
     "AD-id": "2025-06-02",
     "Agency": "Federal Aviation Administration (FAA), DOT",
     "Effective date": "April 23, 2025",
@@ -23,10 +33,49 @@ ad_data = {
     ]
 }
 
+# Parse every AD document in the AD directory. Parses run in a process pool, are
+# cached by content hash, and the corpus is shared by every session until a file
+# changes (see atix.services).
+with span('ingest ADs') as stage:
+    ingested = services.ad_corpus()
+    stage.rows = len(ingested)
+failed = [record for record in ingested if record.get('Error')]
+corpus = [record for record in ingested if not record.get('Error')]
+if not corpus:
+    st.info(f"No AD documents found in `{AD_DIR}/`. Showing a sample AD.")
+    corpus = [sample_ad_data]
+
+# Affected registrations for every AD, matched against the fleet in one batch
+# (for the ingested corpus, once per change to the AD directory)
+with span('affected tails') as stage:
+    tails_by_ad = affected_tails(corpus) if corpus[0] is sample_ad_data else services.ad_tails()
+    stage.rows = sum(map(len, tails_by_ad.values()))
+
+st.markdown("### AD Corpus")
+with span('corpus table', rows=len(corpus)):
+    st.dataframe(
+        pd.DataFrame([{
+            'AD-id': ad['AD-id'],
+            'Agency': ad['Agency'],
+            'Effective date': ad['Effective date'],
+            'ATA': ad['ATA'],
+            'Service Bulletins': len(ad['Service Bulletins']),
+            'Superseding': ad['Superseding'],
+            'Affected Tails': len(tails_by_ad.get(ad['AD-id'], [])),
+        } for ad in corpus]),
+        width='stretch',
+        hide_index=True
+    )
+
+corpus_by_id = {ad['AD-id'] or ad.get('Source'): ad for ad in corpus}
+selected_ad = st.selectbox("Select an AD", list(corpus_by_id.keys()))
+ad_data = corpus_by_id[selected_ad]
+
 # Link to download the original AD PDF
+ad_link_id = ad_data['AD-id'] if ad_data['Agency'] == EASA else f"US-{ad_data['AD-id']}"
 st.markdown(
-    """
-    **[Download the original AD PDF here](https://ad.easa.europa.eu/ad/US-2025-06-02)**
+    f"""
+    **[Download the original AD PDF here](https://ad.easa.europa.eu/ad/{ad_link_id})**
     """,
     unsafe_allow_html=True
 )
@@ -44,9 +93,26 @@ st.markdown("### Applicability")
 for airplane_model in ad_data["Applicability"]:
     st.markdown(f"- {airplane_model}")
 
+st.markdown("### Affected Tails")
+affected = tails_by_ad.get(ad_data['AD-id'], [])
+if affected:
+    st.markdown(", ".join(f"`{registration}`" for registration in affected))
+else:
+    st.info("No aircraft in the fleet match this AD's applicability.")
+
 st.markdown("### Service Bulletins")
 if ad_data.get("Service Bulletins"):
     with st.expander("Show Service Bulletins"):
         for sb in ad_data["Service Bulletins"]:
             st.markdown(f"**SB-id:** {sb['SB-id']}")
-            st.markdown(f"**Description:** {sb['Description']}")
\ No newline at end of file
+            if sb.get('Dated'):
+                st.markdown(f"**Dated:** {sb['Dated']}")
+            if sb.get('Description'):
+                st.markdown(f"**Description:** {sb['Description']}")
+
+if failed:
+    with st.expander(f"{len(failed)} AD document(s) could not be parsed"):
+        for record in failed:
+            st.markdown(f"- `{record['Source']}`: {record['Error']}")
+
+diagnostics_panel(profile_run)
\ No newline at end of file
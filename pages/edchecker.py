@@ -1,14 +1,36 @@
 import streamlit as st
 import pandas as pd
-import io
+
+from atix import services
+from atix.applicability import applicability_counts, write_applicability
+from atix.export import lazy
+from atix.classifier import type_indexes
+from atix.loader import prepare_ed_frame
+from atix.pagination import FrameSource
+from atix.profiling import span
+from atix.widgets import diagnostics_panel, diagnostics_toggle, paginated_table, search_box
+
+st.set_page_config(
+    page_title="ED Checker",
+    layout="wide",
+)
+# Optional per-stage timings in the sidebar (see atix.profiling)
+profile_run = diagnostics_toggle("ED Checker")
 
 # Data setup
 # Note: The 'export.xlsx' file is assumed to exist in the same directory.
-# If not, you'll need to create a dummy file for the code to run.
-# For demonstration purposes, we'll create a dummy DataFrame to mimic the excel file.
+# The workbook is parsed once per process (usually by the warm-up thread that
+# starts when atix.services is first imported) and shared by every session (see atix.services).
+# If it is missing, we'll create a dummy DataFrame to mimic the excel file.
 try:
     file_path = 'export.XLSX'
-    df = pd.read_excel(file_path)
+    with span('load export') as stage:
+        df = services.ed_frame(file_path)
+        stage.rows = len(df)
+    # Type classification and date indexes are cached with the parsed export.
+    with span('type indexes'):
+        ed_indexes = services.ed_indexes(file_path)
+    using_export = True
 except FileNotFoundError:
     st.warning("`export.xlsx` not found. Using dummy data for demonstration.")
     data = {
@@ -28,100 +50,22 @@ except FileNotFoundError:
             '2016-08-01', '2012-08-01', '2014-07-01', '2023-01-01', '2024-02-15', '2024-10-10'
         ] * 5 + ['2023-01-01', '2023-02-01', '2023-03-01', '2023-04-01', '2023-05-01'])
     }
-    df = pd.DataFrame(data)
-
-# Keep only relevant columns and deduplicate
-df = df[['Document', 'Document version', 'Description', 'From date', 'Full Name' ]]
-df = df.drop_duplicates(subset=['Document'], keep='last')
-df['From date'] = pd.to_datetime(df['From date'], errors='coerce')
-
-# Filter main ED dataframe by aircraft type
-df_a350 = df[df['Description'].str.contains('A350|350', case=False, na=False) & ~df['Description'].str.contains('HS', case=False, na=False)]
-df_a330 = df[df['Description'].str.contains('A330|330', case=False, na=False) & ~df['Description'].str.contains('HS', case=False, na=False)]
-df_a320 = df[df['Description'].str.contains('A320|320', case=False, na=False) & ~df['Description'].str.contains('HS|ITO|P320 ', case=False, na=False)]
-df_b777 = df[df['Description'].str.contains('B777|777', case=False, na=False) & ~df['Description'].str.contains('HS', case=False, na=False)]
-df_b787 = df[df['Description'].str.contains('B787|787', case=False, na=False) & ~df['Description'].str.contains('HS', case=False, na=False)]
-
-# Fleet data and dataframe creation
-fleet_data = [
-    ("HS-THY", "Airbus A350-900", "Mar 2024"), ("HS-THZ", "Airbus A350-900", "May 2024"),
-    ("HS-TJR", "Boeing 777-200", "Nov 2006"), ("HS-TJV", "Boeing 777-200", "Sep 2007"),
-    ("HS-TJW", "Boeing 777-200", "Oct 2007"), ("HS-TKK", "Boeing 777-300ER", "Aug 2012"),
-    ("HS-TKL", "Boeing 777-300ER", "Oct 2012"), ("HS-TKM", "Boeing 777-300ER", "Mar 2013"),
-    ("HS-TKN", "Boeing 777-300ER", "Apr 2013"), ("HS-TKO", "Boeing 777-300ER", "Jun 2013"),
-    ("HS-TKP", "Boeing 777-300ER", "Jul 2013"), ("HS-TKQ", "Boeing 777-300ER", "Aug 2013"),
-    ("HS-TKR", "Boeing 777-300ER", "Oct 2013"), ("HS-TKU", "Boeing 777-300ER", "Jan 2014"),
-    ("HS-TKV", "Boeing 777-300ER", "Jul 2014"), ("HS-TKW", "Boeing 777-300ER", "Aug 2014"),
-    ("HS-TKX", "Boeing 777-300ER", "Jan 2015"), ("HS-TKY", "Boeing 777-300ER", "Jun 2015"),
-    ("HS-TKZ", "Boeing 777-300ER", "Sep 2015"), ("HS-TTA", "Boeing 777-300ER", "Apr 2022"),
-    ("HS-TTB", "Boeing 777-300ER", "Apr 2022"), ("HS-TTC", "Boeing 777-300ER", "Apr 2022"),
-    ("HS-TQA", "Boeing 787-8 Dreamliner", "Jul 2014"), ("HS-TQB", "Boeing 787-8 Dreamliner", "Sep 2014"),
-    ("HS-TQC", "Boeing 787-8 Dreamliner", "Oct 2014"), ("HS-TQD", "Boeing 787-8 Dreamliner", "Dec 2014"),
-    ("HS-TQE", "Boeing 787-8 Dreamliner", "Apr 2015"), ("HS-TQF", "Boeing 787-8 Dreamliner", "Aug 2015"),
-    ("HS-TWA", "Boeing 787-9 Dreamliner", "Sep 2017"), ("HS-TWB", "Boeing 787-9 Dreamliner", "Oct 2017"),
-    ("HS-TWC", "Boeing 787-9 Dreamliner", "May 2024"),
-    ("HS-TXA", "Airbus A320-200", "Oct 2023"), ("HS-TXB", "Airbus A320-200", "Dec 2023"),
-    ("HS-TXC", "Airbus A320-200", "Nov 2023"), ("HS-TXD", "Airbus A320-200", "Dec 2023"),
-    ("HS-TXE", "Airbus A320-200", "Jul 2023"), ("HS-TXF", "Airbus A320-200", "Sep 2023"),
-    ("HS-TXG", "Airbus A320-200", "Oct 2023"), ("HS-TXH", "Airbus A320-200", "Dec 2023"),
-    ("HS-TXJ", "Airbus A320-200", "Jan 2024"), ("HS-TXK", "Airbus A320-200", "Sep 2023"),
-    ("HS-TXL", "Airbus A320-200", "Nov 2023"), ("HS-TXM", "Airbus A320-200", "Jan 2024"),
-    ("HS-TXN", "Airbus A320-200", "Dec 2023"), ("HS-TXO", "Airbus A320-200", "Jan 2024"),
-    ("HS-TXP", "Airbus A320-200", "Jan 2024"), ("HS-TXQ", "Airbus A320-200", "May 2023"),
-    ("HS-TXR", "Airbus A320-200", "May 2023"), ("HS-TXS", "Airbus A320-200", "Jul 2023"),
-    ("HS-TXT", "Airbus A320-200", "Nov 2023"), ("HS-TXU", "Airbus A320-200", "Dec 2023"),
-    ("HS-TEN", "Airbus A330-300", "Apr 2009"), ("HS-TEO", "Airbus A330-300", "May 2009"),
-    ("HS-TEP", "Airbus A330-300", "Jul 2009"), ("HS-TEV", "Airbus A330-300", "Oct 2024"),
-    ("HS-TEW", "Airbus A330-300", "Oct 2024"), ("HS-TEX", "Airbus A330-300", "Aug 2025"),
-    ("HS-THB", "Airbus A350-900", "Aug 2016"), ("HS-THC", "Airbus A350-900", "Oct 2016"),
-    ("HS-THD", "Airbus A350-900", "Apr 2017"), ("HS-THE", "Airbus A350-900", "Jun 2017"),
-    ("HS-THF", "Airbus A350-900", "Jul 2017"), ("HS-THG", "Airbus A350-900", "Aug 2017"),
-    ("HS-THH", "Airbus A350-900", "Sep 2017"), ("HS-THJ", "Airbus A350-900", "Jan 2018"),
-    ("HS-THK", "Airbus A350-900", "Jan 2018"), ("HS-THL", "Airbus A350-900", "Feb 2018"),
-    ("HS-THM", "Airbus A350-900", "Mar 2018"), ("HS-THN", "Airbus A350-900", "May 2018"),
-    ("HS-THO", "Airbus A350-900", "May 2023"), ("HS-THP", "Airbus A350-900", "Jun 2023"),
-    ("HS-THQ", "Airbus A350-900", "Sep 2023"), ("HS-THR", "Airbus A350-900", "Oct 2023"),
-    ("HS-THS", "Airbus A350-900", "Feb 2024"), ("HS-THT", "Airbus A350-900", "Apr 2024"),
-    ("HS-THU", "Airbus A350-900", "Apr 2024"), ("HS-THV", "Airbus A350-900", "Nov 2023"),
-    ("HS-THX", "Airbus A350-900", "Mar 2024"),
-]
-
-df_fleet_a350 = pd.DataFrame([f for f in fleet_data if 'A350' in f[1]], columns=['Registration', 'Aircraft Type', 'In Service Date'])
-df_fleet_a330 = pd.DataFrame([f for f in fleet_data if 'A330' in f[1]], columns=['Registration', 'Aircraft Type', 'In Service Date'])
-df_fleet_a320 = pd.DataFrame([f for f in fleet_data if 'A320' in f[1]], columns=['Registration', 'Aircraft Type', 'In Service Date'])
-df_fleet_b777 = pd.DataFrame([f for f in fleet_data if '777' in f[1]], columns=['Registration', 'Aircraft Type', 'In Service Date'])
-df_fleet_b787 = pd.DataFrame([f for f in fleet_data if '787' in f[1]], columns=['Registration', 'Aircraft Type', 'In Service Date'])
-
-# Convert 'In Service Date' to datetime
-df_fleet_a350['In Service Date'] = pd.to_datetime(df_fleet_a350['In Service Date'], errors='coerce')
-df_fleet_a330['In Service Date'] = pd.to_datetime(df_fleet_a330['In Service Date'], errors='coerce')
-df_fleet_a320['In Service Date'] = pd.to_datetime(df_fleet_a320['In Service Date'], errors='coerce')
-df_fleet_b777['In Service Date'] = pd.to_datetime(df_fleet_b777['In Service Date'], errors='coerce')
-df_fleet_b787['In Service Date'] = pd.to_datetime(df_fleet_b787['In Service Date'], errors='coerce')
-
-# Filter EDs based on in-service date for each aircraft
-results_a350 = {row['Registration']: df_a350[df_a350['From date'] < row['In Service Date']] for _, row in df_fleet_a350.iterrows()}
-results_a330 = {row['Registration']: df_a330[df_a330['From date'] < row['In Service Date']] for _, row in df_fleet_a330.iterrows()}
-results_a320 = {row['Registration']: df_a320[df_a320['From date'] < row['In Service Date']] for _, row in df_fleet_a320.iterrows()}
-results_b777 = {row['Registration']: df_b777[df_b777['From date'] < row['In Service Date']] for _, row in df_fleet_b777.iterrows()}
-results_b787 = {row['Registration']: df_b787[df_b787['From date'] < row['In Service Date']] for _, row in df_fleet_b787.iterrows()}
-
-# Combine all results and fleet data for easy lookup
-all_results = {
-    'A350': {'results': results_a350, 'fleet_df': df_fleet_a350},
-    'A330': {'results': results_a330, 'fleet_df': df_fleet_a330},
-    'A320': {'results': results_a320, 'fleet_df': df_fleet_a320},
-    'B777': {'results': results_b777, 'fleet_df': df_fleet_b777},
-    'B787': {'results': results_b787, 'fleet_df': df_fleet_b787},
-}
+    # Keep only relevant columns and deduplicate
+    df = prepare_ed_frame(pd.DataFrame(data))
+    ed_indexes = type_indexes(df)
+    using_export = False
 
-# --- Streamlit App ---
-st.set_page_config(
-    page_title="ED Checker",
-    layout="wide",
-)
+# ed_indexes holds one date-sorted EDIndex per aircraft type. Types come from
+# the rules table in atix.classifier (one pass over the descriptions), and
+# "EDs before in-service date" is a binary search returning a slice.
+
+# Fleet data per aircraft type (see atix.fleet)
+with span('fleet frames'):
+    fleet_frames = services.fleet_frames(ed_indexes.keys())
 
+# --- Streamlit App ---
 st.sidebar.markdown("# Pending EDs")
+search_box()
 
 st.title("Aircraft Engineering Directives Checker")
 st.write("Simple data manipulation can reduce working hours by half. By using this tool, you can quickly identify relevant Engineering Documents (EDs) for your aircraft fleet based on their in-service dates.")
@@ -130,7 +74,7 @@ st.write("Making sure your aircraft are compliant with the latest EDs for safety
 # Use a radio button to switch between modes
 mode = st.radio(
     "Choose Mode",
-    ("Check Existing Aircraft", "Check for a New Aircraft")
+    ("Check Existing Aircraft", "Check for a New Aircraft", "Fleet-wide Export", "Changes Between Exports")
 )
 
 # ----------------- Mode 1: Existing Aircraft -----------------
@@ -138,20 +82,19 @@ if mode == "Check Existing Aircraft":
     st.write("Select an aircraft type and registration from the fleet to see all Engineering Directives (EDs) issued before its in-service date.")
 
     # Create dropdown for aircraft type
-    aircraft_types = list(all_results.keys())
+    aircraft_types = list(ed_indexes.keys())
     selected_ac_type = st.selectbox(
         "Select Aircraft Type",
         aircraft_types
     )
 
     if selected_ac_type:
-        # Get the dictionary for the selected type
-        current_data = all_results[selected_ac_type]
-        current_results = current_data['results']
-        current_fleet_df = current_data['fleet_df']
+        # Get the index and fleet for the selected type
+        current_index = ed_indexes[selected_ac_type]
+        current_fleet_df = fleet_frames[selected_ac_type]
 
         # Get the list of registrations for the selected type
-        registrations = list(current_results.keys())
+        registrations = current_fleet_df['Registration'].tolist()
         
         # Create dropdown for aircraft registration
         selected_ac_reg = st.selectbox(
@@ -160,43 +103,43 @@ if mode == "Check Existing Aircraft":
         )
 
         if selected_ac_reg:
-            # Get the DataFrame for the selected registration
-            filtered_eds_df = current_results[selected_ac_reg]
-
             # Get the in-service date for the selected aircraft
             in_service_date = current_fleet_df[current_fleet_df['Registration'] == selected_ac_reg]['In Service Date'].iloc[0]
 
+            # EDs issued before the in-service date. For the export, filtered and
+            # sorted row orders are cached per (type, date, export revision) and
+            # shared by every planner's session.
+            with span('in-service filter') as stage:
+                if using_export:
+                    existing_source = services.ed_source(selected_ac_type, in_service_date, file_path)
+                else:
+                    existing_source = FrameSource(current_index.before(in_service_date), presorted='From date')
+                filtered_eds_df = existing_source.frame
+                stage.rows = len(filtered_eds_df)
+
             st.subheader(f"Engineering Directives for {selected_ac_reg}")
             st.info(f"Showing EDs issued **before** the in-service date of **{in_service_date.strftime('%Y-%m-%d')}**.")
 
             if not filtered_eds_df.empty:
-                st.dataframe(filtered_eds_df.reset_index(drop=True), hide_index=True)
+                # Only the visible page is sent to the browser; the index is already sorted by date
+                paginated_table(existing_source, key="existing_eds", sort_by='From date')
             else:
                 st.success(f"No Engineering Documents found for {selected_ac_reg} that were issued before its in-service date.")
 
 # ----------------- Mode 2: New Aircraft -----------------
-else: # mode == "Check for a New Aircraft"
+elif mode == "Check for a New Aircraft":
     st.write("Select an aircraft type and specify its in-service date to find relevant EDs.")
     
     # Select aircraft type
-    aircraft_types = list(all_results.keys())
+    aircraft_types = list(ed_indexes.keys())
     selected_ac_type_new = st.selectbox(
         "Select Aircraft Type",
         aircraft_types,
         key="new_aircraft_type" # Use a unique key to prevent conflicts
     )
     
-    # Get the correct DataFrame for the selected type
-    if selected_ac_type_new == 'A350':
-        df_to_filter = df_a350
-    elif selected_ac_type_new == 'A330':
-        df_to_filter = df_a330
-    elif selected_ac_type_new == 'A320':
-        df_to_filter = df_a320
-    elif selected_ac_type_new == 'B777':
-        df_to_filter = df_b777
-    elif selected_ac_type_new == 'B787':
-        df_to_filter = df_b787
+    # Get the index for the selected type
+    index_to_filter = ed_indexes[selected_ac_type_new]
     
     # Select in-service date
     in_service_date_new = st.date_input(
@@ -207,16 +150,80 @@ else: # mode == "Check for a New Aircraft"
     # Convert the date_input to a datetime object for comparison
     in_service_date_new = pd.to_datetime(in_service_date_new)
     
-    # Filter the DataFrame based on the selected date
-    filtered_eds_new_df = df_to_filter[df_to_filter['From date'] < in_service_date_new]
+    # Filter the EDs based on the selected date. For the export, filtered and sorted
+    # row orders are cached per (type, date, export revision) and shared by every
+    # planner's session.
+    with span('in-service filter') as stage:
+        if using_export:
+            new_source = services.ed_source(selected_ac_type_new, in_service_date_new, file_path)
+        else:
+            new_source = FrameSource(index_to_filter.before(in_service_date_new), presorted='From date')
+        filtered_eds_new_df = new_source.frame
+        stage.rows = len(filtered_eds_new_df)
     
     st.subheader(f"Engineering Directives for a New {selected_ac_type_new} Aircraft")
     st.info(f"Showing EDs issued **before** the in-service date of **{in_service_date_new.strftime('%Y-%m-%d')}**.")
 
     if not filtered_eds_new_df.empty:
-        st.dataframe(filtered_eds_new_df.reset_index(drop=True), hide_index=True)
+        paginated_table(new_source, key="new_eds", sort_by='From date')
     else:
         st.success(f"No Engineering Derivatives found that were issued before the selected in-service date.")
 
+# ----------------- Mode 3: Fleet-wide Export -----------------
+elif mode == "Fleet-wide Export":
+    st.write("Every registration in the fleet against every ED of its type issued before its in-service date, in one file.")
+
+    # Counts come straight from the sorted indexes, no rows are materialized
+    with span('applicability counts') as stage:
+        fleet_counts = applicability_counts(ed_indexes)
+        stage.rows = len(fleet_counts)
+    st.dataframe(fleet_counts, hide_index=True)
+
+    export_format = st.selectbox("File Format", ("csv", "parquet"))
+
+    # The file is only built when the download is clicked, chunk by chunk into a temporary file
+    st.caption(f"{int(fleet_counts['Applicable EDs'].sum()):,} registration x ED rows.")
+    st.download_button(
+        label=f"Download Fleet-wide ED List as {export_format.upper()}",
+        data=lazy(write_applicability, ed_indexes, fmt=export_format),
+        file_name=f"fleet_ed_applicability.{export_format}",
+        mime='text/csv' if export_format == 'csv' else 'application/octet-stream'
+    )
+
+
+# ----------------- Mode 4: Changes Between Exports -----------------
+else: # mode == "Changes Between Exports"
+    st.write("EDs added, revised or withdrawn between two revisions of the export, and how many tails each change affects.")
+
+    from atix.snapshots import list_snapshots, summary
+
+    # Every export revision the app has loaded is kept as a compact snapshot (see atix.snapshots)
+    if using_export:
+        services.snapshot(file_path)
+    snapshot_list = list_snapshots(file_path)
+    if len(snapshot_list) < 2:
+        st.info("Only one export revision has been seen so far. Changes appear here once a newer export is loaded.")
+    else:
+        labels = [f"{s.taken[:4]}-{s.taken[4:6]}-{s.taken[6:8]} {s.taken[9:11]}:{s.taken[11:13]} ({s.sha[:8]})" for s in snapshot_list]
+        col_old, col_new = st.columns(2)
+        old_label = col_old.selectbox("Older export", labels, index=len(labels) - 2)
+        new_label = col_new.selectbox("Newer export", labels, index=len(labels) - 1)
+        with span('export diff') as stage:
+            changes = services.export_changes(snapshot_list[labels.index(old_label)], snapshot_list[labels.index(new_label)])
+            stage.rows = len(changes)
+
+        change_counts = summary(changes)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Added", f"{change_counts['added']:,}")
+        col2.metric("Revised", f"{change_counts['revised']:,}")
+        col3.metric("Withdrawn", f"{change_counts['withdrawn']:,}")
+
+        if len(changes):
+            paginated_table(FrameSource(changes.drop(columns='aircraft_type')), key="export_changes", sort_by='Change')
+        else:
+            st.success("The two exports contain the same EDs.")
+
 
 st.write("It is recommended to cross-check the results with the official document management system to ensure completeness and accuracy.")
+
+diagnostics_panel(profile_run)
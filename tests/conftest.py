@@ -0,0 +1,22 @@
+import pytest
+
+from atix.docstore import DocumentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(tmp_path / 'documents.sqlite3', pool_size=2)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def tail(store):
+    """One aircraft with an AD, an SB against it and a TO against the SB."""
+    store.add_aircraft('HS-TST', 'Airbus A350', '2020-01-01', 5000, 2000)
+    store.add_documents('HS-TST', {
+        'ADs': [{'document_id': 'AD-1', 'title': 'AD one', 'status': 'Open'}],
+        'SBs': [{'document_id': 'SB-1', 'title': 'SB one', 'status': 'Open', 'related_document_id': 'AD-1'}],
+        'TOs': [{'document_id': 'TO-1', 'title': 'TO one', 'status': 'Compliant', 'related_document_id': 'SB-1'}],
+    })
+    return 'HS-TST'
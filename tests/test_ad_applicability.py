@@ -0,0 +1,82 @@
+import pytest
+
+from atix.ad_applicability import FleetModelIndex, affected_tails, fleet_tokens, match_ads, normalize_applicability
+from atix.fleet import fleet_frame
+
+
+@pytest.fixture
+def index():
+    return FleetModelIndex(fleet_frame([
+        ('HS-A01', 'Airbus A350-900', 'Mar 2016'),
+        ('HS-A02', 'Airbus A320-200', 'Jan 2009'),
+        ('HS-B01', 'Boeing 777-200', 'Jul 2012'),
+        ('HS-B02', 'Boeing 777-300ER', 'Jul 2020'),
+        ('HS-C01', 'Boeing 787-8 Dreamliner', 'Dec 2023'),
+        ('HS-D01', 'ATR 72-600', 'Jan 2018'),
+    ]))
+
+
+RECORDS = [
+    {'AD-id': '2024-01-01', 'Applicability': ['Model 777-200, -200LR, -300, -300ER, and 777F series airplanes']},
+    {'AD-id': '2024-01-02', 'Applicability': ['Airbus A350-941 and A350-1041 aeroplanes']},
+    {'AD-id': '2024-01-03', 'Applicability': ['All Model 787 airplanes', 'Model 777-200 airplanes']},
+    {'AD-id': '2024-01-04', 'Applicability': ['SB 32-1234 dated 2020-01-01, ATA 32']},
+    {'AD-id': '2024-01-05', 'Applicability': []},
+    {'AD-id': None, 'Applicability': ['Model 777-200 airplanes']},
+]
+
+
+@pytest.mark.parametrize('text, tokens', [
+    ('Model 777-200, -200LR, -300, -300ER, and 777F series airplanes',
+     ['777-200', '777-200LR', '777-300', '777-300ER', '777F']),
+    ('Airbus A350-941 and A350-1041 aeroplanes', ['A350-900', 'A350-1000']),
+    ('A320-214 and A320-200 aeroplanes', ['A320-200']),
+    ('B787-8 and 787-9 airplanes', ['787-8', '787-9']),
+    ('All Model 787 airplanes', ['787']),
+    ('-200 airplanes, before any model is named', []),
+    ('ATA 32, SB 123-456 dated 2020-01-01', []),
+])
+def test_normalize_applicability(text, tokens):
+    assert normalize_applicability(text) == tokens
+
+
+def test_fleet_tokens_are_family_and_series():
+    assert fleet_tokens('Boeing 787-8 Dreamliner') == ['787', '787-8']
+    assert fleet_tokens('Airbus A350-900') == ['A350', 'A350-900']
+    assert fleet_tokens('ATR 72-600') == []
+
+
+def naive(records, fleet):
+    """One check per AD and aircraft: does any AD token name the aircraft's family or series?"""
+    return {
+        ad['AD-id']: [
+            registration
+            for registration, aircraft_type in zip(fleet['Registration'], fleet['Aircraft Type'])
+            if set(fleet_tokens(aircraft_type)) & {
+                token for text in ad['Applicability'] for token in normalize_applicability(text)
+            }
+        ]
+        for ad in records if ad['AD-id']
+    }
+
+
+def test_affected_tails(index):
+    tails = affected_tails(RECORDS, index)
+    assert tails == {
+        '2024-01-01': ['HS-B01', 'HS-B02'],
+        '2024-01-02': ['HS-A01'],
+        '2024-01-03': ['HS-C01', 'HS-B01'],
+        '2024-01-04': [],
+        '2024-01-05': [],
+    }
+    assert {ad: sorted(regs) for ad, regs in tails.items()} == {
+        ad: sorted(regs) for ad, regs in naive(RECORDS, index.frame.drop_duplicates('Registration')).items()
+    }
+
+
+def test_match_ads_reports_one_row_per_ad_and_tail(index):
+    matched = match_ads(RECORDS, index)
+    assert list(matched.columns) == ['AD-id', 'Registration', 'Aircraft Type', 'token']
+    assert not matched.duplicated(['AD-id', 'Registration']).any()
+    # The 777-200 HS-B01 is named by 2024-01-01 and 2024-01-03
+    assert len(matched[matched['Registration'] == 'HS-B01']) == 2
@@ -0,0 +1,108 @@
+import os
+
+from atix import ad_ingest
+from atix.ad_ingest import EASA, FAA, ingest_directory, parse_ad_text
+
+FAA_TEXT = """\
+AD 2025-06-02 The Boeing Company: Amendment 39-23001; Docket No. FAA-2024-1234; Project Identifier AD-2024-00123-T.
+(a) Effective Date
+This AD is effective April 22, 2025.
+(b) Affected ADs
+This AD supersedes AD 2021-08-15.
+(c) Applicability
+This AD applies to The Boeing Company Model 777-200 and 777-300ER airplanes, certificated in any category.
+(d) Subject
+Air Transport Association (ATA) of America Code 57, Wings.
+(e) Required actions: do the inspection in Boeing Alert Requirements Bulletin 777-57A0125 RB, dated March 1, 2024.
+"""
+
+EASA_TEXT = """\
+EASA AD No.: 2024-0150
+Effective Date: 12 August 2024
+Type/Model designation(s): A350-941, A350-1041 aeroplanes
+ATA 32 - Landing Gear
+Airbus Service Bulletin A350-32-P016, dated 3 May 2024.
+"""
+
+
+def test_parse_faa_ad():
+    record = parse_ad_text(FAA_TEXT)
+    assert record['AD-id'] == '2025-06-02'
+    assert record['Agency'] == FAA
+    assert record['Effective date'] == 'April 22, 2025'
+    assert record['ATA'] == '57'
+    assert record['Superseding'] == 'Yes'
+    assert record['Affected ADs'] == '2021-08-15'
+    assert record['Applicability'] == ['The Boeing Company Model 777-200 and 777-300ER airplanes']
+    assert [sb['SB-id'] for sb in record['Service Bulletins']] == ['B777-57A0125 RB']
+    assert record['Service Bulletins'][0]['Dated'] == 'March 1, 2024'
+
+
+def test_parse_easa_ad():
+    record = parse_ad_text(EASA_TEXT)
+    assert record['AD-id'] == '2024-0150'
+    assert record['Agency'] == EASA
+    assert record['Effective date'] == '12 August 2024'
+    assert record['ATA'] == '32'
+    assert record['Superseding'] == 'No'
+    assert record['Applicability'] == ['A350-941, A350-1041 aeroplanes']
+    assert [sb['SB-id'] for sb in record['Service Bulletins']] == ['A350-32-P016']
+
+
+def test_ingest_reuses_cached_parses(tmp_path, monkeypatch):
+    directory = tmp_path / 'ads'
+    directory.mkdir()
+    (directory / 'faa.txt').write_text(FAA_TEXT)
+    (directory / 'easa.txt').write_text(EASA_TEXT)
+    (directory / 'notes.md').write_text('not an AD')
+    cache = tmp_path / 'ads.json'
+
+    records = ingest_directory(directory, cache, workers=1)
+    assert [r['AD-id'] for r in records] == ['2024-0150', '2025-06-02']
+    assert [r['Source'] for r in records] == ['easa.txt', 'faa.txt']
+
+    parsed = []
+    real_parse = ad_ingest.parse_ad_file
+    monkeypatch.setattr(ad_ingest, 'parse_ad_file', lambda path: parsed.append(path) or real_parse(path))
+    assert ingest_directory(directory, cache, workers=1) == records
+    assert parsed == []
+
+    (directory / 'faa.txt').write_text(FAA_TEXT.replace('2025-06-02', '2025-07-01'))
+    records = ingest_directory(directory, cache, workers=1)
+    assert [os.path.basename(p) for p in parsed] == ['faa.txt']
+    assert [r['AD-id'] for r in records] == ['2024-0150', '2025-07-01']
+
+
+def test_ingest_drops_removed_files_and_reports_errors(tmp_path):
+    directory = tmp_path / 'ads'
+    directory.mkdir()
+    (directory / 'faa.txt').write_text(FAA_TEXT)
+    (directory / 'broken.pdf').write_bytes(b'not a pdf')
+    cache = tmp_path / 'ads.json'
+
+    records = ingest_directory(directory, cache, workers=1)
+    assert records[-1]['Source'] == 'broken.pdf' and records[-1]['Error']
+
+    (directory / 'broken.pdf').unlink()
+    assert [r['Source'] for r in ingest_directory(directory, cache, workers=1)] == ['faa.txt']
+    assert len(ad_ingest._load_cache(cache)) == 1
+
+
+def test_text_without_an_ad_number_is_a_failed_parse(tmp_path):
+    directory = tmp_path / 'ads'
+    directory.mkdir()
+    (directory / 'memo.txt').write_text('Minutes of the reliability meeting.')
+    [record] = ingest_directory(directory, tmp_path / 'ads.json', workers=1)
+    assert record['AD-id'] is None
+    assert record['Error'] == 'No AD number found'
+
+
+def test_process_pool_matches_serial_parse(tmp_path):
+    directory = tmp_path / 'ads'
+    directory.mkdir()
+    (directory / 'faa.txt').write_text(FAA_TEXT)
+    (directory / 'faa2.txt').write_text(FAA_TEXT.replace('2025-06-02', '2025-07-01'))
+    (directory / 'easa.txt').write_text(EASA_TEXT)
+    pooled = ingest_directory(directory, tmp_path / 'pooled.json', workers=2)
+    assert pooled == ingest_directory(directory, tmp_path / 'serial.json', workers=1)
+    assert [r['AD-id'] for r in pooled] == ['2024-0150', '2025-06-02', '2025-07-01']
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from atix import api, services
+from atix.ed_index import EDIndex
+from atix.fleet import fleet_frame
+from atix.loader import ED_COLUMNS, Fingerprint
+
+
+def get(path, query=''):
+    """Send one ``GET`` straight to the ASGI app; returns (status, JSON body)."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': query.encode(),
+        'headers': [(b'host', b'test')], 'client': ('127.0.0.1', 1), 'server': ('test', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(api.app(scope, receive, send))
+    status = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return status, json.loads(body)
+
+
+@pytest.fixture
+def eds(monkeypatch):
+    frame = pd.DataFrame(
+        [(f'ED-{i}', 1, 'A350 item', pd.Timestamp('2020-01-01') + pd.Timedelta(days=30 * i), 'EASA') for i in range(10)],
+        columns=ED_COLUMNS,
+    )
+    indexes = {'A350': EDIndex(frame)}
+    monkeypatch.setattr(services, 'ed_indexes', lambda path=None: indexes)
+    monkeypatch.setattr(services, 'eds_before', lambda type_key, cutoff, path=None: indexes[type_key].before(cutoff))
+    monkeypatch.setattr(api, 'fingerprint', lambda path: Fingerprint(path, 0, 0, 'sha'))
+    fleet = fleet_frame([('HS-AAA', 'Airbus A350-900', 'Jun 2020'), ('HS-OLD', 'Boeing 747-400', 'Jan 1999')])
+    monkeypatch.setattr(services, 'fleet', lambda: fleet)
+    monkeypatch.setattr(services, 'registrations', lambda: {row['Registration']: row for row in fleet.to_dict('records')})
+    api._ed_pages.invalidate()
+    return indexes
+
+
+@pytest.fixture
+def tracker(store, tail, monkeypatch):
+    monkeypatch.setattr(services, 'store', lambda: store)
+    return store
+
+
+def test_eds_before(eds):
+    status, body = get('/eds/before', 'type=A350&date=2020-06-01&limit=2&offset=1')
+    assert status == 200
+    assert (body['total'], body['offset'], body['limit']) == (6, 1, 2)
+    assert [row['Document'] for row in body['rows']] == ['ED-1', 'ED-2']
+    assert body['rows'][0]['From date'] == '2020-01-31'
+
+
+@pytest.mark.parametrize('query, message', [
+    ('type=B999&date=2020-06-01', "'type' must be one of A350"),
+    ('type=A350', "'date' is required"),
+    ('type=A350&date=soon', "'date' must be a date"),
+    ('type=A350&date=2020-06-01&limit=0', "'limit' must be between 1 and 1000"),
+    ('type=A350&date=2020-06-01&offset=x', "'offset' must be an integer"),
+])
+def test_eds_before_bad_parameters(eds, query, message):
+    status, body = get('/eds/before', query)
+    assert status == 400
+    assert body['error'].startswith(message)
+
+
+def test_no_export(monkeypatch):
+    def missing(path=None):
+        raise FileNotFoundError('export.XLSX')
+
+    monkeypatch.setattr(services, 'ed_indexes', missing)
+    status, body = get('/eds/types')
+    assert status == 503
+    assert 'export.XLSX' in body['error']
+
+
+def test_eds_for_registration(eds):
+    status, body = get('/eds/registration/HS-AAA')
+    assert status == 200
+    assert (body['registration'], body['total']) == ('HS-AAA', 6)
+    assert get('/eds/registration/HS-NONE')[0] == 404
+    status, body = get('/eds/registration/HS-OLD')
+    assert status == 404
+    assert 'no ED type' in body['error']
+
+
+def test_aircraft_paging(tracker):
+    tracker.add_aircraft('HS-AAA', 'Airbus A350')
+    status, body = get('/aircraft', 'limit=1&offset=1')
+    assert status == 200
+    assert (body['total'], body['offset'], body['limit']) == (2, 1, 1)
+    assert [row['aircraft_id'] for row in body['rows']] == ['HS-TST']
+    assert get('/aircraft', 'limit=5000')[0] == 400
+
+
+def test_tracker_errors(tracker):
+    status, body = get('/aircraft/HS-NONE/counts')
+    assert (status, body['error']) == (404, 'Unknown aircraft HS-NONE')
+    status, body = get('/aircraft/HS-TST/documents', 'type=XX')
+    assert status == 400
+    assert body['error'].startswith("'type' must be one of")
+    status, body = get('/aircraft/HS-TST/documents', 'type=SB')
+    assert status == 200
+    assert [row['document_id'] for row in body['rows']] == ['SB-1']
+    status, body = get('/aircraft/HS-TST/documents/TO-1/ancestors')
+    assert [row['document_id'] for row in body['rows']] == ['SB-1', 'AD-1']
+
+
+def test_cutoff_time_of_day_does_not_change_the_page(eds):
+    # ED-0 is dated 2020-01-01; the cutoff day, not the hour, decides
+    assert get('/eds/before', 'type=A350&date=2020-01-01T12:00')[1]['total'] == 0
+    assert get('/eds/before', 'type=A350&date=2020-01-02')[1]['total'] == 1
+    assert get('/eds/before', 'type=A350&date=2020-01-01')[1]['total'] == 0
+
+
+def test_due_is_paged_and_bounded(tracker, monkeypatch):
+    from atix.scheduler import DueScheduler
+
+    tracker.add_documents('HS-TST', {'ADs': [
+        {'document_id': f'AD-D{i}', 'title': str(i), 'status': 'Open', 'date_due': f'2030-01-{i + 1:02d}'} for i in range(5)
+    ]})
+    monkeypatch.setattr(services, 'scheduler', lambda: DueScheduler.from_store(tracker))
+    status, body = get('/due', 'days=36500&offset=1&limit=2')
+    assert status == 200
+    assert (body['total'], body['offset'], body['limit']) == (5, 1, 2)
+    assert [row['document_id'] for row in body['rows']] == ['AD-D1', 'AD-D2']
+    status, body = get('/due', 'days=99999999')
+    assert status == 400
+    assert body['error'].startswith("'days' must be between 0 and")
+    assert [row['document_id'] for row in get('/due', 'next=2')[1]['rows']] == ['AD-D0', 'AD-D1']
@@ -0,0 +1,88 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from atix.applicability import (
+    AIRCRAFT_COLUMNS, MATRIX_COLUMNS, applicability_counts, applicability_matrix, iter_applicability, write_applicability,
+)
+from atix.classifier import type_indexes
+from atix.export import lazy
+from atix.fleet import fleet_frame
+from atix.loader import ED_COLUMNS
+
+
+@pytest.fixture
+def eds():
+    rng = np.random.default_rng(3)
+    types = ['A350 part', 'A320 part', 'B777 part']
+    frame = pd.DataFrame({
+        'Document': [f'ED-{i}' for i in range(300)],
+        'Document version': rng.integers(1, 4, 300),
+        'Description': [types[i % 3] for i in range(300)],
+        'From date': pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 5000, 300), unit='D'),
+        'Full Name': 'EASA',
+    })
+    frame.loc[7, 'From date'] = pd.NaT
+    return frame
+
+
+@pytest.fixture
+def fleet():
+    return fleet_frame([
+        ('HS-A01', 'Airbus A350-900', 'Mar 2016'),
+        ('HS-A02', 'Airbus A350-900', 'Jan 2009'),
+        ('HS-B01', 'Airbus A320-200', 'Jul 2012'),
+        ('HS-B02', 'Airbus A320-200', 'Jul 2020'),
+        ('HS-C01', 'Boeing 777-300ER', 'Dec 2023'),
+        ('HS-D01', 'ATR 72-600', 'Jan 2018'),
+    ])
+
+
+def naive(eds, fleet, indexes):
+    """The old per-registration boolean filter, one registration at a time."""
+    parts = []
+    for _, aircraft in fleet.iterrows():
+        if aircraft['Type'] not in indexes:
+            continue
+        of_type = indexes[aircraft['Type']].frame
+        rows = of_type[of_type['From date'] < aircraft['In Service Date']].reset_index(drop=True)
+        for column in reversed(AIRCRAFT_COLUMNS):
+            rows.insert(0, column, aircraft[column])
+        parts.append(rows)
+    return pd.concat(parts, ignore_index=True)[MATRIX_COLUMNS]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 17, 250_000])
+def test_chunked_matrix_equals_per_registration_filter(eds, fleet, chunk_rows):
+    indexes = type_indexes(eds)
+    chunks = list(iter_applicability(indexes, fleet, chunk_rows))
+    # A chunk only runs over chunk_rows when one registration alone needs more
+    assert all(len(chunk) <= chunk_rows or chunk['Registration'].nunique() == 1 for chunk in chunks)
+    matrix = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(matrix, naive(eds, fleet, indexes), check_dtype=False)
+    counts = applicability_counts(indexes, fleet)
+    assert counts['Applicable EDs'].sum() == len(matrix)
+
+
+def test_csv_and_parquet_files_hold_the_matrix(eds, fleet):
+    indexes = type_indexes(eds)
+    expected = applicability_matrix(indexes, fleet)
+
+    csv = lazy(write_applicability, indexes, fleet, fmt='csv', chunk_rows=50)()
+    from_csv = pd.read_csv(io.BytesIO(csv))
+    assert list(from_csv.columns) == MATRIX_COLUMNS
+    assert from_csv['Document'].tolist() == expected['Document'].tolist()
+    assert from_csv['Registration'].tolist() == expected['Registration'].tolist()
+
+    parquet = lazy(write_applicability, indexes, fleet, fmt='parquet', chunk_rows=50)()
+    from_parquet = pd.read_parquet(io.BytesIO(parquet))
+    assert len(from_parquet) == len(expected)
+    assert from_parquet[ED_COLUMNS].astype(str).equals(expected[ED_COLUMNS].astype(str))
+
+
+def test_no_applicable_eds_writes_a_header(fleet):
+    indexes = type_indexes(pd.DataFrame(columns=ED_COLUMNS))
+    csv = lazy(write_applicability, indexes, fleet, fmt='csv')()
+    assert csv.decode().strip() == ','.join(MATRIX_COLUMNS)
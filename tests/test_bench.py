@@ -0,0 +1,22 @@
+import pytest
+
+from atix.bench import compare
+
+
+def results(seconds, **meta):
+    base = {'eds': 10, 'tails': 1, 'ads_per_tail': 1, 'seed': 0, 'machine': 'x86_64', 'cpu': 'Xeon', 'cpus': 4}
+    return {'meta': {**base, **meta}, 'stages': {'load': {'rows': 10, 'seconds': seconds}}}
+
+
+def test_regressions_beyond_tolerance_and_noise():
+    assert compare(results(1.2), results(1.0)) == []
+    assert compare(results(1.3), results(1.0)) == [('load', 1.0, 1.3)]
+    assert compare(results(0.06), results(0.01)) == []
+
+
+def test_refuses_other_scales_and_machines():
+    with pytest.raises(ValueError, match='scale'):
+        compare(results(1.0, eds=20), results(1.0))
+    with pytest.raises(ValueError, match='different machine'):
+        compare(results(1.0, cpus=8), results(1.0))
+    assert compare(results(2.0, cpus=8), results(1.0), any_machine=True) == [('load', 1.0, 2.0)]
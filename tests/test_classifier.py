@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from atix.classifier import DEFAULT_CLASSIFIER, TYPE_RULES, TypeClassifier, type_indexes
+from atix.loader import prepare_ed_frame
+from atix.snapshots import diff_frames
+
+DESCRIPTIONS = pd.Series([
+    'A350-941 wing spar', 'a330 cargo door', 'A320 fuel pump', 'A320 ITO procedure', 'P320 seat', 'P320 and A320',
+    'B777 engine', '787 battery', 'HS A350 ground equipment', '320/330 common part', 'Boeing 777 / A350 galley',
+    'Generic ELT', '', None, np.nan, 'a350 lavatory', 'A350 lavatory', 'A3500 unit', 'THS actuator 330',
+])
+
+
+def old_rules(descriptions):
+    """The per-type ``str.contains`` filters the ED Checker used before the classifier."""
+    return {
+        key: (
+            descriptions.str.contains('|'.join(include), case=False, na=False, regex=True)
+            & ~descriptions.str.contains('|'.join(exclude), case=False, na=False, regex=True)
+        ).to_numpy()
+        for key, include, exclude in TYPE_RULES
+    }
+
+
+def test_masks_match_old_substring_rules():
+    masks = DEFAULT_CLASSIFIER.masks(DEFAULT_CLASSIFIER.classify(DESCRIPTIONS))
+    expected = old_rules(DESCRIPTIONS)
+    for key in DEFAULT_CLASSIFIER.keys:
+        assert masks[key].tolist() == expected[key].tolist(), key
+
+
+def test_multi_label_and_missing():
+    labels = DEFAULT_CLASSIFIER.classify(pd.Series(['320/330 common part', 'Generic ELT', None]))
+    assert labels[0] == 'A330,A320'
+    assert pd.isna(labels[1]) and pd.isna(labels[2])
+
+
+def test_all_missing_or_empty():
+    for descriptions in (pd.Series([np.nan, None]), pd.Series([], dtype=object), pd.Series(['none here', None])):
+        labels = DEFAULT_CLASSIFIER.classify(descriptions)
+        assert len(labels) == len(descriptions)
+        assert pd.isna(labels).all()
+        assert not any(mask.any() for mask in DEFAULT_CLASSIFIER.masks(labels).values())
+
+
+def test_export_without_descriptions():
+    frame = prepare_ed_frame(pd.DataFrame({'Document': ['ED-1', 'ED-2'], 'From date': pd.to_datetime(['2020-01-01', '2021-01-01'])}))
+    assert all(len(index) == 0 for index in type_indexes(frame).values())
+    changes = diff_frames(frame.iloc[:1], frame)
+    assert changes['Document'].tolist() == ['ED-2']
+    assert changes['aircraft_type'].isna().all()
+
+
+def test_new_rule_is_one_more_row():
+    classifier = TypeClassifier(TYPE_RULES + [('A380', ('A380', '380'), ('HS',))])
+    labels = classifier.classify(pd.Series(['A380 door', 'A350 door']))
+    assert list(labels) == ['A380', 'A350']
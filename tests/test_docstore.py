@@ -0,0 +1,106 @@
+import pytest
+
+
+def _relate(store, aircraft_id, document_id, related_to):
+    with store._write() as conn:
+        conn.execute(
+            'UPDATE documents SET related_document_id = ? WHERE aircraft_id = ? AND document_id = ?',
+            (related_to, aircraft_id, document_id),
+        )
+
+
+def _tree(store, aircraft_id):
+    return [(row['root_id'], row['depth'], row['document_id']) for row in store.document_tree(aircraft_id)]
+
+
+def test_document_tree_walks_ad_sb_to(store, tail):
+    assert _tree(store, tail) == [('AD-1', 0, 'AD-1'), ('AD-1', 1, 'SB-1'), ('AD-1', 2, 'TO-1')]
+
+
+def test_document_tree_stops_at_cycles(store, tail):
+    _relate(store, tail, 'AD-1', 'TO-1')
+    assert _tree(store, tail) == [('AD-1', 0, 'AD-1'), ('AD-1', 1, 'SB-1'), ('AD-1', 2, 'TO-1')]
+
+
+def test_document_tree_stops_at_self_reference(store, tail):
+    _relate(store, tail, 'AD-1', 'AD-1')
+    assert _tree(store, tail) == [('AD-1', 0, 'AD-1'), ('AD-1', 1, 'SB-1'), ('AD-1', 2, 'TO-1')]
+
+
+def _ancestors(store, aircraft_id, document_id, doc_type=None):
+    return [(row['depth'], row['document_id']) for row in store.ancestors(aircraft_id, document_id, doc_type)]
+
+
+def test_ancestors_walk_up_to_the_ad(store, tail):
+    assert _ancestors(store, tail, 'TO-1') == [(1, 'SB-1'), (2, 'AD-1')]
+    assert _ancestors(store, tail, 'TO-1', 'AD') == [(2, 'AD-1')]
+    assert _ancestors(store, tail, 'AD-1') == []
+    assert _ancestors(store, tail, 'NOPE') == []
+
+
+def test_ancestors_stop_at_cycles(store, tail):
+    _relate(store, tail, 'AD-1', 'TO-1')
+    assert _ancestors(store, tail, 'TO-1') == [(1, 'SB-1'), (2, 'AD-1')]
+    _relate(store, tail, 'AD-1', 'AD-1')
+    assert _ancestors(store, tail, 'AD-1') == []
+
+
+def test_document_tree_frame_matches_rows(store, tail):
+    frame = store.document_tree_frame(tail, 'AD-1')
+    assert frame['document_id'].astype(str).tolist() == ['AD-1', 'SB-1', 'TO-1']
+    assert frame['depth'].tolist() == [0, 1, 2]
+
+
+def test_open_streams_do_not_hold_pooled_connections(store, tail):
+    streams = [store.iter_query('SELECT * FROM documents') for _ in range(5)]
+    for stream in streams:
+        next(stream)
+    assert store.query('SELECT COUNT(*) AS n FROM documents') == [{'n': 3}]
+
+
+def test_exhausted_pool_times_out(store):
+    with store._read(), store._read():
+        with pytest.raises(TimeoutError):
+            with store._read(timeout=0.05):
+                pass
+
+
+def _recount(store):
+    """doc_counts as it should be, straight from the documents table."""
+    rows = store.query(
+        "SELECT aircraft_id, doc_type, IFNULL(status, '') AS status, COUNT(*) AS n FROM documents GROUP BY 1, 2, 3"
+    )
+    return sorted((row['aircraft_id'], row['doc_type'], row['status'], row['n']) for row in rows)
+
+
+def _counted(store):
+    return sorted((row['aircraft_id'], row['doc_type'], row['status'], row['n']) for row in store.count_rows())
+
+
+def test_count_triggers_follow_inserts(store, tail):
+    assert _counted(store) == _recount(store)
+    assert store.counts(tail) == {'AD': (1, 1), 'SB': (1, 1), 'TO': (1, 0), 'ED': (0, 0)}
+
+
+def test_count_triggers_follow_status_changes(store, tail):
+    store.set_status(tail, 'AD-1', 'Compliant')
+    store.set_status(tail, 'SB-1', None)
+    assert _counted(store) == _recount(store)
+    assert store.counts(tail)['AD'] == (1, 0)
+    # A NULL status is counted under '' and is not Compliant, so still pending
+    assert ('HS-TST', 'SB', '', 1) in _counted(store)
+
+
+def test_count_triggers_follow_deletes(store, tail):
+    with store._write() as conn:
+        conn.execute("DELETE FROM documents WHERE document_id = 'SB-1'")
+    assert _counted(store) == _recount(store)
+    assert store.counts(tail)['SB'] == (0, 0)
+    store.clear()
+    assert _counted(store) == []
+
+
+def test_count_triggers_follow_task_completion(store, tail):
+    store.complete_task(tail, 'AD-1', '2024-05-01')
+    assert _counted(store) == _recount(store)
+    assert store.counts(tail)['AD'] == (1, 0)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from atix.ed_index import EDIndex
+from atix.loader import ED_COLUMNS
+
+
+def eds(n=500, seed=1):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'Document': [f'ED-{i}' for i in range(n)],
+        'Document version': rng.integers(1, 5, n),
+        'Description': 'A350 part',
+        # Few distinct days, so many EDs share one
+        'From date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 60, n) * 30, unit='D'),
+        'Full Name': 'EASA',
+    }, columns=ED_COLUMNS)
+    frame.loc[rng.choice(n, 20, replace=False), 'From date'] = pd.NaT
+    return frame
+
+
+def old_filter(frame, cutoff):
+    """The boolean filter the ED Checker used before the index."""
+    return frame[frame['From date'] < cutoff]
+
+
+def test_before_matches_the_boolean_filter():
+    frame = eds()
+    index = EDIndex(frame)
+    cutoffs = [pd.Timestamp('2014-01-01'), pd.Timestamp('2015-01-01'), pd.Timestamp('2017-07-20'),
+               pd.Timestamp('2017-07-20 12:00'), pd.Timestamp('2030-01-01')] + list(frame['From date'].dropna()[:10])
+    for cutoff in cutoffs:
+        expected = old_filter(frame, cutoff).sort_values('From date', kind='stable')
+        result = index.before(cutoff)
+        assert result['Document'].tolist() == expected['Document'].tolist(), cutoff
+        assert index.count_before(cutoff) == len(expected)
+
+
+def test_counts_before_is_vectorized_count_before():
+    index = EDIndex(eds())
+    cutoffs = pd.Series([pd.Timestamp('2016-03-01'), pd.NaT, pd.Timestamp('2010-01-01'), pd.Timestamp('2021-01-01')])
+    assert index.counts_before(cutoffs).tolist() == [index.count_before(c) for c in cutoffs]
+    assert index.count_before(None) == 0
+    assert index.before(pd.NaT).empty
+
+
+def test_undated_eds_are_never_before_a_cutoff():
+    frame = eds()
+    index = EDIndex(frame)
+    assert len(index) == frame['From date'].notna().sum()
+    assert len(index.before(pd.Timestamp('2100-01-01'))) == len(index)
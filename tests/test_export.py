@@ -0,0 +1,85 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from atix.export import (
+    EXPORT_COLUMNS, FLEET_COLUMNS, iter_document_rows, lazy, write_aircraft, write_fleet_parquet, write_fleet_zip,
+)
+
+
+@pytest.fixture
+def fleet(store, tail):
+    store.add_aircraft('HS-TWO', 'Airbus A320', '2018-05-01', 1000, 800)
+    store.add_documents('HS-TWO', {
+        'ADs': [{'document_id': 'AD-9', 'title': 'AD nine', 'status': 'Open', 'date_due': '2027-01-31'}],
+        'EDs': [{'document_id': 'ED-9', 'title': 'ED nine', 'status': 'Open', 'related_document_id': 'AD-9'}],
+    })
+    return [tail, 'HS-TWO']
+
+
+def old_download_df(store, aircraft_id):
+    """The DataFrame the tracker page built before the streaming export."""
+    flat_list = []
+    for doc in store.document_tree(aircraft_id):
+        is_ad = doc['depth'] == 0
+        flat_list.append({
+            'Document_Type': doc['doc_type'],
+            'Document_ID': doc['document_id'],
+            'Title': doc['title'],
+            'Status': doc['status'],
+            'Date_Due': doc['date_due'] if is_ad else 'N/A',
+            'Last_Completed': doc['last_completed'] if is_ad else 'N/A',
+            'Related_To': 'N/A' if is_ad else doc['related_document_id']
+        })
+    return pd.DataFrame(flat_list)
+
+
+def test_tree_rows_mark_non_ad_fields_not_applicable(store, tail):
+    assert list(iter_document_rows(store, tail)) == [
+        ('AD', 'AD-1', 'AD one', 'Open', None, None, 'N/A'),
+        ('SB', 'SB-1', 'SB one', 'Open', 'N/A', 'N/A', 'AD-1'),
+        ('TO', 'TO-1', 'TO one', 'Compliant', 'N/A', 'N/A', 'SB-1'),
+    ]
+
+
+def test_csv_matches_the_old_dataframe_export(store, fleet):
+    for aircraft_id in fleet:
+        csv = lazy(write_aircraft, store, aircraft_id, fmt='csv')()
+        old = old_download_df(store, aircraft_id).to_csv(index=False).encode('utf-8')
+        # csv.writer ends lines with CRLF, pandas with LF; the fields are the same
+        assert csv.splitlines() == old.splitlines()
+
+
+def test_xlsx_holds_one_sheet_per_aircraft(store, tail):
+    xlsx = lazy(write_aircraft, store, tail, fmt='xlsx')()
+    ws = load_workbook(io.BytesIO(xlsx), read_only=True)[tail]
+    rows = list(ws.values)
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert [row[1] for row in rows[1:]] == ['AD-1', 'SB-1', 'TO-1']
+    with pytest.raises(ValueError):
+        write_aircraft(io.BytesIO(), store, tail, fmt='pdf')
+
+
+def test_fleet_zip_has_a_csv_per_aircraft(store, fleet):
+    fh = io.BytesIO()
+    assert write_fleet_zip(fh, store) == 5
+    with zipfile.ZipFile(fh) as zf:
+        assert zf.namelist() == [f'{aircraft_id}_documents_list.csv' for aircraft_id in fleet]
+        for aircraft_id in fleet:
+            expected = lazy(write_aircraft, store, aircraft_id)()
+            assert zf.read(f'{aircraft_id}_documents_list.csv') == expected
+
+
+def test_fleet_parquet_uses_nulls_for_not_applicable(store, fleet):
+    fh = io.BytesIO()
+    assert write_fleet_parquet(fh, store, chunk_rows=2) == 5
+    frame = pd.read_parquet(io.BytesIO(fh.getvalue()))
+    assert list(frame.columns) == FLEET_COLUMNS
+    assert frame['Aircraft'].tolist() == ['HS-TST'] * 3 + ['HS-TWO'] * 2
+    assert frame['Related_To'].dropna().tolist() == ['AD-1', 'SB-1', 'AD-9']
+    assert frame['Related_To'].isna().tolist() == [True, False, False, True, False]
+    assert frame['Date_Due'].isna().tolist() == [True, True, True, False, True]
+    assert str(frame['Date_Due'][3]) == '2027-01-31'
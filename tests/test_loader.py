@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from atix import loader
+from atix.loader import ED_COLUMNS, clear_cache, fingerprint, latest_versions, load_derived, load_ed_frame, prepare_ed_frame, read_ed_export
+
+HEADER = ['Document', 'Unused', 'Document version', 'Description', 'From date', 'Full Name']
+ROWS = [
+    ('ED-1', 'x', 1, 'A350 wing', '2020-01-01', 'EASA'),
+    ('ED-2', 'x', 1, 'A320 door', '2021-03-04', 'FAA'),
+    (None, None, None, None, None, None),
+    ('ED-1', 'y', 2, 'A350 wing, revised', '2020-02-01', 'EASA'),
+    ('ED-3', 'x', 3, None, None, 'EASA'),
+    ('ED-2', 'z', 2, 'A320 door', '2021-03-04', 'FAA'),
+]
+
+
+def write_export(path, rows=ROWS):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    for row in rows:
+        ws.append([pd.Timestamp(v).to_pydatetime() if i == 4 and v else v for i, v in enumerate(row)])
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_streaming_matches_read_excel_and_drop_duplicates(tmp_path):
+    path = write_export(tmp_path / 'export.xlsx')
+    expected = prepare_ed_frame(pd.read_excel(path).dropna(how='all'))
+    streamed = read_ed_export(path)
+    assert list(streamed.columns) == ED_COLUMNS
+    assert streamed.astype(str).equals(expected.astype(str))
+    assert list(latest_versions(path)) == ['ED-1', 'ED-3', 'ED-2']
+
+
+def test_derived_values_follow_the_frame_they_were_built_from(tmp_path):
+    path = write_export(tmp_path / 'export.xlsx')
+    cache_dir = str(tmp_path / 'cache')
+    first = load_derived('count', len, path, cache_dir)
+    assert first == 3
+    assert load_derived('count', lambda df: pytest.fail('rebuilt'), path, cache_dir) == 3
+
+    clear_cache(path)
+    assert load_derived('count', len, path, cache_dir) == 3
+    assert len(load_ed_frame(path, cache_dir)) == 3
+
+
+def test_only_the_current_hash_of_a_file_is_kept(tmp_path):
+    path = write_export(tmp_path / 'export.xlsx')
+    before = fingerprint(path)
+    write_export(path, ROWS[:2])
+    os.utime(path, ns=(before.mtime_ns + 10**9, before.mtime_ns + 10**9))
+    after = fingerprint(path)
+    assert after.sha256 != before.sha256
+    assert list(loader._hashes) == [os.path.abspath(path)]
+    clear_cache(path)
+    assert loader._hashes == {}
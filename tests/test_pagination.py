@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from atix.pagination import FrameSource, StoreSource
+
+
+@pytest.fixture
+def documents(store, tail):
+    store.add_documents(tail, {'ADs': [
+        {'document_id': 'AD-2', 'title': '50% inspection', 'status': 'Open'},
+        {'document_id': 'AD-3', 'title': 'wing_root fairing', 'status': 'Compliant'},
+        {'document_id': 'AD-4', 'title': 'wingXroot panel', 'status': 'Open'},
+        {'document_id': 'AD-5', 'title': 'path C:\\temp', 'status': 'Open'},
+    ]})
+    return StoreSource(store, tail, 'AD')
+
+
+def ids(rows):
+    return [row['document_id'] for row in rows]
+
+
+def test_store_source_pages_and_sorts(documents):
+    assert documents.count() == 5
+    assert ids(documents.fetch_rows(1, 2)) == ['AD-2', 'AD-3']
+    assert ids(documents.fetch_rows(0, 2, sort_by='document_id', descending=True)) == ['AD-5', 'AD-4']
+    page = documents.fetch(0, 3, columns=['document_id', 'status', 'not_a_column'])
+    assert list(page.columns) == ['document_id', 'status']
+    with pytest.raises(ValueError):
+        StoreSource(documents.store, 'HS-TST', 'AD', columns=['id; DROP TABLE documents'])
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('OPEN', ['AD-1', 'AD-2', 'AD-4', 'AD-5']),
+    ('%', ['AD-2']),
+    ('50%', ['AD-2']),
+    ('_', ['AD-3']),
+    ('wing_root', ['AD-3']),
+    ('\\', ['AD-5']),
+])
+def test_store_source_filter_text_is_literal(documents, text, expected):
+    assert ids(documents.fetch_rows(0, 10, text=text)) == expected
+    assert documents.count(text) == len(expected)
+
+
+def test_frame_source_filters_like_store_source(documents):
+    frame = pd.DataFrame(documents.fetch_rows(0, 10))
+    source = FrameSource(frame)
+    for text in ('OPEN', '%', '_', 'wing_root', '\\'):
+        assert source.fetch(0, 10, text=text)['document_id'].tolist() == ids(documents.fetch_rows(0, 10, text=text))
@@ -0,0 +1,24 @@
+from atix import profiling
+from atix.profiling import finish_run, span, start_run
+
+
+def test_span_records_rows_and_nesting():
+    run = start_run('test', enabled=True)
+    with span('outer') as outer:
+        outer.rows = 3
+        with span('inner'):
+            pass
+    finish_run(run, log_file=None)
+    assert [(s.name, s.depth, s.rows) for s in run.spans] == [('outer', 0, 3), ('inner', 1, None)]
+
+
+def test_span_tolerates_memory_becoming_unreadable(monkeypatch):
+    readings = iter([100, None, None, 250])
+    monkeypatch.setattr(profiling, '_rss', lambda: next(readings))
+    run = start_run('test', enabled=True)
+    with span('lost'):
+        pass
+    with span('unknown at start'):
+        pass
+    finish_run(run, log_file=None)
+    assert [s.memory_delta for s in run.spans] == [None, None]
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from atix.pagination import FrameSource
+from atix.result_cache import ResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_by_entries():
+    cache = ResultCache(max_entries=2, max_bytes=1 << 20, ttl=60)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    assert cache.get('a') == b'1'  # 'b' is now least recently used
+    cache.put('c', b'3')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1' and cache.get('c') == b'3'
+    assert cache.stats().evictions == 1
+
+
+def test_eviction_by_bytes_and_oversized_values():
+    cache = ResultCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.put('a', b'x' * 6)
+    cache.put('b', b'y' * 6)
+    assert cache.get('a') is None and cache.get('b') == b'y' * 6
+    cache.put('big', b'z' * 11)
+    assert cache.get('big') is None
+    assert cache.stats().bytes == 6
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.put('a', b'1')
+    clock.now = 9.9
+    assert cache.get('a') == b'1'
+    clock.now = 10
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations, stats.entries) == (1, 1, 1, 0)
+
+
+def test_expired_entries_do_not_count_against_limits():
+    clock = Clock()
+    cache = ResultCache(max_entries=2, max_bytes=1 << 20, ttl=10, clock=clock)
+    cache.put('old', b'1')
+    clock.now = 5
+    cache.put('live', b'2')
+    clock.now = 11
+    cache.put('new', b'3')  # over the limit: the expired entry goes, not 'live'
+    assert cache.get('live') == b'2' and cache.get('new') == b'3'
+    assert cache.stats().evictions == 0
+    clock.now = 100
+    assert cache.stats().bytes == 0
+
+
+def test_new_version_clears_entries():
+    cache = ResultCache()
+    cache.put('a', b'1', version='v1')
+    assert cache.get('a', version='v1') == b'1'
+    assert cache.get('a', version='v2') is None
+    assert len(cache) == 0
+
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('k', lambda: calls.append(1) or b'value') == b'value'
+    assert len(calls) == 1
+
+
+def test_arrays_are_sized_by_their_buffer():
+    cache = ResultCache()
+    cache.put('a', np.arange(100, dtype='int64'))
+    assert cache.stats().bytes == 800
+
+
+def _eds():
+    return pd.DataFrame({
+        'Document': pd.array(['ED-3', 'ED-1', 'ED-2', 'ED-4'], dtype='string'),
+        'Description': pd.array(['wing', 'gear', 'wing panel', 'brake'], dtype='string'),
+        'From date': pd.to_datetime(['2020-01-01', '2020-02-01', '2020-03-01', '2020-04-01']),
+    })
+
+
+def test_frame_source_caches_row_orders():
+    cache = ResultCache()
+    source = FrameSource(_eds(), presorted='From date', cache=cache, cache_key='A350', version='v1')
+    assert source.count('wing') == 2
+    assert source.fetch(0, 10, sort_by='Document', text='wing')['Document'].tolist() == ['ED-2', 'ED-3']
+    assert source.fetch(0, 10, sort_by='Document', descending=True)['Document'].tolist() == ['ED-4', 'ED-3', 'ED-2', 'ED-1']
+    assert len(cache) == 3  # ('wing', no sort), ('wing', Document), (no filter, Document)
+
+    again = FrameSource(_eds(), presorted='From date', cache=cache, cache_key='A350', version='v1')
+    assert again.fetch(0, 1, sort_by='Document', text='wing')['Document'].tolist() == ['ED-2']
+    assert cache.stats().hits == 1
+
+    # Unfiltered pages in the presorted order need no cache at all
+    assert source.fetch(1, 2)['Document'].tolist() == ['ED-1', 'ED-2']
+    assert len(cache) == 3
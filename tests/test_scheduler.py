@@ -0,0 +1,107 @@
+from datetime import date
+
+import pytest
+
+from atix import services
+from atix.scheduler import DueScheduler
+
+AS_OF = date(2025, 1, 1)  # 1827 days after the fixture aircraft entered service
+
+
+@pytest.fixture
+def fleet(store):
+    # 2 hours and 1 cycle a day on average
+    store.add_aircraft('HS-SCH', 'Airbus A350', '2020-01-01', 3654, 1827)
+    store.add_documents('HS-SCH', {'ADs': [
+        {'document_id': 'AD-CAL', 'title': 'calendar', 'status': 'Open', 'date_due': '2025-01-11', 'interval_days': 365},
+        {'document_id': 'AD-HRS', 'title': 'hours', 'status': 'Open', 'due_hours': 3654 + 40},
+        {'document_id': 'AD-CYC', 'title': 'cycles', 'status': 'Open', 'due_cycles': 1827 + 5},
+        {'document_id': 'AD-OVR', 'title': 'overdue', 'status': 'Open', 'date_due': '2024-12-25'},
+        {'document_id': 'AD-MIX', 'title': 'mixed', 'status': 'Open', 'date_due': '2025-03-01', 'due_cycles': 1827 + 3},
+        {'document_id': 'AD-NA', 'title': 'not applicable', 'status': 'N/A', 'date_due': '2025-01-02'},
+        {'document_id': 'AD-NONE', 'title': 'no limit', 'status': 'Open'},
+    ]})
+    return store
+
+
+def ids(items):
+    return [item.document_id for item in items]
+
+
+def test_next_due_order_and_limits(fleet):
+    scheduler = DueScheduler.from_store(fleet, AS_OF)
+    assert len(scheduler) == 5
+    items = scheduler.next_due(10)
+    assert ids(items) == ['AD-OVR', 'AD-MIX', 'AD-CYC', 'AD-CAL', 'AD-HRS']
+    assert [item.due for item in items] == [
+        date(2024, 12, 25), date(2025, 1, 4), date(2025, 1, 6), date(2025, 1, 11), date(2025, 1, 21),
+    ]
+    assert [item.limit for item in items] == ['calendar', 'cycles', 'cycles', 'calendar', 'hours']
+    assert ids(scheduler.next_due(2)) == ['AD-OVR', 'AD-MIX']
+
+
+def test_due_within_includes_overdue(fleet):
+    scheduler = DueScheduler.from_store(fleet, AS_OF)
+    assert ids(scheduler.due_within(4)) == ['AD-OVR', 'AD-MIX']
+    assert ids(scheduler.due_within(5)) == ['AD-OVR', 'AD-MIX', 'AD-CYC']  # inclusive
+    assert ids(scheduler.due_within(10)) == ['AD-OVR', 'AD-MIX', 'AD-CYC', 'AD-CAL']
+    assert scheduler.due_within(-30) == []
+
+
+def test_complete_reschedules_one_task(fleet):
+    scheduler = DueScheduler.from_store(fleet, AS_OF)
+    assert scheduler.complete(fleet, 'HS-SCH', 'AD-CAL') == 1
+    assert ids(scheduler.next_due(10))[-1] == 'AD-CAL'
+    assert scheduler.next_due(10)[-1].due == date(2026, 1, 1)
+    # No interval: completing it drops it from the schedule
+    assert scheduler.complete(fleet, 'HS-SCH', 'AD-OVR') == 0
+    assert 'AD-OVR' not in ids(scheduler.next_due(10))
+    assert len(scheduler) == 4
+
+
+def test_superseded_entries_are_skipped_and_compacted(fleet):
+    scheduler = DueScheduler.from_store(fleet, AS_OF)
+    for _ in range(100):
+        scheduler.refresh_aircraft(fleet, 'HS-SCH')
+    assert ids(scheduler.next_due(10)) == ['AD-OVR', 'AD-MIX', 'AD-CYC', 'AD-CAL', 'AD-HRS']
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+    assert scheduler.remove('HS-SCH', 'AD-MIX')
+    assert not scheduler.remove('HS-SCH', 'AD-MIX')
+    assert ids(scheduler.next_due(2)) == ['AD-OVR', 'AD-CYC']
+
+
+def test_shared_scheduler_follows_store_writes(fleet, monkeypatch):
+    monkeypatch.setattr(services, 'store', lambda: fleet)
+    monkeypatch.setattr(services, '_cache', {})
+    scheduler = services.scheduler()
+    assert services.scheduler() is scheduler
+    # A reseed that keeps the document count and highest id still rebuilds it
+    fleet.clear()
+    fleet.add_aircraft('HS-NEW', 'Airbus A350', '2020-01-01', 3654, 1827)
+    fleet.add_documents('HS-NEW', {'ADs': [
+        {'document_id': f'AD-{i}', 'title': str(i), 'status': 'Open', 'date_due': '2030-01-01'} for i in range(7)
+    ]})
+    rebuilt = services.scheduler()
+    assert rebuilt is not scheduler
+    assert {item.aircraft_id for item in rebuilt.next_due(10)} == {'HS-NEW'}
+
+
+def test_shared_scheduler_survives_its_own_completions(fleet, monkeypatch):
+    monkeypatch.setattr(services, 'store', lambda: fleet)
+    monkeypatch.setattr(services, '_cache', {})
+    scheduler = services.scheduler()
+    scheduler.complete(fleet, 'HS-SCH', 'AD-CAL')
+    assert scheduler.store_version == fleet.version()
+    assert services.scheduler() is scheduler
+    # A write made elsewhere still forces a rebuild
+    fleet.set_status('HS-SCH', 'AD-HRS', 'N/A')
+    rebuilt = services.scheduler()
+    assert rebuilt is not scheduler
+    assert 'AD-HRS' not in ids(rebuilt.next_due(10))
+
+
+def test_completion_after_a_foreign_write_leaves_the_schedule_stale(fleet):
+    scheduler = DueScheduler.from_store(fleet, AS_OF)
+    fleet.set_status('HS-SCH', 'AD-HRS', 'N/A')
+    scheduler.complete(fleet, 'HS-SCH', 'AD-CAL')
+    assert scheduler.store_version != fleet.version()
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from atix.schema import compact_ed_frame, memory_report
+
+
+def eds(n=2000):
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'Document': [f'ED-{i}' for i in range(n)],
+        'Document version': rng.integers(1, 9, n),
+        'Description': [f'A350 part {i % 40}' for i in range(n)],
+        'From date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, n), unit='D'),
+        'Full Name': rng.choice(['EASA', 'FAA', 'CAAT'], n),
+    })
+
+
+def test_compact_ed_frame_keeps_values_and_saves_memory():
+    plain = eds()
+    compact = compact_ed_frame(plain)
+    assert compact['Full Name'].dtype == 'category'
+    assert compact['Document version'].dtype == np.int8
+    assert compact['From date'].dtype == 'datetime64[ns]'
+    for column in plain:
+        assert compact[column].tolist() == plain[column].tolist(), column
+    report = memory_report({'plain': plain, 'compact': compact}).set_index('Table')
+    assert report.loc['compact', 'Bytes/row'] < report.loc['plain', 'Bytes/row']
+
+
+def test_versions_keep_missing_values_and_labels():
+    plain = eds(4)
+    plain['Document version'] = [1, None, 3, 4]
+    assert compact_ed_frame(plain)['Document version'].tolist() == [1, pd.NA, 3, 4]
+    plain['Document version'] = ['Rev 1', 'Rev 2', None, 'Rev 2']
+    versions = compact_ed_frame(plain)['Document version']
+    assert versions.dtype == 'category'
+    assert versions.tolist()[:2] == ['Rev 1', 'Rev 2'] and pd.isna(versions[2])
+
+
+def test_document_frame_codes_join_related_to_document_id(store, tail):
+    tree = store.document_tree(tail)
+    frame = store.document_tree_frame(tail)
+    assert frame['document_id'].astype(str).tolist() == [doc['document_id'] for doc in tree]
+    assert frame['depth'].dtype == np.int16
+    assert frame['status'].dtype == 'category'
+
+    codes = pd.DataFrame({
+        'id': frame['document_id'].cat.codes,
+        'related': frame['related_document_id'].cat.codes,
+    })
+    assert codes['related'].tolist()[0] == -1
+    parents = codes.merge(codes, left_on='related', right_on='id', suffixes=('', '_parent'))
+    assert frame['document_id'].cat.categories[parents['id']].tolist() == ['SB-1', 'TO-1']
+    assert frame['document_id'].cat.categories[parents['id_parent']].tolist() == ['AD-1', 'SB-1']
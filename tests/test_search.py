@@ -0,0 +1,110 @@
+import threading
+
+from atix.search import SearchIndex, refresh
+
+
+def _titles(index, query):
+    return sorted(hit.title for hit in index.search(query, limit=100, kinds={'AD', 'SB', 'TO', 'ED'}))
+
+
+def test_prefix_phrase_and_ranking():
+    index = SearchIndex()
+    index.sync_source('test', 1, {
+        'a': ('ED', 'ED-1', 'upper wing skin inspection'),
+        'b': ('ED', 'ED-2', 'wing skin panel on the lower wing'),
+        'c': ('ED', 'ED-3', 'landing gear retraction'),
+    })
+    assert _titles(index, 'wing') == ['ED-1', 'ED-2']
+    assert _titles(index, 'retract*') == ['ED-3']
+    assert _titles(index, '"upper wing skin"') == ['ED-1']
+    assert _titles(index, 'wing gear') == []
+    assert index.search('wing', limit=1)[0].title == 'ED-2'
+
+
+def test_sync_only_touches_changed_documents():
+    index = SearchIndex()
+    index.sync_source('test', 1, {'a': ('ED', 'ED-1', 'wing'), 'b': ('ED', 'ED-2', 'gear')})
+    assert index.sync_source('test', 2, {'a': ('ED', 'ED-1', 'wing'), 'b': ('ED', 'ED-2', 'brake')}) == 2
+    assert _titles(index, 'gear') == []
+    assert _titles(index, 'brake') == ['ED-2']
+
+
+def test_tracker_source_follows_reset_and_reseed(store, tail):
+    index = SearchIndex()
+    refresh(index, store=store)
+    assert _titles(index, 'one') == ['AD-1', 'SB-1', 'TO-1']
+
+    # Same row count and the same rowids as before, different titles
+    store.clear()
+    store.add_aircraft('HS-TST')
+    store.add_documents('HS-TST', {
+        'ADs': [{'document_id': 'AD-9', 'title': 'AD nine'}],
+        'SBs': [{'document_id': 'SB-9', 'title': 'SB nine'}],
+        'TOs': [{'document_id': 'TO-9', 'title': 'TO nine'}],
+    })
+    assert refresh(index, store=store)
+    assert _titles(index, 'one') == []
+    assert _titles(index, 'nine') == ['AD-9', 'SB-9', 'TO-9']
+
+
+def test_tracker_source_follows_rowid_reuse(store, tail):
+    index = SearchIndex()
+    refresh(index, store=store)
+    # Deleting the newest row and inserting another reuses its rowid
+    with store._write() as conn:
+        conn.execute("DELETE FROM documents WHERE document_id = 'TO-1'")
+    store.add_documents(tail, {'EDs': [{'document_id': 'ED-7', 'title': 'ED seven', 'related_document_id': 'SB-1'}]})
+    assert refresh(index, store=store)
+    assert _titles(index, 'seven') == ['ED-7']
+    assert _titles(index, 'one') == ['AD-1', 'SB-1']
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = SearchIndex()
+    index.sync_source('test', 'v1', {'a': ('ED', 'ED-1', 'wing skin')})
+    index.save(tmp_path / 'search.pkl')
+    loaded = SearchIndex.load(tmp_path / 'search.pkl')
+    assert loaded.source_version('test') == 'v1'
+    assert _titles(loaded, 'skin') == ['ED-1']
+    loaded.sync_source('test', 'v2', {'a': ('ED', 'ED-1', 'wing skin'), 'b': ('ED', 'ED-2', 'skin')})
+    assert _titles(loaded, 'skin') == ['ED-1', 'ED-2']
+
+
+def test_searches_are_safe_during_updates():
+    index = SearchIndex()
+    documents = {str(i): ('ED', f'ED-{i}', f'wing panel {i}') for i in range(2000)}
+    index.sync_source('test', 0, documents)
+    errors = []
+
+    def search():
+        try:
+            for _ in range(200):
+                index.search('wing pan*', limit=5)
+        except Exception as exc:  # noqa: BLE001 - the test reports any failure
+            errors.append(exc)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for version in range(1, 20):
+        index.sync_source('test', version, {key: (kind, title, f'{text} rev{version}') for key, (kind, title, text) in documents.items()})
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_ad_source_uses_the_given_version_without_hashing(monkeypatch):
+    from atix import search
+
+    records = [{'AD-id': '2024-0150', 'Applicability': ['A350-941 aeroplanes'], 'Service Bulletins': []}]
+    index = SearchIndex()
+    assert refresh(index, ad_records=records, ad_version=('a.txt', 1, 1)) == 1
+
+    def no_hashing(*args, **kwargs):
+        raise AssertionError('AD records were serialized')
+
+    monkeypatch.setattr(search.json, 'dumps', no_hashing)
+    assert refresh(index, ad_records=records, ad_version=('a.txt', 1, 1)) == 0
+    records[0]['Applicability'] = ['A330-243 aeroplanes']
+    assert refresh(index, ad_records=records, ad_version=('a.txt', 2, 2)) == 2  # removed and re-added
+    assert _titles(index, 'a330') == ['AD 2024-0150']
@@ -0,0 +1,31 @@
+import threading
+
+from atix import services
+
+
+def test_slow_build_does_not_block_other_resources(monkeypatch):
+    monkeypatch.setattr(services, '_cache', {})
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    thread = threading.Thread(target=services._cached, args=('slow', 1, slow))
+    thread.start()
+    try:
+        assert started.wait(5)
+        assert services._cached('quick', 1, lambda: 'quick') == 'quick'
+    finally:
+        release.set()
+        thread.join()
+    assert services._cached('slow', 1, lambda: 'rebuilt') == 'slow'
+
+
+def test_warm_up_builds_the_keys_pages_use(monkeypatch):
+    monkeypatch.setattr(services, '_cache', {})
+    monkeypatch.setattr(services, 'ed_indexes', lambda path=services.DEFAULT_EXPORT: {'A350': None, 'A320': None})
+    warmed = services._fleet_frames_by_ed_type()
+    assert services.fleet_frames(services.ed_indexes().keys()) is warmed
+    assert set(warmed) == {'A350', 'A320'}
@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pytest
+
+from atix.fleet import fleet_frame
+from atix.loader import ED_COLUMNS, SIDECAR_EXT
+from atix.snapshots import ADDED, CHANGE_COLUMNS, REVISED, WITHDRAWN, diff_frames, find_snapshot, list_snapshots, summary, tail_counts
+
+
+def eds(*rows):
+    return pd.DataFrame(
+        [(document, version, description, pd.Timestamp(issued), 'EASA') for document, version, description, issued in rows],
+        columns=ED_COLUMNS,
+    )
+
+
+OLD = eds(
+    ('ED-1', 1, 'A350 wing', '2020-01-01'),
+    ('ED-2', 1, 'A320 door', '2021-01-01'),
+    ('ED-3', 2, 'B777 engine', '2022-01-01'),
+)
+
+
+def by_document(changes):
+    return {row['Document']: row for row in changes.to_dict('records')}
+
+
+def test_added_revised_withdrawn():
+    new = eds(
+        ('ED-1', 1, 'A350 wing', '2020-01-01'),     # unchanged
+        ('ED-2', 2, 'A320 door', '2021-01-01'),     # new version
+        ('ED-4', 1, 'A350 landing gear', '2024-06-01'),
+    )
+    changes = diff_frames(OLD, new)
+    assert list(changes.columns) == CHANGE_COLUMNS
+    rows = by_document(changes)
+    assert set(rows) == {'ED-2', 'ED-3', 'ED-4'}
+    assert (rows['ED-2']['Change'], rows['ED-2']['Old version'], rows['ED-2']['New version']) == (REVISED, '1', '2')
+    assert (rows['ED-3']['Change'], rows['ED-3']['Old version']) == (WITHDRAWN, '2')
+    assert pd.isna(rows['ED-3']['New version'])
+    assert (rows['ED-4']['Change'], rows['ED-4']['New version']) == (ADDED, '1')
+    assert pd.isna(rows['ED-4']['Old version'])
+    assert rows['ED-4']['aircraft_type'] == 'A350'
+    assert summary(changes) == {ADDED: 1, REVISED: 1, WITHDRAWN: 1}
+
+
+def test_content_change_without_new_version_is_revised():
+    new = OLD.copy()
+    new.loc[0, 'Description'] = 'A350 wing and flap'
+    changes = diff_frames(OLD, new)
+    assert changes['Document'].tolist() == ['ED-1']
+    assert changes['Change'].tolist() == [REVISED]
+
+
+def test_identical_frames_have_no_changes():
+    changes = diff_frames(OLD, OLD.iloc[::-1].reset_index(drop=True))
+    assert changes.empty
+    assert list(changes.columns) == CHANGE_COLUMNS
+    assert tail_counts(changes, fleet_frame())['Affected Tails'].tolist() == []
+
+
+def test_tail_counts_follow_in_service_dates():
+    fleet = fleet_frame([
+        ('HS-AAA', 'Airbus A350-900', 'Jan 2019'),
+        ('HS-AAB', 'Airbus A350-900', 'Jan 2021'),
+        ('HS-AAC', 'Airbus A350-900', 'Jan 2025'),
+        ('HS-BBA', 'Airbus A320-200', 'Jan 2022'),
+    ])
+    new = eds(('ED-4', 1, 'A350 landing gear', '2024-06-01'))
+    counts = tail_counts(diff_frames(OLD, new), fleet)
+    rows = by_document(counts)
+    # ED-1 (2020) applies to the A350s delivered after it, ED-2 (2021) to the A320
+    assert rows['ED-1']['Affected Tails'] == 2
+    assert rows['ED-2']['Affected Tails'] == 1
+    assert rows['ED-3']['Affected Tails'] == 0
+    assert rows['ED-4']['Affected Tails'] == 1
+
+
+def test_same_second_snapshots_are_kept_apart(tmp_path):
+    for sha in ('aaaaaaaaaaaaaaaa', 'bbbbbbbbbbbbbbbb'):
+        (tmp_path / f'export.20250101T120000.{sha}{SIDECAR_EXT}').write_bytes(b'')
+        os.utime(tmp_path / f'export.20250101T120000.{sha}{SIDECAR_EXT}', ns=(0, int(sha == 'bbbbbbbbbbbbbbbb')))
+    snapshots = list_snapshots('export.XLSX', tmp_path)
+    assert [s.sha for s in snapshots] == ['aaaaaaaaaaaaaaaa', 'bbbbbbbbbbbbbbbb']
+    assert find_snapshot(snapshots, 'bbbb') is snapshots[1]
+    assert find_snapshot(snapshots, os.path.basename(snapshots[0].path)) is snapshots[0]
+    with pytest.raises(LookupError, match='ambiguous'):
+        find_snapshot(snapshots, '20250101T120000')
+    with pytest.raises(LookupError, match='no snapshot'):
+        find_snapshot(snapshots, 'cccc')